@@ -0,0 +1,220 @@
+import argparse
+import glob
+import json
+import multiprocessing
+import numpy as np
+import os
+import time
+import global_constant as gb
+
+from multiprocessing.connection import wait
+from recorder import CountRecorder
+from utils import load_matrix
+from verify import verify_batch
+from qr_algorithm import qr_algorithm, qr_algorithm_wilkinson, francis_double_shift_qr
+from symmetric import symmetric_qr
+from batched import qr_algorithm_batched
+from warm_start import solve_sequence
+
+SOLVERS = {
+    "qr": qr_algorithm,
+    "wilkinson": qr_algorithm_wilkinson,
+    "francis": francis_double_shift_qr,
+    "symmetric": symmetric_qr,
+    "batched": qr_algorithm_batched,
+    "warm": solve_sequence
+}
+
+STACKED = {"batched", "warm"}
+
+MATRIX_SUFFIXES = (".txt", ".npy", ".bin")
+
+def find_inputs(patterns: list[str]) -> list[str]:
+    """
+    Expand directories (every matrix file directly inside, by suffix) and glob
+    patterns into a sorted list of files without duplicates.
+    """
+    files = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            files.update(os.path.join(pattern, name) for name in os.listdir(pattern)
+                         if name.endswith(MATRIX_SUFFIXES))
+
+        else:
+            files.update(path for path in glob.glob(pattern, recursive=True) if os.path.isfile(path))
+
+    return sorted(files)
+
+def run_task(filename: str, method: str, max_iter: int, tol: float, check: float, value_tol: float) -> dict:
+    """
+    Solve one file with one method and verify the result (see `verify_batch`).
+
+    Returns:
+        dict: The report record: the status ("ok", "fail" if an eigenpair has
+        a relative residual above `check` or an eigenvalue farther than
+        `value_tol` ||A||_F from np.linalg.eigvals, "skipped" if the method
+        does not take matrices of this shape, or "error"), the time of the
+        solve (without loading), the number of sweeps (None for solvers that
+        do not record), the largest residual and eigenvalue error, or the
+        error message.
+    """
+    record = {"file": filename, "method": method}
+    try:
+        A = load_matrix(filename)
+        record["shape"] = list(A.shape)
+        if (A.ndim == 3) != (method in STACKED):
+            record["status"] = "skipped"
+            return record
+
+        gb.recorder = CountRecorder()
+        start = time.perf_counter()
+        eigenvalues, eigenvectors = SOLVERS[method](np.array(A), max_iter, tol)
+        record["time"] = time.perf_counter() - start
+        record["sweeps"] = gb.recorder.iteration - 1 if gb.recorder.iteration > 0 else None
+
+        # Every matrix of a stack is verified at once
+        A = np.asarray(A).reshape((-1,) + A.shape[-2:])
+        results = verify_batch(A, eigenvalues.reshape(A.shape[0], -1),
+                               eigenvectors.reshape(A.shape[0], A.shape[1], -1), check, value_tol)
+        record["residual"] = max(result["max_residual"] for result in results)
+        record["value_error"] = max(result["max_value_error"] for result in results)
+        record["status"] = "ok" if all(result["passed"] for result in results) else "fail"
+
+    except Exception as e:
+        record["status"] = "error"
+        record["error"] = f"{type(e).__name__}: {e}"
+
+    return record
+
+def _worker(conn):
+    """Run the tasks received on the pipe until None arrives."""
+    while True:
+        task = conn.recv()
+        if task is None:
+            break
+
+        conn.send(run_task(*task))
+
+def _spawn(context):
+    parent, child = context.Pipe()
+    process = context.Process(target=_worker, args=(child,), daemon=True)
+    process.start()
+    child.close()
+    return process, parent
+
+def run_batch(
+    files: list[str],
+    methods: list[str],
+    report,
+    workers: int = 1,
+    timeout: float | None = None,
+    max_iter: int = 1000,
+    tol: float = 1e-8,
+    check: float = 1e-6,
+    value_tol: float = 1e-6
+) -> dict:
+    """
+    Solve every file with every method in a pool of worker processes, one task
+    per (file, method), and write one JSON line per task to `report` as soon
+    as it completes.
+
+    Each worker is a long-lived process fed through a pipe, so the solver
+    modules are loaded once per worker. A task still running `timeout`
+    seconds after it was handed out is reported with status "timeout", and
+    its worker is terminated and replaced, so a non-converging case only
+    costs its timeout.
+
+    Returns:
+        dict: The number of tasks per status.
+    """
+    context = multiprocessing.get_context()
+    pending = [(filename, method, max_iter, tol, check, value_tol) for filename in files for method in methods]
+    pending.reverse()
+    idle = [_spawn(context) for _ in range(max(1, min(workers, len(pending))))]
+    busy = {}
+    counts = {}
+
+    def finish(record):
+        counts[record["status"]] = counts.get(record["status"], 0) + 1
+        report.write(json.dumps(record) + "\n")
+        report.flush()
+
+    try:
+        while pending or busy:
+            while pending and idle:
+                process, conn = idle.pop()
+                task = pending.pop()
+                conn.send(task)
+                busy[conn] = (process, task, time.monotonic())
+
+            deadline = None
+            if timeout is not None:
+                deadline = max(0.0, min(start for _, _, start in busy.values()) + timeout - time.monotonic())
+
+            for conn in wait(list(busy), timeout=deadline):
+                process, task, _ = busy.pop(conn)
+                try:
+                    finish(conn.recv())
+                    idle.append((process, conn))
+
+                except EOFError:
+                    # The worker died (e.g. killed by the OS): replace it
+                    finish({"file": task[0], "method": task[1], "status": "error", "error": "worker process died"})
+                    process.join()
+                    idle.append(_spawn(context))
+
+            if timeout is not None:
+                now = time.monotonic()
+                for conn, (process, task, start) in list(busy.items()):
+                    if now - start >= timeout:
+                        del busy[conn]
+                        process.terminate()
+                        process.join()
+                        conn.close()
+                        finish({"file": task[0], "method": task[1], "status": "timeout", "time": now - start})
+                        idle.append(_spawn(context))
+
+    finally:
+        for process, conn in idle:
+            conn.send(None)
+            process.join()
+
+        for process, _, _ in busy.values():
+            process.terminate()
+            process.join()
+
+    return counts
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description="Solve many matrix files in parallel and write a JSONL report"
+    )
+    parser.add_argument("inputs", nargs="+",
+                        help="Input files: directories (every .txt, .npy and .bin file inside) or glob patterns")
+    parser.add_argument("--methods", choices=list(SOLVERS.keys()), nargs="+", default=["francis"],
+                        help="Methods to run on every input")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="Number of worker processes")
+    parser.add_argument("--timeout", type=float, default=None,
+                        help="Seconds after which a task is killed and reported as a timeout")
+    parser.add_argument("--check", type=float, default=1e-6,
+                        help="Largest relative residual of a passing eigenpair")
+    parser.add_argument("--value_tol", type=float, default=1e-6,
+                        help="Largest distance (relative to ||A||_F) of a passing eigenvalue to np.linalg.eigvals")
+    parser.add_argument("--report", type=str, default="report.jsonl",
+                        help="JSONL report file, one line per (file, method)")
+    parser.add_argument("--maxiter", type=int, default=1000,
+                        help="Maximum iteration")
+    parser.add_argument("--tolerance", type=float, default=1e-8,
+                        help="Convergence tolerance")
+    args = parser.parse_args()
+
+    files = find_inputs(args.inputs)
+    start = time.perf_counter()
+    with open(args.report, 'w') as report:
+        counts = run_batch(files, args.methods, report, args.workers, args.timeout,
+                           args.maxiter, args.tolerance, args.check, args.value_tol)
+
+    print(f"{len(files)} file(s) x {len(args.methods)} method(s) in {time.perf_counter() - start:.2f} seconds: {counts}")
+    if counts.get("fail", 0) or counts.get("error", 0) or counts.get("timeout", 0):
+        raise SystemExit(1)
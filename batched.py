@@ -0,0 +1,160 @@
+import warnings
+import numpy as np
+
+from qr_algorithm import extract_eigens_from_schur
+
+def _householder_batched(X: np.ndarray) -> np.ndarray:
+    """Unit vectors v (one per row of X) such that (I - 2 v v^T) @ x = alpha * e1, zero for x = 0."""
+    norm_x = np.linalg.norm(X, axis=-1)
+    V = X.copy()
+    V[..., 0] += np.where(X[..., 0] < 0, -1.0, 1.0) * norm_x
+    norm_v = np.linalg.norm(V, axis=-1)
+    nonzero = norm_v > 0
+    V[nonzero] /= norm_v[nonzero, None]
+    return V
+
+def hessenberg_batched(
+    A: np.ndarray,
+    compute_vectors: bool = True
+) -> tuple[np.ndarray, np.ndarray | None]:
+    """
+    Reduce every matrix of the stack A (batch, n, n) to upper Hessenberg form
+    H = Q^T A Q with Householder reflectors applied to the whole batch at once.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray | None]: An tuple contains the stack H and
+        the stack Q (None if compute_vectors is False).
+    """
+    H = np.array(A, dtype=np.float64)
+    batch, n, _ = H.shape
+    Q = np.broadcast_to(np.eye(n), H.shape).copy() if compute_vectors else None
+    for k in range(n - 2):
+        v = _householder_batched(H[:, (k + 1) :, k])
+        H[:, (k + 1) :, :] -= 2 * v[:, :, None] * np.einsum('bi,bij->bj', v, H[:, (k + 1) :, :])[:, None, :]
+        H[:, :, (k + 1) :] -= 2 * np.einsum('bij,bj->bi', H[:, :, (k + 1) :], v)[:, :, None] * v[:, None, :]
+        H[:, (k + 2) :, k] = 0.0
+        if compute_vectors:
+            Q[:, :, (k + 1) :] -= 2 * np.einsum('bij,bj->bi', Q[:, :, (k + 1) :], v)[:, :, None] * v[:, None, :]
+
+    return H, Q
+
+def _francis_sweep_batched(
+    H: np.ndarray,
+    Q: np.ndarray | None,
+    p: np.ndarray
+) -> None:
+    """
+    One implicit double-shift sweep on the active windows H[b, :p[b], :p[b]], in place.
+
+    H is padded to (batch, n + 1, n + 1) (and Q to (batch, n, n + 1)) so that
+    the closing 2x2 step at row p - 2 can be written as a 3x3 reflector whose
+    third component is zero. Matrices whose window ends before row k + 2 get
+    the identity at step k.
+    """
+    m = H.shape[0]
+    n = H.shape[1] - 1
+    r = np.arange(m)
+
+    # Double shift from the trailing 2x2 block of each window
+    s = H[r, p - 2, p - 2] + H[r, p - 1, p - 1]
+    t = H[r, p - 2, p - 2] * H[r, p - 1, p - 1] - H[r, p - 2, p - 1] * H[r, p - 1, p - 2]
+
+    # First column of the shift polynomial
+    x = H[:, 0, 0] ** 2 + H[:, 0, 1] * H[:, 1, 0] - s * H[:, 0, 0] + t
+    y = H[:, 1, 0] * (H[:, 0, 0] + H[:, 1, 1] - s)
+    z = H[:, 1, 0] * H[:, 2, 1]
+
+    for k in range(p.max() - 1):
+        live = k <= p - 2
+        X = np.stack([x, y, np.where(k == p - 2, 0.0, z)], axis=1)
+        X[~live] = 0.0
+        v = _householder_batched(X)
+        P = np.eye(3) - 2 * v[:, :, None] * v[:, None, :]
+
+        c0 = max(0, k - 1)
+        H[:, k : (k + 3), c0:] = P @ H[:, k : (k + 3), c0:]
+        if k > 0:
+            H[:, (k + 1) : (k + 3), k - 1] = 0.0
+
+        H[:, : (k + 4), k : (k + 3)] = H[:, : (k + 4), k : (k + 3)] @ P
+        if Q is not None:
+            Q[:, :, k : (k + 3)] = Q[:, :, k : (k + 3)] @ P
+
+        x = H[:, k + 1, k]
+        y = H[:, k + 2, k]
+        z = H[:, k + 3, k] if k + 3 <= n else np.zeros(m)
+
+def qr_algorithm_batched(
+    A: np.ndarray,
+    max_iter: int = 1000,
+    tol: float = 1e-8,
+    compute_vectors: bool = True
+) -> tuple[np.ndarray, np.ndarray | None]:
+    """
+    Computes the eigenvalues of a stack of small real square matrices with
+    Francis double-shift QR sweeps run across the whole batch.
+
+    Every NumPy operation works on the leading (batch) axis, so the Python
+    overhead is paid once per sweep step for the whole stack instead of once
+    per matrix. Each matrix keeps its own active window H[:p, :p], shrunk by
+    one or two rows when the bottom converges; matrices whose windows are
+    down to 2x2 are masked out of the following sweeps.
+
+    Args:
+        A (np.ndarray): The stack of real square matrices, of shape (batch, n, n).
+        max_iter (int): The maximum number of sweeps.
+        tol (float): The tolerance for deflation.
+        compute_vectors (bool): If False, skip the accumulation of Q_total and
+            return None in place of the eigenvectors.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray | None]: An tuple contains the eigenvalues
+        (batch, n) and the eigenvectors (batch, n, n) of the matrices. A
+        RuntimeWarning naming the batch indices is issued when some matrices
+        did not converge in max_iter sweeps.
+    """
+    A = np.asarray(A, dtype=np.float64)
+    if A.ndim != 3 or A.shape[1] != A.shape[2]:
+        raise ValueError(f"Invalid shape: {A.shape}. Expected (batch, n, n).")
+
+    batch, n, _ = A.shape
+    H0, Q0 = hessenberg_batched(A, compute_vectors)
+    H = np.zeros((batch, n + 1, n + 1))
+    H[:, :n, :n] = H0
+    Q = None
+    if compute_vectors:
+        Q = np.zeros((batch, n, n + 1))
+        Q[:, :, :n] = Q0
+
+    p = np.full(batch, n)
+    for _ in range(max_iter):
+        active = np.nonzero(p > 2)[0]
+        if len(active) == 0:
+            break
+
+        H_active = H[active]
+        Q_active = None if Q is None else Q[active]
+        p_active = p[active]
+        _francis_sweep_batched(H_active, Q_active, p_active)
+
+        # Deflate one or two eigenvalues at the bottom of each window
+        r = np.arange(len(active))
+        one = np.abs(H_active[r, p_active - 1, p_active - 2]) <= tol * (
+            np.abs(H_active[r, p_active - 2, p_active - 2]) + np.abs(H_active[r, p_active - 1, p_active - 1]))
+        two = ~one & (np.abs(H_active[r, p_active - 2, p_active - 3]) <= tol * (
+            np.abs(H_active[r, p_active - 3, p_active - 3]) + np.abs(H_active[r, p_active - 2, p_active - 2])))
+        H_active[r[one], p_active[one] - 1, p_active[one] - 2] = 0.0
+        H_active[r[two], p_active[two] - 2, p_active[two] - 3] = 0.0
+
+        H[active] = H_active
+        if Q is not None:
+            Q[active] = Q_active
+
+        p[active] = p_active - one - 2 * two
+
+    unconverged = np.nonzero(p > 2)[0]
+    if len(unconverged):
+        warnings.warn(f"Batched QR sweeps did not converge in max_iter = {max_iter} sweeps for the matrices "
+                      f"{unconverged.tolist()}, so some of their eigenvalues are inaccurate", RuntimeWarning)
+
+    return extract_eigens_from_schur(H[:, :n, :n], None if Q is None else Q[:, :, :n], tol=tol)
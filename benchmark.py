@@ -0,0 +1,324 @@
+import argparse
+import csv
+import json
+import numpy as np
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import global_constant as gb
+
+from recorder import CountRecorder
+from utils import save_matrix
+from qr_algorithm import qr_algorithm, qr_algorithm_wilkinson, francis_double_shift_qr
+from test import power_method
+
+def _orthogonal(n: int, rng: np.random.Generator) -> np.ndarray:
+    Q, R = np.linalg.qr(rng.standard_normal((n, n)))
+    return Q * np.sign(np.diagonal(R))
+
+def random_matrix(n: int, rng: np.random.Generator) -> np.ndarray:
+    """Standard normal entries."""
+    return rng.standard_normal((n, n))
+
+def symmetric_matrix(n: int, rng: np.random.Generator) -> np.ndarray:
+    """Symmetric part of a standard normal matrix."""
+    A = rng.standard_normal((n, n))
+    return (A + A.T) / 2
+
+def nonnormal_matrix(n: int, rng: np.random.Generator) -> np.ndarray:
+    """Q T Q^T with a strongly upper triangular T (large departure from normality)."""
+    T = np.triu(rng.standard_normal((n, n)), 1) * 10 + np.diag(rng.standard_normal(n))
+    Q = _orthogonal(n, rng)
+    return Q @ T @ Q.T
+
+def clustered_matrix(n: int, rng: np.random.Generator) -> np.ndarray:
+    """Q D Q^T with the eigenvalues in four tight clusters."""
+    centers = np.array([-2.0, -1.0, 1.0, 3.0])
+    D = centers[rng.integers(0, len(centers), n)] + 1e-6 * rng.standard_normal(n)
+    Q = _orthogonal(n, rng)
+    return Q @ np.diag(D) @ Q.T
+
+def block_diagonal_matrix(n: int, rng: np.random.Generator) -> np.ndarray:
+    """Random diagonal blocks of size 1 to 8, decoupled from each other."""
+    A = np.zeros((n, n))
+    start = 0
+    while start < n:
+        size = min(n - start, int(rng.integers(1, 9)))
+        A[start : (start + size), start : (start + size)] = rng.standard_normal((size, size))
+        start += size
+
+    return A
+
+MATRIX_CLASSES = {
+    "random": random_matrix,
+    "symmetric": symmetric_matrix,
+    "nonnormal": nonnormal_matrix,
+    "clustered": clustered_matrix,
+    "block_diagonal": block_diagonal_matrix
+}
+
+def _numpy_eig(A, max_iter, tol):
+    return np.linalg.eig(A)
+
+SOLVERS = {
+    "qr": qr_algorithm,
+    "wilkinson": qr_algorithm_wilkinson,
+    "francis": francis_double_shift_qr,
+    "power": power_method,
+    "numpy": _numpy_eig
+}
+
+def residual(A: np.ndarray, eigenvalues: np.ndarray, eigenvectors: np.ndarray) -> float:
+    """Largest ||A v - lambda v|| over the eigenpairs, relative to ||A||_F (for unit v)."""
+    V = eigenvectors.reshape(A.shape[0], -1)
+    V = V / np.linalg.norm(V, axis=0)
+    norm_A = np.linalg.norm(A)
+    return float(np.linalg.norm(A @ V - V * eigenvalues, axis=0).max() / (norm_A if norm_A > 0 else 1.0))
+
+def run_case(
+    solver: str,
+    matrix_class: str,
+    n: int,
+    seed: int = 0,
+    warmup: int = 1,
+    repeats: int = 3,
+    max_iter: int = 1000,
+    tol: float = 1e-8
+) -> dict:
+    """
+    Benchmark one solver on one matrix.
+
+    The matrix is generated from (seed, n, class), so every run sees the same
+    input. After `warmup` untimed runs, `repeats` runs are timed with
+    perf_counter; the peak memory is measured in one more run under
+    tracemalloc, which is slower and therefore not timed. The iterations are
+    counted with a `CountRecorder` (None for solvers that do not record).
+
+    Returns:
+        dict: The benchmark record.
+    """
+    A = MATRIX_CLASSES[matrix_class](n, np.random.default_rng([seed, n, list(MATRIX_CLASSES).index(matrix_class)]))
+    method = SOLVERS[solver]
+
+    def solve():
+        np.random.seed(seed)        # power_method starts from np.random
+        return method(A.copy(), max_iter, tol)
+
+    for _ in range(warmup):
+        solve()
+
+    times = []
+    recorder = gb.recorder
+    gb.recorder = CountRecorder()
+    try:
+        for _ in range(repeats):
+            start = time.perf_counter()
+            eigenvalues, eigenvectors = solve()
+            times.append(time.perf_counter() - start)
+
+        iterations = gb.recorder.iteration - 1 if gb.recorder.iteration > 0 else None
+
+    finally:
+        gb.recorder = recorder
+
+    tracemalloc.start()
+    try:
+        solve()
+        _, peak = tracemalloc.get_traced_memory()
+
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "solver": solver,
+        "class": matrix_class,
+        "n": n,
+        "time_min": min(times),
+        "time_median": float(np.median(times)),
+        "repeats": repeats,
+        "iterations": iterations,
+        "peak_bytes": peak,
+        "residual": residual(A, eigenvalues, eigenvectors)
+    }
+
+def run_suite(
+    sizes: list[int],
+    classes: list[str],
+    solvers: list[str],
+    seed: int = 0,
+    warmup: int = 1,
+    repeats: int = 3,
+    max_iter: int = 1000,
+    tol: float = 1e-8,
+    max_seconds: float | None = None
+) -> list[dict]:
+    """
+    Benchmark every solver on every matrix class and size, sizes in increasing order.
+
+    With `max_seconds`, a solver whose median time on a class exceeds it is not
+    run on the larger sizes of that class.
+    """
+    records = []
+    for solver in solvers:
+        for matrix_class in classes:
+            for n in sorted(sizes):
+                record = run_case(solver, matrix_class, n, seed, warmup, repeats, max_iter, tol)
+                records.append(record)
+                print(f"{solver:>10} {matrix_class:>15} {n:>6}: {record['time_median']:.4f} s, "
+                      f"iterations {record['iterations']}, peak {record['peak_bytes'] / 2 ** 20:.1f} MB, "
+                      f"residual {record['residual']:.2e}")
+                if max_seconds is not None and record["time_median"] > max_seconds:
+                    break
+
+    return records
+
+HEAVY_MODULES = ("sympy", "matplotlib")
+
+def run_startup(repeats: int = 10, n: int = 4) -> dict:
+    """
+    Time `python main.py --run francis` on an n x n matrix in fresh interpreters.
+
+    For a small matrix this is the cost of a CLI call, dominated by the start
+    of the interpreter and the imports. One more run under `-X importtime`
+    checks that none of `HEAVY_MODULES` is imported.
+
+    Returns:
+        dict: The benchmark record (solver "startup", class "cli").
+    """
+    main = os.path.join(os.path.dirname(os.path.abspath(__file__)), "main.py")
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "startup.txt")
+        save_matrix(filename, np.random.default_rng(n).standard_normal((n, n)))
+        command = [sys.executable, main, "--run", "francis", "--input", filename]
+        times = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            subprocess.run(command, check=True, stdout=subprocess.DEVNULL)
+            times.append(time.perf_counter() - start)
+
+        imports = subprocess.run(command[:1] + ["-X", "importtime"] + command[1:], check=True,
+                                 stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True).stderr
+
+    imported = {line.rsplit("|", 1)[-1].strip().split(".")[0] for line in imports.splitlines() if "|" in line}
+    heavy = sorted(imported.intersection(HEAVY_MODULES))
+    if heavy:
+        print(f"WARNING: the CLI imports {heavy}")
+
+    return {
+        "solver": "startup",
+        "class": "cli",
+        "n": n,
+        "time_min": min(times),
+        "time_median": float(np.median(times)),
+        "repeats": repeats,
+        "iterations": None,
+        "peak_bytes": None,
+        "residual": 0.0
+    }
+
+def environment() -> dict:
+    """Versions and machine description stored with the results."""
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count()
+    }
+
+def save_results(records: list[dict], json_file: str | None = None, csv_file: str | None = None, settings: dict | None = None):
+    """Write the records as JSON (with the environment and settings) and/or CSV."""
+    if json_file is not None:
+        with open(json_file, 'w') as f:
+            json.dump({"environment": environment(), "settings": settings or {}, "results": records}, f, indent=2)
+
+    if csv_file is not None and records:
+        with open(csv_file, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=list(records[0].keys()))
+            writer.writeheader()
+            writer.writerows(records)
+
+def compare(records: list[dict], baseline_file: str, threshold: float = 0.25) -> list[dict]:
+    """
+    Compare the records with a JSON file written by `save_results`.
+
+    A case regresses if its minimum time grows by more than `threshold`
+    (relative), or if its residual grows by more than 100x and above 1e-8.
+
+    Returns:
+        list[dict]: The regressions, with the baseline and the new values.
+    """
+    with open(baseline_file) as f:
+        baseline = {(r["solver"], r["class"], r["n"]): r for r in json.load(f)["results"]}
+
+    regressions = []
+    for record in records:
+        old = baseline.get((record["solver"], record["class"], record["n"]))
+        if old is None:
+            continue
+
+        slower = record["time_min"] > old["time_min"] * (1 + threshold)
+        worse = record["residual"] > max(100 * old["residual"], 1e-8)
+        if slower or worse:
+            regressions.append({
+                "solver": record["solver"], "class": record["class"], "n": record["n"],
+                "time_min": record["time_min"], "baseline_time_min": old["time_min"],
+                "residual": record["residual"], "baseline_residual": old["residual"]
+            })
+
+    return regressions
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description="Benchmark the eigenvalue solvers"
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=[16, 32, 64, 128, 256],
+                        help="Matrix sizes")
+    parser.add_argument("--classes", choices=list(MATRIX_CLASSES.keys()), nargs="+", default=list(MATRIX_CLASSES.keys()),
+                        help="Matrix classes")
+    parser.add_argument("--solvers", choices=list(SOLVERS.keys()), nargs="+", default=list(SOLVERS.keys()),
+                        help="Solvers (numpy: np.linalg.eig as the baseline)")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="Seed of the generated matrices")
+    parser.add_argument("--warmup", type=int, default=1,
+                        help="Untimed runs before the timed ones")
+    parser.add_argument("--repeats", type=int, default=3,
+                        help="Timed runs per case")
+    parser.add_argument("--maxiter", type=int, default=1000,
+                        help="Maximum iteration")
+    parser.add_argument("--tolerance", type=float, default=1e-8,
+                        help="Convergence tolerance")
+    parser.add_argument("--max_seconds", type=float, default=None,
+                        help="Skip the larger sizes of a class once a solver takes longer than this")
+    parser.add_argument("--startup", type=int, default=0, metavar="REPEATS",
+                        help="Also time REPEATS runs of the CLI on a 4 x 4 matrix in fresh interpreters (0: skip)")
+    parser.add_argument("--json", type=str, default=None,
+                        help="Write the results to this JSON file")
+    parser.add_argument("--csv", type=str, default=None,
+                        help="Write the results to this CSV file")
+    parser.add_argument("--baseline", type=str, default=None,
+                        help="JSON results of an earlier run to compare with")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="Relative slowdown reported as a regression")
+    args = parser.parse_args()
+
+    records = run_suite(args.sizes, args.classes, args.solvers, args.seed, args.warmup, args.repeats,
+                        args.maxiter, args.tolerance, args.max_seconds)
+    if args.startup > 0:
+        records.append(run_startup(args.startup))
+        print(f"{'startup':>10} {'cli':>15} {4:>6}: {records[-1]['time_median']:.4f} s")
+
+    save_results(records, args.json, args.csv, settings=vars(args))
+    if args.baseline is not None:
+        regressions = compare(records, args.baseline, args.threshold)
+        for r in regressions:
+            print(f"REGRESSION {r['solver']} {r['class']} {r['n']}: time {r['baseline_time_min']:.4f} -> {r['time_min']:.4f} s, "
+                  f"residual {r['baseline_residual']:.2e} -> {r['residual']:.2e}")
+
+        print(f"{len(regressions)} regression(s) against {args.baseline}")
+        if regressions:
+            raise SystemExit(1)
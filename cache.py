@@ -0,0 +1,125 @@
+import hashlib
+import numpy as np
+import os
+import global_constant as gb
+
+from collections import OrderedDict
+
+def file_digest(filename: str) -> str:
+    """Hash of the raw bytes of a file, read in chunks (the file is not parsed)."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(filename, 'rb') as f:
+        for chunk in iter(lambda: f.read(gb.io_chunk_bytes), b""):
+            digest.update(chunk)
+
+    return digest.hexdigest()
+
+def matrix_digest(A: np.ndarray) -> str:
+    """Hash of the shape, dtype and values of an array."""
+    A = np.ascontiguousarray(A)
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{A.dtype.str}{A.shape}".encode())
+    digest.update(A.reshape(-1).view(np.uint8))
+    return digest.hexdigest()
+
+def cache_key(
+    digest: str,
+    method: str,
+    max_iter: int,
+    tol: float,
+    compute_vectors: bool,
+    **kwargs
+) -> str:
+    """Key of a solve: the input digest, the method and every setting that changes the result."""
+    settings = repr((digest, method, max_iter, tol, compute_vectors, sorted(kwargs.items())))
+    return hashlib.blake2b(settings.encode(), digest_size=16).hexdigest()
+
+class ResultCache:
+    """
+    Cache of solver results (eigenvalues, eigenvectors) by key (see `cache_key`).
+
+    Results are kept in memory in least-recently-used order until they take
+    more than `max_bytes`; a single result larger than that is not kept in
+    memory. With `directory`, every result is also written there as
+    `<key>.npz`, and results missing from memory are looked up there, so they
+    survive across processes.
+
+    Returned arrays are shared with the cache and must not be modified.
+    """
+    def __init__(self, max_bytes: int = gb.cache_bytes, directory: str | None = None):
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.nbytes = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.npz")
+
+    def _remember(self, key: str, result: tuple[np.ndarray, np.ndarray | None]):
+        size = sum(x.nbytes for x in result if x is not None)
+        if size > self.max_bytes:
+            return
+
+        if key in self._entries:
+            self.nbytes -= sum(x.nbytes for x in self._entries.pop(key) if x is not None)
+
+        while self.nbytes + size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.nbytes -= sum(x.nbytes for x in evicted if x is not None)
+            self.evictions += 1
+
+        self._entries[key] = result
+        self.nbytes += size
+
+    def get(self, key: str) -> tuple[np.ndarray, np.ndarray | None] | None:
+        """Return the cached result, or None on a miss."""
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key]
+
+        if self.directory is not None and os.path.exists(self._path(key)):
+            with np.load(self._path(key)) as data:
+                result = data["eigenvalues"], (data["eigenvectors"] if "eigenvectors" in data else None)
+
+            self._remember(key, result)
+            self.hits += 1
+            self.disk_hits += 1
+            return result
+
+        self.misses += 1
+        return None
+
+    def put(self, key: str, eigenvalues: np.ndarray, eigenvectors: np.ndarray | None):
+        """Store a result in memory, and on disk if the cache has a directory."""
+        self._remember(key, (eigenvalues, eigenvectors))
+        if self.directory is not None:
+            arrays = {"eigenvalues": eigenvalues}
+            if eigenvectors is not None:
+                arrays["eigenvectors"] = eigenvectors
+
+            # Write to a temporary file first so that readers never see a partial entry
+            temp = f"{self._path(key)}.{os.getpid()}.tmp"
+            with open(temp, 'wb') as f:
+                np.savez(f, **arrays)
+
+            os.replace(temp, self._path(key))
+
+    def stats(self) -> dict:
+        """Hit and miss counts, evictions and memory use."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "bytes": self.nbytes
+        }
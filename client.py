@@ -0,0 +1,80 @@
+import socket
+import numpy as np
+import global_constant as gb
+
+from protocol import LENGTH, encode_request, decode_response
+
+class SolverClient:
+    """
+    Blocking client of the solver server (see server.py).
+
+    The matrix is sent straight from its buffer, and the response is received
+    into one preallocated buffer that the returned arrays are views of, so
+    neither side copies the arrays to build or parse a message. `seconds` is
+    the solve time on the server of the last request.
+
+    Args:
+        socket_path (str | None): The Unix socket of the server; None to use TCP.
+        host (str): The host of a TCP server.
+        port (int): The port of a TCP server.
+    """
+    def __init__(self, socket_path: str | None = None, host: str = "127.0.0.1", port: int = gb.serve_port):
+        if socket_path is not None:
+            self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.sock.connect(socket_path)
+
+        else:
+            self.sock = socket.create_connection((host, port))
+            self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+        self.seconds = None
+
+    def _receive(self, size: int) -> memoryview:
+        buffer = memoryview(bytearray(size))
+        received = 0
+        while received < size:
+            count = self.sock.recv_into(buffer[received:])
+            if count == 0:
+                raise ConnectionError("The server closed the connection.")
+
+            received += count
+
+        return buffer
+
+    def solve(
+        self,
+        A: np.ndarray,
+        method: str = "francis",
+        max_iter: int = 1000,
+        tol: float = 1e-8,
+        compute_vectors: bool = True
+    ) -> tuple[np.ndarray, np.ndarray | None]:
+        """
+        Compute the eigenvalues and eigenvectors of A on the server.
+
+        Args:
+            A (np.ndarray): The real square matrix.
+            method (str): "qr", "wilkinson" or "francis".
+            max_iter (int): The maximum number of iterations.
+            tol (float): The tolerance for convergence.
+            compute_vectors (bool): If False, only compute the eigenvalues.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray | None]: An tuple contains the
+            eigenvalues and the eigenvectors of the matrix A.
+        """
+        header, matrix = encode_request(A, method, max_iter, tol, compute_vectors)
+        self.sock.sendall(header)
+        self.sock.sendall(matrix)
+        size, = LENGTH.unpack(self._receive(LENGTH.size))
+        eigenvalues, eigenvectors, self.seconds = decode_response(self._receive(size))
+        return eigenvalues, eigenvectors
+
+    def close(self):
+        self.sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
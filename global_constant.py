@@ -1,12 +1,25 @@
-import numpy as np
-
-VISUALIZE = False
-
-matrices = []
-vectors = []
-eigenvalues = []
-
-args = None
-
-max_frame = 201
-norm_ord = 1
\ No newline at end of file
+import numpy as np
+
+from recorder import TraceRecorder
+from profiler import Profiler
+
+VISUALIZE = False
+
+recorder = TraceRecorder()          # Convergence trace of the QR solvers (records nothing by default)
+profiler = Profiler()               # Phase timers and counters of the QR solvers (measures nothing by default)
+vectors = []
+eigenvalues = []
+
+args = None
+
+max_frame = 201
+norm_ord = 1
+wy_block_size = 32
+parallel_min_block = 64
+aed_nibble = 0.14
+io_chunk_bytes = 1 << 26
+cache_bytes = 1 << 28
+mixed_tol = 8 * float(np.finfo(np.float32).eps)     # Smallest deflation tolerance of the float32 sweeps
+serve_port = 8765
+serve_small = 64                    # Largest matrix size batched by the solver server
+serve_batch_max = 32
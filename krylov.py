@@ -0,0 +1,330 @@
+import warnings
+import numpy as np
+import scipy.sparse as sp
+
+from scipy.linalg import lu_factor, lu_solve
+from scipy.sparse.linalg import splu
+
+WHICH = {
+    "LM": lambda theta: -np.abs(theta),     # largest magnitude
+    "SM": lambda theta: np.abs(theta),      # smallest magnitude
+    "LR": lambda theta: -theta.real,        # largest real part
+    "SR": lambda theta: theta.real          # smallest real part
+}
+
+def make_operator(A, n: int | None = None):
+    """
+    Wrap A as a linear operator.
+
+    A can be a dense array, a scipy sparse matrix, anything else supporting
+    `A @ X` with a `shape`, or a callable computing A @ x for a vector x (a
+    matrix-free operator, whose size n must then be given).
+
+    Returns:
+        tuple: An tuple contains the function X -> A @ X (for a vector or an
+        (n, p) block of vectors) and n.
+    """
+    if callable(A) and not hasattr(A, "shape"):
+        if n is None:
+            raise ValueError("The size n is required for a callable operator.")
+
+        def matmat(X):
+            if X.ndim == 1:
+                return np.asarray(A(X))
+
+            return np.column_stack([np.asarray(A(x)) for x in X.T])
+
+        return matmat, n
+
+    if A.shape[0] != A.shape[1]:
+        raise ValueError(f"Invalid shape: {A.shape}. Expected a square operator.")
+
+    return (lambda X: A @ X), A.shape[0]
+
+def shift_invert_operator(A, sigma: float):
+    """
+    Return the function x -> (A - sigma I)^-1 x, factorizing A - sigma I once
+    (dense LU, or sparse LU for a scipy sparse matrix) and reusing the
+    factorization for every solve.
+    """
+    if callable(A) and not hasattr(A, "shape"):
+        raise ValueError("Shift-invert needs an explicit matrix, not a callable operator.")
+
+    n = A.shape[0]
+    if sp.issparse(A):
+        lu = splu(sp.csc_matrix(A - sigma * sp.identity(n, format='csc')))
+        return lu.solve, n
+
+    lu = lu_factor(np.asarray(A, dtype=np.float64) - sigma * np.eye(n))
+    return (lambda X: lu_solve(lu, X)), n
+
+def _ritz(H: np.ndarray, symmetric: bool) -> tuple[np.ndarray, np.ndarray]:
+    """Eigenpairs of the projected matrix H."""
+    if symmetric:
+        return np.linalg.eigh((H + H.T) / 2)
+
+    return np.linalg.eig(H)
+
+def _orthogonalize(V: np.ndarray, w: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Classical Gram-Schmidt of w against the orthonormal columns of V, done twice (DGKS)."""
+    h = V.T @ w
+    w = w - V @ h
+    correction = V.T @ w
+    return w - V @ correction, h + correction
+
+def _keep_pairs(theta: np.ndarray, k: int) -> int:
+    """
+    The number of leading values of the sorted theta to keep: k, or k + 1 when
+    theta[k - 1] and theta[k] are a complex conjugate pair, so that no pair is split.
+    """
+    if k < len(theta) and theta[k - 1].imag != 0 and theta[k] == np.conj(theta[k - 1]):
+        return k + 1
+
+    return k
+
+def _arnoldi_extend(
+    matvec,
+    V: np.ndarray,
+    H: np.ndarray,
+    start: int,
+    rng: np.random.Generator
+) -> int:
+    """
+    Extend the Arnoldi factorization A V[:, :j] = V[:, :j + 1] H[:j + 1, :j]
+    from j = start to j = m (the number of columns of H), in place.
+
+    Returns:
+        int: The number of operator applications.
+    """
+    m = H.shape[1]
+    for j in range(start, m):
+        w, h = _orthogonalize(V[:, : (j + 1)], matvec(V[:, j]))
+        H[: (j + 1), j] = h
+        beta = np.linalg.norm(w)
+        if beta <= np.finfo(float).eps * np.linalg.norm(h):
+            # Invariant subspace: continue with a random orthogonal direction
+            w, _ = _orthogonalize(V[:, : (j + 1)], rng.standard_normal(V.shape[0]))
+            H[j + 1, j] = 0.0
+            V[:, j + 1] = w / np.linalg.norm(w)
+
+        else:
+            H[j + 1, j] = beta
+            V[:, j + 1] = w / beta
+
+    return m - start
+
+def _apply_shifts(H: np.ndarray, shifts: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Apply the shifts to the Hessenberg H with explicit QR steps, in real
+    arithmetic (a complex shift is applied together with its conjugate).
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: An tuple contains Q^T H Q and Q.
+    """
+    m = H.shape[0]
+    Q = np.eye(m)
+    I = np.eye(m)
+    for mu in shifts:
+        if mu.imag < 0:
+            continue
+
+        if mu.imag > 0:
+            M = H @ H - 2 * mu.real * H + abs(mu) ** 2 * I
+
+        else:
+            M = H - mu.real * I
+
+        Qi, _ = np.linalg.qr(M)
+        H = np.triu(Qi.T @ H @ Qi, -1)
+        Q = Q @ Qi
+
+    return H, Q
+
+def arnoldi(
+    A,
+    max_iter: int = 1000,
+    tol: float = 1e-8,
+    compute_vectors: bool = True,
+    k: int = 6,
+    which: str = "LM",
+    sigma: float | None = None,
+    ncv: int | None = None,
+    symmetric: bool | None = None,
+    v0: np.ndarray | None = None,
+    n: int | None = None
+) -> tuple[np.ndarray, np.ndarray | None]:
+    """
+    Computes k selected eigenvalues of a linear operator with the implicitly
+    restarted Arnoldi method (Lanczos for symmetric operators).
+
+    An Arnoldi factorization of ncv steps is built with the operator, the Ritz
+    values of its Hessenberg matrix are sorted by `which`, and the ncv - k
+    unwanted ones are used as exact shifts to compress the factorization back
+    to k steps, which keeps the wanted part of the Krylov subspace (a power
+    method on k vectors at once, filtered by a polynomial). With sigma, the
+    operator is (A - sigma I)^-1 from a single LU factorization, so the
+    eigenvalues closest to sigma come first.
+
+    Args:
+        A: The operator (dense array, scipy sparse matrix, or callable x -> A @ x
+            together with n, see `make_operator`).
+        max_iter (int): The maximum number of restarts.
+        tol (float): The relative residual tolerance of the Ritz pairs.
+        compute_vectors (bool): If False, return None in place of the eigenvectors.
+        k (int): The number of eigenvalues (1 <= k < n); k + 1 are returned
+            when the k-th is one of a complex conjugate pair, to keep the pair whole.
+        which (str): "LM", "SM", "LR" or "SR": largest or smallest magnitude,
+            largest or smallest real part (of the shift-inverted values with sigma).
+        sigma (float | None): The shift of the shift-invert mode.
+        ncv (int | None): The number of Arnoldi vectors (default max(2k + 1, 20)).
+        symmetric (bool | None): Use the symmetric (Lanczos) Ritz values; by
+            default, checked on A when it is a dense or sparse matrix.
+        v0 (np.ndarray | None): The starting vector (random by default).
+        n (int | None): The size of a callable operator.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray | None]: An tuple contains the k
+        (or k + 1, see k) eigenvalues, sorted by `which`, and the eigenvectors
+        of A. A RuntimeWarning is issued when they did not converge in max_iter restarts.
+    """
+    if which not in WHICH:
+        raise ValueError(f"Invalid which: {which}. Choose from {list(WHICH.keys())}.")
+
+    if sigma is None:
+        matvec, n = make_operator(A, n)
+
+    else:
+        matvec, n = shift_invert_operator(A, sigma)
+
+    if symmetric is None:
+        symmetric = (isinstance(A, np.ndarray) or sp.issparse(A)) and (abs(A - A.T) > 0).sum() == 0
+
+    if not 1 <= k < n:
+        raise ValueError(f"Invalid k: {k}. Expected 1 <= k < n = {n}.")
+
+    m = min(n, ncv or max(2 * k + 1, 20))
+    if m < n and m < k + 2:
+        raise ValueError(f"Invalid ncv: {ncv}. Expected ncv >= k + 2 = {k + 2}.")
+
+    rng = np.random.default_rng()
+    V = np.zeros((n, m + 1))
+    H = np.zeros((m + 1, m))
+    v = rng.standard_normal(n) if v0 is None else np.asarray(v0, dtype=np.float64)
+    V[:, 0] = v / np.linalg.norm(v)
+    _arnoldi_extend(matvec, V, H, 0, rng)
+
+    converged = False
+    for _ in range(max_iter):
+        theta, Y = _ritz(H[:m, :m], symmetric)
+        order = np.argsort(WHICH[which](theta), kind='stable')
+        theta, Y = theta[order], Y[:, order]
+
+        # Keep complex conjugate pairs together, in the restart and in the result
+        kept = _keep_pairs(theta, k)
+
+        # Residual norms ||A x - theta x|| = |H[m, m - 1] * Y[m - 1]|
+        residual = np.abs(H[m, m - 1] * Y[m - 1, :kept])
+        scale = np.maximum(np.abs(theta[:kept]), np.finfo(float).eps * np.linalg.norm(H[:m, :m]))
+        if np.all(residual <= tol * scale) or m == n:
+            converged = True
+            break
+
+        H_m, Q = _apply_shifts(H[:m, :m], theta[kept:])
+        f = V[:, m] * H[m, m - 1] * Q[m - 1, kept - 1] + (V[:, :m] @ Q[:, kept]) * H_m[kept, kept - 1]
+        V[:, :kept] = V[:, :m] @ Q[:, :kept]
+        H[:] = 0.0
+        H[:kept, :kept] = H_m[:kept, :kept]
+        beta = np.linalg.norm(f)
+        H[kept, kept - 1] = beta
+        V[:, kept] = f / beta if beta > 0 else _orthogonalize(V[:, :kept], rng.standard_normal(n))[0]
+        if beta == 0:
+            V[:, kept] /= np.linalg.norm(V[:, kept])
+
+        _arnoldi_extend(matvec, V, H, kept, rng)
+
+    if not converged:
+        warnings.warn(f"arnoldi: the Ritz values did not converge to tol = {tol} in {max_iter} restarts",
+                      RuntimeWarning)
+
+    eigenvalues = theta[:kept]
+    if sigma is not None:
+        eigenvalues = sigma + 1 / eigenvalues
+
+    if not compute_vectors:
+        return eigenvalues, None
+
+    eigenvectors = V[:, :m] @ Y[:, :kept]
+    eigenvectors /= np.linalg.norm(eigenvectors, axis=0)
+    return eigenvalues, eigenvectors
+
+def subspace_iteration(
+    A,
+    max_iter: int = 1000,
+    tol: float = 1e-8,
+    compute_vectors: bool = True,
+    k: int = 6,
+    block_size: int | None = None,
+    v0: np.ndarray | None = None,
+    n: int | None = None
+) -> tuple[np.ndarray, np.ndarray | None]:
+    """
+    Computes the k eigenvalues of largest magnitude of a linear operator with
+    block power iterations (subspace iteration) and Rayleigh-Ritz projection.
+
+    This is the power method on a block of vectors: every iteration applies the
+    operator to the whole block (one matrix-matrix product for a matrix), then
+    re-orthonormalizes it with a QR factorization.
+
+    Args:
+        A: The operator (see `make_operator`).
+        max_iter (int): The maximum number of iterations.
+        tol (float): The relative residual tolerance of the Ritz pairs.
+        compute_vectors (bool): If False, return None in place of the eigenvectors.
+        k (int): The number of eigenvalues (1 <= k < n); k + 1 are returned
+            when the k-th is one of a complex conjugate pair, to keep the pair whole.
+        block_size (int | None): The number of vectors in the block (default 2k, at least k).
+        v0 (np.ndarray | None): The starting block (random by default).
+        n (int | None): The size of a callable operator.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray | None]: An tuple contains the k
+        (or k + 1, see k) eigenvalues, by decreasing magnitude, and the
+        eigenvectors of A. A RuntimeWarning is issued when they did not
+        converge in max_iter iterations.
+    """
+    matmat, n = make_operator(A, n)
+    if not 1 <= k < n:
+        raise ValueError(f"Invalid k: {k}. Expected 1 <= k < n = {n}.")
+
+    p = min(n, block_size or 2 * k)
+    if p < k:
+        raise ValueError(f"Invalid block_size: {block_size}. Expected block_size >= k = {k}.")
+
+    X = np.random.default_rng().standard_normal((n, p)) if v0 is None else np.asarray(v0, dtype=np.float64)
+    X, _ = np.linalg.qr(X)
+    converged = False
+    for _ in range(max_iter):
+        Y = matmat(X)
+        theta, S = np.linalg.eig(X.T @ Y)
+        order = np.argsort(-np.abs(theta), kind='stable')
+        theta, S = theta[order], S[:, order]
+        kept = _keep_pairs(theta, k)
+
+        # Residuals of the Ritz pairs, with A X S = Y S
+        residual = np.linalg.norm(Y @ S[:, :kept] - (X @ S[:, :kept]) * theta[:kept], axis=0)
+        if np.all(residual <= tol * np.maximum(np.abs(theta[:kept]), np.finfo(float).tiny)):
+            converged = True
+            break
+
+        X, _ = np.linalg.qr(Y)
+
+    if not converged:
+        warnings.warn(f"subspace_iteration: the Ritz values did not converge to tol = {tol} in {max_iter} iterations",
+                      RuntimeWarning)
+
+    if not compute_vectors:
+        return theta[:kept], None
+
+    eigenvectors = X @ S[:, :kept]
+    eigenvectors /= np.linalg.norm(eigenvectors, axis=0)
+    return theta[:kept], eigenvectors
@@ -0,0 +1,97 @@
+import argparse
+import threading
+import time
+import numpy as np
+import global_constant as gb
+
+from client import SolverClient
+
+def run_client(
+    address: dict,
+    requests: int,
+    n: int,
+    method: str,
+    seed: int,
+    latencies: list,
+    errors: list
+):
+    """Send `requests` random n x n matrices one after the other and record each latency."""
+    rng = np.random.default_rng(seed)
+    try:
+        with SolverClient(**address) as client:
+            for _ in range(requests):
+                A = rng.standard_normal((n, n))
+                start = time.perf_counter()
+                client.solve(A, method)
+                latencies.append(time.perf_counter() - start)
+
+    except Exception as e:
+        errors.append(f"{type(e).__name__}: {e}")
+
+def run_load(
+    address: dict,
+    clients: int = 8,
+    requests: int = 100,
+    n: int = 16,
+    method: str = "francis",
+    seed: int = 0
+) -> dict:
+    """
+    Run `clients` concurrent connections sending `requests` matrices each.
+
+    Returns:
+        dict: The number of requests and errors, the throughput and the
+        latency percentiles in seconds.
+    """
+    latencies = []
+    errors = []
+    threads = [threading.Thread(target=run_client, args=(address, requests, n, method, seed + i, latencies, errors))
+               for i in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    elapsed = time.perf_counter() - start
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) if latencies else (np.nan,) * 3
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "seconds": elapsed,
+        "throughput": len(latencies) / elapsed,
+        "latency_p50": float(p50),
+        "latency_p95": float(p95),
+        "latency_p99": float(p99)
+    }
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description="Load test a running solver server (python main.py --serve)"
+    )
+    parser.add_argument("--socket", type=str, default=None,
+                        help="Unix socket of the server (default: TCP)")
+    parser.add_argument("--host", type=str, default="127.0.0.1",
+                        help="Host of the server")
+    parser.add_argument("--port", type=int, default=gb.serve_port,
+                        help="Port of the server")
+    parser.add_argument("--clients", type=int, default=8,
+                        help="Number of concurrent connections")
+    parser.add_argument("--requests", type=int, default=100,
+                        help="Requests per connection")
+    parser.add_argument("--size", type=int, default=16,
+                        help="Size of the random matrices")
+    parser.add_argument("--method", choices=["qr", "wilkinson", "francis"], default="francis",
+                        help="Solver")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="Seed of the random matrices")
+    args = parser.parse_args()
+
+    address = {"socket_path": args.socket} if args.socket else {"host": args.host, "port": args.port}
+    result = run_load(address, args.clients, args.requests, args.size, args.method, args.seed)
+    print(f"{result['requests']} request(s) in {result['seconds']:.2f} seconds: {result['throughput']:.1f} requests/s, "
+          f"latency p50 {1000 * result['latency_p50']:.2f} ms, p95 {1000 * result['latency_p95']:.2f} ms, "
+          f"p99 {1000 * result['latency_p99']:.2f} ms")
+    for error in result["errors"]:
+        print(f"ERROR {error}")
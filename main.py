@@ -1,91 +1,291 @@
-import argparse
-import global_constant as gb
-import time
-
-from utils import *
-from test import TestCase
-from qr_algorithm import *
-
-parser = argparse.ArgumentParser(
-    description="Demonstrate QR Algorithm"
-)
-parser.add_argument("--gen", action="store_true", 
-                    help="Generate a square matrix (use --sym for a symmetric matrix) and store it in the input file")
-parser.add_argument("--sym", action="store_true", 
-                    help="Enable symmetric matrix mode")
-parser.add_argument("--run", choices=["qr", "wilkinson", "francis"], default=None,
-                    help="Run the QR algorithm with the specified method.")
-parser.add_argument("--test", action="store_true",
-                    help="Test the QR algorithm.")
-parser.add_argument("--maxsize", type=int, default=5,
-                    help="Specify the maximum size of the generated matrix (only works if --gen is enabled)")
-parser.add_argument("--low", type=int, default=-200,
-            help="Specify the lower bound for the elements of the generated matrix (only works if --gen is enabled)")
-parser.add_argument("--high", type=int, default=200,
-            help="Specify the upper bound for the elements of the generated matrix (only works if --gen is enabled)")
-parser.add_argument("--input", type=str, required=True,
-                    help="Input file contains the matrix.")
-parser.add_argument("--visualize", action="store_true", 
-                    help="Visualize the convergence")
-parser.add_argument("--maxiter", type=int, default=1000,
-                    help="Maximum iteration")
-parser.add_argument("--tolerance", type=float, default=1e-6, 
-                    help="Convergence tolerance")
-parser.add_argument("--test_maxiter", type=int, default=1000, 
-                    help="Testing maximum iteration")
-parser.add_argument("--test_tol", type=float, default=1e-6, 
-                    help="Testing tolerance")
-
-gb.args = parser.parse_args()
-if __name__ == '__main__':
-    if not gb.args.run and not gb.args.test:
-        raise ValueError("Must specify --run or --test")
-    
-    if gb.args.run and gb.args.test:
-        raise ValueError("Only --run or --test is specified during the project")
-
-    if gb.args.gen:
-        gen_sym_matrix(gb.args.input, gb.args.low, gb.args.high, gb.args.maxsize) if gb.args.sym else \
-        gen_matrix(gb.args.input, gb.args.low, gb.args.high, gb.args.maxsize)
-    
-    if gb.args.visualize:
-        gb.VISUALIZE = True
-
-    if gb.args.test:
-        testcase = TestCase(filename=gb.args.input)
-        testcase.test_eigen()
-    
-    else:
-        methods = {
-            "qr": qr_algorithm,
-            "wilkinson": qr_algorithm_wilkinson,
-            "francis": francis_double_shift_qr
-        }
-
-        method_names = {
-            "qr": "QR Algorithm",
-            "wilkinson": "QR Algorithm with Wilkinson Shift",
-            "francis": "Francis Double Shift QR"
-        }
-
-        if gb.args.run not in methods:
-            raise ValueError(f"Invalid method: {gb.args.run}. Choose from {list(methods.keys())}.")
-        
-        method = methods[gb.args.run]
-        A = load_matrix(gb.args.input)
-        if A.shape[0] < 10:
-            print("Matrix A:")
-            print_matrix(A)
-
-        A2 = A.copy()
-        qr_algo_start = time.time()
-        eigenvals, eigenvecs = method(A2, gb.args.test_maxiter, gb.args.test_tol)
-        qr_algo_end = time.time()
-        
-        if len(eigenvals) < 10 and len(eigenvecs) < 10:
-            print(f"Using QR Algorithm with {method}:")
-            print_eigens(eigenvals, eigenvecs)
-        
-        print(f"Time to find eigenvalues and eigenvectors using {method_names[gb.args.run]}: {(qr_algo_end - qr_algo_start):.4f} seconds")
-        if gb.VISUALIZE:
-            plot_QR_algorithm_convergence(gb.matrices)
\ No newline at end of file
+import argparse
+import global_constant as gb
+import json
+import time
+
+from utils import *
+from recorder import make_recorder
+from profiler import PhaseProfiler
+from qr_algorithm import *
+from symmetric import symmetric_qr, is_symmetric
+from batched import qr_algorithm_batched
+from krylov import arnoldi, subspace_iteration, WHICH
+from warm_start import solve_sequence
+from mixed_precision import mixed_precision_qr
+from cache import ResultCache, cache_key, file_digest
+
+parser = argparse.ArgumentParser(
+    description="Demonstrate QR Algorithm"
+)
+parser.add_argument("--gen", action="store_true", 
+                    help="Generate a square matrix (use --sym for a symmetric matrix) and store it in the input file")
+parser.add_argument("--sym", action="store_true", 
+                    help="Enable symmetric matrix mode")
+parser.add_argument("--run", choices=["qr", "wilkinson", "francis", "symmetric", "batched", "warm", "arnoldi", "subspace", "auto"], default=None,
+                    help="Run the QR algorithm with the specified method (batched: a stack of matrices separated by empty lines; "
+                         "warm: a stack of slowly varying matrices, each one warm-started from the Schur form of the previous one; "
+                         "arnoldi/subspace: only --k selected eigenvalues, with implicitly restarted Arnoldi or block power iterations; "
+                         "auto: batched for a stack, symmetric for symmetric matrices, francis otherwise).")
+parser.add_argument("--sym_method", choices=["qr", "dc"], default="qr",
+                    help="Tridiagonal eigensolver of --run symmetric: implicit QR sweeps or divide-and-conquer (only used for eigenvectors)")
+parser.add_argument("--test", action="store_true",
+                    help="Test the QR algorithm.")
+parser.add_argument("--maxsize", type=int, default=5,
+                    help="Specify the maximum size of the generated matrix (only works if --gen is enabled)")
+parser.add_argument("--low", type=int, default=-200,
+            help="Specify the lower bound for the elements of the generated matrix (only works if --gen is enabled)")
+parser.add_argument("--high", type=int, default=200,
+            help="Specify the upper bound for the elements of the generated matrix (only works if --gen is enabled)")
+parser.add_argument("--input", type=str, default=None,
+                    help="Input file contains the matrix (required unless --serve is enabled).")
+parser.add_argument("--visualize", action="store_true", 
+                    help="Visualize the convergence")
+parser.add_argument("--trace", choices=["ring", "strided", "summary"], default="strided",
+                    help="What to record for --visualize: the last iterates, evenly spaced iterates or the subdiagonal norms")
+parser.add_argument("--trace_size", type=int, default=gb.max_frame,
+                    help="Number of iterates kept by the ring or strided trace (only works if --visualize is enabled)")
+parser.add_argument("--maxiter", type=int, default=1000,
+                    help="Maximum iteration")
+parser.add_argument("--tolerance", type=float, default=1e-6, 
+                    help="Convergence tolerance")
+parser.add_argument("--test_maxiter", type=int, default=1000, 
+                    help="Testing maximum iteration")
+parser.add_argument("--test_tol", type=float, default=1e-6, 
+                    help="Testing tolerance")
+parser.add_argument("--residual_tol", type=float, default=1e-6,
+                    help="Largest relative residual ||Av - lambda v|| of a passing eigenpair in --test")
+parser.add_argument("--value_tol", type=float, default=1e-6,
+                    help="Largest distance (relative to ||A||_F) of a passing eigenvalue to np.linalg.eigvals in --test")
+parser.add_argument("--test_report", type=str, default=None,
+                    help="Write the --test results (pass/fail, residuals, eigenvalue errors) to this JSON file")
+parser.add_argument("--values-only", action="store_true",
+                    help="Only compute the eigenvalues (skip the accumulation of the eigenvectors)")
+parser.add_argument("--workers", type=int, default=0,
+                    help="Number of worker processes for independent diagonal blocks of --run wilkinson/francis (0: serial)")
+parser.add_argument("--aed_window", type=int, default=0,
+                    help="Trailing window size for aggressive early deflation in --run wilkinson/francis (0: disabled)")
+parser.add_argument("--value_range", type=float, nargs=2, default=None, metavar=("LOW", "HIGH"),
+                    help="Only return the eigenvalues with real part in [LOW, HIGH] and their eigenvectors (--run wilkinson/francis)")
+parser.add_argument("--balance", action="store_true",
+                    help="Balance the matrix (permutation and power of 2 scaling) before --run qr/wilkinson/francis")
+parser.add_argument("--shifts", type=int, default=2,
+                    help="Number of shifts per sweep of --run francis/warm (more than 2: multishift chain of small bulges)")
+parser.add_argument("--precision", choices=["double", "mixed"], default="double",
+                    help="mixed: Hessenberg reduction and sweeps of --run wilkinson/francis in float32, refined to float64 (float64 again if that fails); not combined with --value_range, --balance or --workers")
+parser.add_argument("--cache", action="store_true",
+                    help="Reuse the result of an identical solve (same file content and solver settings) instead of parsing and solving again "
+                         "(results outlive the run only with --cache_dir); with --serve, an in-memory cache of the server's results")
+parser.add_argument("--cache_dir", type=str, default=None,
+                    help="Directory the cache spills to (.npz files), kept across runs (only works if --cache is enabled)")
+parser.add_argument("--cache_size", type=int, default=gb.cache_bytes >> 20,
+                    help="Memory budget of the in-memory cache tier in MB (only works if --cache is enabled)")
+parser.add_argument("--stream", action="store_true",
+                    help="Print the eigenvalues of --run wilkinson/francis as they converge (no eigenvectors)")
+parser.add_argument("--first", type=int, default=None,
+                    help="Stop after this many eigenvalues (only works if --stream is enabled)")
+parser.add_argument("--time_budget", type=float, default=None,
+                    help="Stop sweeping after this many seconds and print the eigenvalues converged so far (only works if --stream is enabled)")
+parser.add_argument("--serve", action="store_true",
+                    help="Run a solver server for --run qr/wilkinson/francis requests (see client.py) instead of solving --input")
+parser.add_argument("--socket", type=str, default=None,
+                    help="Unix socket of the server (default: TCP on --host:--port)")
+parser.add_argument("--host", type=str, default="127.0.0.1",
+                    help="Host of the TCP server")
+parser.add_argument("--port", type=int, default=gb.serve_port,
+                    help="Port of the TCP server")
+parser.add_argument("--serve_workers", type=int, default=None,
+                    help="Number of worker processes of the server (default: all cores)")
+parser.add_argument("--profile", type=str, nargs="?", const="-", default=None, metavar="JSON",
+                    help="Measure the phase times, sweeps, deflations and shifts of the solve; print a summary, or write JSON to the given file")
+parser.add_argument("--k", type=int, default=6,
+                    help="Number of eigenvalues computed by --run arnoldi/subspace")
+parser.add_argument("--which", choices=list(WHICH.keys()), default="LM",
+                    help="Eigenvalues wanted by --run arnoldi: largest/smallest magnitude, largest/smallest real part")
+parser.add_argument("--sigma", type=float, default=None,
+                    help="Shift-invert mode of --run arnoldi: find the eigenvalues closest to SIGMA (with --which LM)")
+
+gb.args = parser.parse_args()
+if __name__ == '__main__' and gb.args.serve:
+    from server import serve
+
+    serve(gb.args.socket, gb.args.host, gb.args.port, gb.args.serve_workers, gb.args.cache_size << 20 if gb.args.cache else 0)
+
+elif __name__ == '__main__':
+    if gb.args.input is None:
+        raise ValueError("Must specify --input")
+
+    if not gb.args.run and not gb.args.test:
+        raise ValueError("Must specify --run or --test")
+    
+    if gb.args.run and gb.args.test:
+        raise ValueError("Only --run or --test is specified during the project")
+
+    if gb.args.gen:
+        gen_sym_matrix(gb.args.input, gb.args.low, gb.args.high, gb.args.maxsize) if gb.args.sym else \
+        gen_matrix(gb.args.input, gb.args.low, gb.args.high, gb.args.maxsize)
+    
+    if gb.args.profile:
+        gb.profiler = PhaseProfiler()
+
+    if gb.args.visualize:
+        gb.VISUALIZE = True
+        gb.recorder = make_recorder(gb.args.trace, gb.args.trace_size)
+
+    if gb.args.test:
+        from test import TestCase
+
+        testcase = TestCase(filename=gb.args.input)
+        testcase.test_eigen()
+        if gb.args.test_report is not None:
+            with open(gb.args.test_report, 'w') as f:
+                json.dump(testcase.results, f, indent=2)
+
+        if not all(result["passed"] for result in testcase.results):
+            raise SystemExit(1)
+    
+    elif gb.args.stream:
+        if gb.args.run not in ("wilkinson", "francis"):
+            raise ValueError(f"Invalid method for --stream: {gb.args.run}. Choose from ['wilkinson', 'francis'].")
+
+        A = load_matrix(gb.args.input)
+        found = 0
+        stream_start = time.time()
+        for eigenvalues, row, sweeps, error in stream_eigenvalues(A, gb.args.test_maxiter, gb.args.test_tol, gb.args.run,
+                                                                  gb.args.aed_window, gb.args.shifts, gb.args.balance,
+                                                                  gb.args.time_budget):
+            for value in eigenvalues:
+                print(f"{value:.6f}  (row {row}, sweep {sweeps}, backward error {error:.1e})")
+
+            found += len(eigenvalues)
+            if gb.args.first is not None and found >= gb.args.first:
+                break
+
+        print(f"{found} of {A.shape[0]} eigenvalues in {(time.time() - stream_start):.4f} seconds")
+
+    else:
+        methods = {
+            "qr": qr_algorithm,
+            "wilkinson": qr_algorithm_wilkinson,
+            "francis": francis_double_shift_qr,
+            "symmetric": symmetric_qr,
+            "batched": qr_algorithm_batched,
+            "warm": solve_sequence,
+            "arnoldi": arnoldi,
+            "subspace": subspace_iteration
+        }
+
+        method_names = {
+            "qr": "QR Algorithm",
+            "wilkinson": "QR Algorithm with Wilkinson Shift",
+            "francis": "Francis Double Shift QR",
+            "symmetric": "Symmetric Tridiagonal QR",
+            "batched": "Batched Francis Double Shift QR",
+            "warm": "Warm-Started Schur Refinement",
+            "arnoldi": "Implicitly Restarted Arnoldi",
+            "subspace": "Subspace Iteration"
+        }
+
+        cache = None
+        cached = None
+        if gb.args.cache:
+            # The key hashes the raw file, so a hit skips parsing as well as solving. A
+            # single run only looks up once: across runs, hits come from --cache_dir
+            cache = ResultCache(gb.args.cache_size << 20, gb.args.cache_dir)
+            settings = {name: getattr(gb.args, name) for name in
+                        ("sym_method", "aed_window", "value_range", "shifts", "balance", "k", "which", "sigma", "precision")}
+            key = cache_key(file_digest(gb.args.input), gb.args.run, gb.args.test_maxiter, gb.args.test_tol,
+                            not gb.args.values_only, **settings)
+            cached = cache.get(key)
+
+        if cached is not None:
+            eigenvals, eigenvecs = cached
+            print(f"Loaded eigenvalues and eigenvectors of --run {gb.args.run} from the cache")
+
+        else:
+            A = load_matrix(gb.args.input)
+            if gb.args.run == "auto":
+                gb.args.run = "batched" if A.ndim == 3 else "symmetric" if is_symmetric(A) else "francis"
+
+            if (A.ndim == 3) != (gb.args.run in ("batched", "warm")):
+                raise ValueError("A stack of matrices needs --run batched, warm (or auto), and --run batched/warm needs a stack.")
+
+            if gb.args.run not in methods:
+                raise ValueError(f"Invalid method: {gb.args.run}. Choose from {list(methods.keys())}.")
+        
+            method = methods[gb.args.run]
+            method_kwargs = {}
+            if gb.args.run == "symmetric":
+                method_kwargs["method"] = gb.args.sym_method
+
+            elif gb.args.run in ("wilkinson", "francis"):
+                method_kwargs["workers"] = gb.args.workers
+                method_kwargs["aed_window"] = gb.args.aed_window
+                method_kwargs["value_range"] = gb.args.value_range
+
+            if gb.args.run in ("francis", "warm"):
+                method_kwargs["shifts"] = gb.args.shifts
+
+            if gb.args.run in ("qr", "wilkinson", "francis"):
+                method_kwargs["balance"] = gb.args.balance
+
+            if gb.args.run in ("arnoldi", "subspace"):
+                method_kwargs["k"] = gb.args.k
+
+            if gb.args.run == "arnoldi":
+                method_kwargs["which"] = gb.args.which
+                method_kwargs["sigma"] = gb.args.sigma
+
+            if gb.args.precision == "mixed":
+                if gb.args.run not in ("wilkinson", "francis"):
+                    raise ValueError(f"Invalid method for --precision mixed: {gb.args.run}. Choose from ['wilkinson', 'francis'].")
+
+                unsupported = [flag for flag, value in (("--value_range", gb.args.value_range is not None),
+                                                        ("--balance", gb.args.balance),
+                                                        ("--workers", gb.args.workers > 0)) if value]
+                if unsupported:
+                    raise ValueError(f"Invalid options for --precision mixed: {unsupported}. Run them with --precision double.")
+
+                method = mixed_precision_qr
+                method_kwargs = {"method": gb.args.run, "aed_window": gb.args.aed_window, "shifts": gb.args.shifts}
+
+            if A.ndim == 2 and A.shape[0] < 10:
+                print("Matrix A:")
+                print_matrix(A)
+
+            A2 = A.copy()
+            qr_algo_start = time.time()
+            eigenvals, eigenvecs = method(A2, gb.args.test_maxiter, gb.args.test_tol,
+                                          compute_vectors=not gb.args.values_only, **method_kwargs)
+            qr_algo_end = time.time()
+
+            if cache is not None:
+                cache.put(key, eigenvals, eigenvecs)
+
+        if eigenvals.ndim == 2:
+            if len(eigenvals) < 10 and eigenvals.shape[1] < 10:
+                for index in range(len(eigenvals)):
+                    print(f"Matrix {index}:")
+                    print_eigens(eigenvals[index], None if eigenvecs is None else eigenvecs[index])
+
+        elif len(eigenvals) < 10:
+            if cached is None:
+                print(f"Using QR Algorithm with {method}:")
+
+            print_eigens(eigenvals, eigenvecs)
+        
+        if cached is None:
+            print(f"Time to find eigenvalues and eigenvectors using {method_names[gb.args.run]}: {(qr_algo_end - qr_algo_start):.4f} seconds")
+
+        if cache is not None:
+            print(f"Cache: {cache.stats()}")
+
+        if gb.args.profile and cached is None:
+            if gb.args.profile == "-":
+                print_profile(gb.profiler.stats())
+
+            else:
+                with open(gb.args.profile, 'w') as f:
+                    json.dump(gb.profiler.stats(), f, indent=2)
+
+        if gb.VISUALIZE and cached is None:
+            plot_QR_algorithm_convergence(gb.recorder)
\ No newline at end of file
@@ -0,0 +1,93 @@
+import warnings
+import numpy as np
+import global_constant as gb
+
+from scipy.linalg import rsf2csf
+from qr_algorithm import (
+    with_stats, reduce_to_hessenberg, iterate_blocks, extract_eigens_from_schur,
+    _wilkinson_step, _francis_step, _multishift_step
+)
+from warm_start import refine_schur, complex_schur_eigens
+
+@with_stats
+def mixed_precision_qr(
+    A: np.ndarray,
+    max_iter: int = 1000,
+    tol: float = 1e-8,
+    compute_vectors: bool = True,
+    method: str = "francis",
+    aed_window: int = 0,
+    shifts: int = 2,
+    max_refine: int = 5
+) -> tuple[np.ndarray, np.ndarray | None]:
+    """
+    Computes the eigenvalues of a real square matrix A with the Hessenberg
+    reduction and the QR sweeps in float32, refined to float64 accuracy.
+
+    The float32 sweeps stop at the deflation tolerance max(tol, gb.mixed_tol).
+    Their real Schur form is turned into a complex one, its Schur vectors are
+    made orthonormal in float64, and Newton steps against the float64 A (see
+    `refine_schur`) bring the residual ||A U - U T|| down to tol ||A||, which
+    takes 2 or 3 steps as each squares the residual. If they do not get
+    there, A is solved again with float64 sweeps.
+
+    Args:
+        A (np.ndarray): The real square matrix whose eigenvalues are to be found.
+        max_iter (int): The maximum number of sweeps (of each precision).
+        tol (float): The tolerance of the float64 result.
+        compute_vectors (bool): If False, return None in place of the eigenvectors.
+        method (str): "wilkinson" or "francis" sweeps.
+        aed_window (int): The size of the aggressive early deflation window (0: disabled).
+        shifts (int): The number of shifts per Francis sweep (see `francis_double_shift_qr`).
+        max_refine (int): The maximum number of Newton steps.
+        return_stats (bool): Also return the phase times and counters (see `with_stats`).
+        callback: If given, called as callback(H, sweeps, lo, hi) after every sweep.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray | None]: An tuple contains the eigenvalues
+        and the eigenvectors of the matrix A (and the stats with return_stats).
+    """
+    if method not in ("wilkinson", "francis"):
+        raise ValueError(f"Invalid method: {method}. Choose from ['wilkinson', 'francis'].")
+
+    if method == "wilkinson":
+        step, step_kwargs = _wilkinson_step, {"aed_window": aed_window}
+
+    elif shifts > 2:
+        step, step_kwargs = _multishift_step, {"shifts": shifts, "aed_window": aed_window}
+
+    else:
+        step, step_kwargs = _francis_step, {"aed_window": aed_window}
+
+    A = np.asarray(A, dtype=np.float64)
+    with gb.profiler.phase("hessenberg"):
+        H, Q_total, _ = reduce_to_hessenberg(A, dtype=np.float32)
+
+    gb.recorder.reset()
+    gb.recorder.record(H)
+    with gb.profiler.phase("sweeps"), warnings.catch_warnings():
+        # No convergence warning here: unconverged float32 sweeps fail the check below and are solved again
+        warnings.simplefilter("ignore")
+        iterate_blocks(H, Q_total, step, max_iter, max(tol, gb.mixed_tol), **step_kwargs)
+
+    with gb.profiler.phase("refine"):
+        T, U = rsf2csf(H.astype(np.float64), Q_total.astype(np.float64))
+        U, R = np.linalg.qr(U)
+        refined = refine_schur(A, U * np.sign(np.diagonal(R).real), tol, max_refine)
+
+    if refined is not None:
+        U, T, steps = refined
+        gb.profiler.count("refine_steps", steps)
+        with gb.profiler.phase("extract"):
+            return complex_schur_eigens(T, U if compute_vectors else None, tol)
+
+    # The residual check failed: solve again in float64
+    gb.profiler.count("fallbacks")
+    with gb.profiler.phase("hessenberg"):
+        H, Q_total, _ = reduce_to_hessenberg(A, compute_vectors)
+
+    with gb.profiler.phase("sweeps"):
+        iterate_blocks(H, Q_total, step, max_iter, tol, **step_kwargs)
+
+    with gb.profiler.phase("extract"):
+        return extract_eigens_from_schur(H, Q_total, tol=tol)
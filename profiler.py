@@ -0,0 +1,99 @@
+import numpy as np
+import time
+
+from contextlib import contextmanager, nullcontext
+
+_NO_PHASE = nullcontext()
+
+class Profiler:
+    """
+    Phase timers, counters and per-iteration hook used by the QR solvers.
+
+    The solvers call `reset()` once per solve, wrap their phases in
+    `with profiler.phase(name):`, bump counters with `count(name, k)`, report
+    the rows [lo, hi) that split off after `sweeps` sweeps with
+    `deflated(lo, hi, sweeps)`, and call `iteration(H, sweeps, lo, hi)` after
+    every sweep on the block H[lo:hi, lo:hi]. This base class does nothing
+    (`phase` returns one shared no-op context manager), so profiling costs a
+    few method calls per sweep when it is disabled.
+    """
+    enabled = False
+
+    def reset(self):
+        """Forget everything measured so far."""
+        pass
+
+    def phase(self, name: str):
+        """Context manager timing the phase `name`."""
+        return _NO_PHASE
+
+    def count(self, name: str, k: int = 1):
+        """Add k to the counter `name`."""
+        pass
+
+    def deflated(self, lo: int, hi: int, sweeps: int):
+        """Record that the rows [lo, hi) converged after `sweeps` sweeps."""
+        pass
+
+    def iteration(self, H: np.ndarray, sweeps: int, lo: int, hi: int):
+        """Called after every sweep on the block H[lo:hi, lo:hi]."""
+        pass
+
+    def stats(self) -> dict:
+        """Return the measurements."""
+        return {}
+
+class PhaseProfiler(Profiler):
+    """
+    Accumulate the time and number of calls of every phase, the counters, and
+    the number of sweeps after which each diagonal position converged.
+
+    Phases nest: the time of a phase includes the phases run inside it (e.g.
+    "deflation_checks" inside "sweeps").
+
+    Args:
+        callback: If given, called as callback(H, sweeps, lo, hi) after every
+            sweep (H is the live iterate and must not be modified).
+    """
+    enabled = True
+
+    def __init__(self, callback=None):
+        self.callback = callback
+        self.reset()
+
+    def reset(self):
+        self.times = {}
+        self.calls = {}
+        self.counters = {}
+        self.deflated_at = {}
+
+    @contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+
+        finally:
+            self.times[name] = self.times.get(name, 0.0) + time.perf_counter() - start
+            self.calls[name] = self.calls.get(name, 0) + 1
+
+    def count(self, name: str, k: int = 1):
+        self.counters[name] = self.counters.get(name, 0) + int(k)
+
+    def deflated(self, lo: int, hi: int, sweeps: int):
+        for i in range(lo, hi):
+            self.deflated_at[i] = sweeps
+
+        self.count("deflations", hi - lo)
+
+    def iteration(self, H: np.ndarray, sweeps: int, lo: int, hi: int):
+        if self.callback is not None:
+            self.callback(H, sweeps, lo, hi)
+
+    def stats(self) -> dict:
+        return {
+            "times": dict(self.times),
+            "calls": dict(self.calls),
+            "counters": dict(self.counters),
+            "sweeps_per_eigenvalue": [self.deflated_at[i] for i in sorted(self.deflated_at)]
+        }
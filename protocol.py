@@ -0,0 +1,114 @@
+import struct
+import numpy as np
+
+# Wire format of the solver server (see server.py and client.py), little-endian.
+#
+# Every message is a 4-byte length followed by that many bytes:
+#   request:  REQUEST header, then the n x n matrix as float64 in row-major order
+#   response: RESPONSE header, then the eigenvalues (count float64 or complex128),
+#             then the eigenvectors (rows x count, row-major, same rule) if present;
+#             for an error, the UTF-8 message instead.
+
+METHODS = ["qr", "wilkinson", "francis"]
+
+LENGTH = struct.Struct("<I")
+REQUEST = struct.Struct("<BBxxIId")      # method, compute_vectors, n, max_iter, tol
+RESPONSE = struct.Struct("<BBxxIId")     # status, flags, rows, count, seconds
+
+STATUS_OK = 0
+STATUS_ERROR = 1
+
+COMPLEX_VALUES = 1
+HAS_VECTORS = 2
+COMPLEX_VECTORS = 4
+
+def encode_request(
+    A: np.ndarray,
+    method: str,
+    max_iter: int,
+    tol: float,
+    compute_vectors: bool
+) -> tuple[bytes, memoryview]:
+    """
+    Encode a request.
+
+    Returns:
+        tuple[bytes, memoryview]: An tuple contains the length and header, and
+        the matrix buffer (a view of A when it is already float64 and
+        contiguous), to be sent one after the other.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Invalid method: {method}. Choose from {METHODS}.")
+
+    A = np.ascontiguousarray(A, dtype="<f8")
+    if A.ndim != 2 or A.shape[0] != A.shape[1]:
+        raise ValueError(f"Invalid shape: {A.shape}. Expected a square matrix.")
+
+    header = REQUEST.pack(METHODS.index(method), compute_vectors, A.shape[0], max_iter, tol)
+    return LENGTH.pack(len(header) + A.nbytes) + header, memoryview(A).cast("B")
+
+def decode_request(frame) -> tuple[str, np.ndarray, int, float, bool]:
+    """
+    Decode a request frame (without its length); the matrix is a read-only view of the frame.
+
+    Returns:
+        tuple[str, np.ndarray, int, float, bool]: An tuple contains the
+        method, the matrix, max_iter, tol and compute_vectors.
+    """
+    method, compute_vectors, n, max_iter, tol = REQUEST.unpack_from(frame)
+    if method >= len(METHODS):
+        raise ValueError(f"Invalid method: {method}. Choose from {list(range(len(METHODS)))}.")
+
+    if len(frame) != REQUEST.size + 8 * n * n:
+        raise ValueError(f"Invalid request: {len(frame)} bytes for a {n} x {n} matrix.")
+
+    A = np.frombuffer(frame, dtype="<f8", count=n * n, offset=REQUEST.size).reshape(n, n)
+    return METHODS[method], A, max_iter, tol, bool(compute_vectors)
+
+def encode_response(
+    eigenvalues: np.ndarray,
+    eigenvectors: np.ndarray | None,
+    seconds: float
+) -> list:
+    """Encode a result as a list of buffers (the header, then views of the arrays) to send in order."""
+    flags = COMPLEX_VALUES if np.iscomplexobj(eigenvalues) else 0
+    eigenvalues = np.ascontiguousarray(eigenvalues, dtype="<c16" if flags else "<f8")
+    buffers = [memoryview(eigenvalues).cast("B")]
+    rows = 0
+    if eigenvectors is not None:
+        flags |= HAS_VECTORS | (COMPLEX_VECTORS if np.iscomplexobj(eigenvectors) else 0)
+        eigenvectors = np.ascontiguousarray(eigenvectors, dtype="<c16" if flags & COMPLEX_VECTORS else "<f8")
+        rows = eigenvectors.shape[0]
+        buffers.append(memoryview(eigenvectors).cast("B"))
+
+    header = RESPONSE.pack(STATUS_OK, flags, rows, len(eigenvalues), seconds)
+    size = len(header) + sum(len(b) for b in buffers)
+    return [LENGTH.pack(size) + header, *buffers]
+
+def encode_error(message: str) -> bytes:
+    """Encode an error response."""
+    payload = RESPONSE.pack(STATUS_ERROR, 0, 0, 0, 0.0) + message.encode()
+    return LENGTH.pack(len(payload)) + payload
+
+def decode_response(frame) -> tuple[np.ndarray, np.ndarray | None, float]:
+    """
+    Decode a response frame (without its length); the arrays are views of the frame.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray | None, float]: An tuple contains the
+        eigenvalues, the eigenvectors and the solve time in seconds.
+    """
+    status, flags, rows, count, seconds = RESPONSE.unpack_from(frame)
+    if status != STATUS_OK:
+        raise RuntimeError(f"Server error: {bytes(frame[RESPONSE.size:]).decode()}")
+
+    offset = RESPONSE.size
+    dtype = np.dtype("<c16" if flags & COMPLEX_VALUES else "<f8")
+    eigenvalues = np.frombuffer(frame, dtype=dtype, count=count, offset=offset)
+    offset += dtype.itemsize * count
+    eigenvectors = None
+    if flags & HAS_VECTORS:
+        dtype = np.dtype("<c16" if flags & COMPLEX_VECTORS else "<f8")
+        eigenvectors = np.frombuffer(frame, dtype=dtype, count=rows * count, offset=offset).reshape(rows, count)
+
+    return eigenvalues, eigenvectors, seconds
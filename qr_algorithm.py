@@ -1,255 +1,1170 @@
-import numpy as np
-import global_constant as gb
-from scipy.linalg import hessenberg
-
-def qr_algorithm(
-    A: np.ndarray,
-    max_iter: int = 1000,
-    tol: float = 1e-10
-) -> tuple[np.ndarray, np.ndarray]:
-    """Compute the eigenvalues and eigenvectors of matrix A using the QR algorithm."""
-    
-    Ak = hessenberg(A)
-    Q_total = np.eye(A.shape[0])
-    gb.matrices = [Ak]
-    
-    for _ in range(max_iter):
-        Q, R = np.linalg.qr(Ak, mode='complete')
-        
-        Ak_next = R @ Q
-        Q_total = Q_total @ Q
-        gb.matrices.append(Ak_next)
-        
-        # Check for convergence
-        if np.linalg.norm(Ak - Ak_next, ord=gb.norm_ord) < tol:
-            Ak = Ak_next
-            break
-
-        Ak = Ak_next
-    
-    eigenvalues = np.diag(Ak)
-    return eigenvalues, Q_total
-
-def extract_eigens_from_schur(
-    T: np.ndarray,
-    Q_total: np.ndarray,
-    tol: float = 1e-8
-) -> tuple[np.ndarray, np.ndarray]:
-    """Extract eigenvalues and eigenvectors from the Schur form."""
-    n = T.shape[0]
-    eigenvalues = []
-    eigenvectors = []
-    i = 0
-    while i < n:
-        if i < n - 1 and abs(T[i + 1, i]) > tol:
-            # 2×2 block → complex conjugate eigenvalues
-            H = T[i : (i + 2), i : (i + 2)]
-            # Fast eigenvalue computation for 2x2 matrix
-            eigvals, eigvects = np.linalg.eig(H)
-            for j in range(2):
-                w = eigvects[:, j]
-                v = Q_total[:, i : (i + 2)] @ w
-                eigenvalues.append(eigvals[j])
-                eigenvectors.append(v)
-            
-            i += 2
-
-        else:
-            eigvals = T[i, i]
-            e = np.zeros(n)
-            e[i] = 1.0
-            v = Q_total @ e
-            eigenvectors.append(v)
-            eigenvalues.append(T[i, i])
-            i += 1
-
-    return np.array(eigenvalues), np.column_stack(eigenvectors)
-
-def qr_algorithm_wilkinson(
-    A: np.ndarray,
-    max_iter: int = 1000,
-    tol: float = 1e-8
-) -> tuple[np.ndarray, np.ndarray]:
-    """
-    Computes the eigenvalues of a real square matrix A using the QR algorithm
-    with the Wilkinson shift strategy.
-
-    Args:
-        A (np.ndarray): The real square matrix whose eigenvalues are to be found.
-        max_iter (int): The maximum number of iterations.
-        tol (float): The tolerance for convergence.
-
-    Returns:
-        tuple[np.ndarray, np.ndarray]: An tuple contains the eigenvalues and the
-        eigenvectors of the matrix A.
-    """
-    def wilkinson_shift(H):
-        """Compute the Wilkinson shift for the given matrix H."""
-        n = H.shape[0]
-        if n < 2:
-            return H[0, 0] if n == 1 else 0
-
-        a = H[n - 2, n - 2]
-        b = H[n - 2, n - 1]
-        c = H[n - 1, n - 2]
-        d = H[n - 1, n - 1]
-
-        tr = a + d
-        det = a * d - b * c
-        discriminant = tr ** 2 - 4 * det
-        if discriminant >= 0:
-            sqrt_discriminant = np.sqrt(discriminant)
-            mu1 = (tr + sqrt_discriminant) / 2
-            mu2 = (tr - sqrt_discriminant) / 2
-            return mu1 if (abs(mu1 - d) <= abs(mu2 - d)) else mu2
-        
-        else:
-            return tr / 2
-    
-    n = A.shape[0]
-    if n == 1:
-        return A[0, 0]
-
-    H = hessenberg(A)
-    gb.matrices = [H.copy()]
-    Q_total = np.eye(n)
-    iterations = 0
-    m = n
-
-    while m > 1:
-        if iterations > max_iter:
-            break
-
-        # Wilkinson shift
-        mu = wilkinson_shift(H[:m, :m])
-        shift_matrix = mu * np.eye(m)
-        Q, R = np.linalg.qr(H[:m, :m] - shift_matrix)
-        H[:m, :m] = R @ Q + shift_matrix
-        Q_full = np.eye(n)
-        Q_full[:m, :m] = Q
-        Q_total = Q_total @ Q_full
-
-        iterations += 1
-
-        # Check for deflation (small off-diagonal element)
-        if abs(H[m - 1, m - 2]) < tol * (abs(H[m - 2, m - 2]) + abs(H[m - 1, m - 1])):
-            H[m - 1, m - 2] = 0
-            m -= 1
-        
-        gb.matrices.append(H.copy())
-
-    return extract_eigens_from_schur(H, Q_total, tol=tol)
-
-def francis_double_shift_qr(
-    H: np.ndarray,
-    max_iter: int = 1000,
-    tol: float = 1e-8
-) -> tuple[np.ndarray, np.ndarray]:
-    """
-    Computes the eigenvalues of a real square matrix A using the QR algorithm
-    with the Francis Double Shift strategy.
-
-    Args:
-        A (np.ndarray): The real square matrix whose eigenvalues are to be found.
-        max_iter (int): The maximum number of iterations.
-        tol (float): The tolerance for convergence.
-
-    Returns:
-        tuple[np.ndarray, np.ndarray]: An tuple contains the eigenvalues and the
-        eigenvectors of the matrix A.
-    """
-    def householder_reflector(x):
-        """Compute Householder matrix P such that P @ x = alpha * e1"""
-        norm_x = np.linalg.norm(x)
-        if norm_x == 0:
-            return np.eye(len(x), dtype=np.complex64)
-        
-        v = x.copy()
-        sign = x[0] / abs(x[0]) if x[0] != 0 else 1.0
-        v[0] += sign * np.linalg.norm(x)
-        v /= np.linalg.norm(v)
-        P = np.eye(len(x)) - 2 * np.outer(v, v)
-        return P
-
-    def givens_rotation(a, b):
-        """Compute Givens rotation matrix G such that G.T @ [a; b] = [r; 0]"""
-        if a == 0 and b == 0:
-            return np.eye(2, dtype=np.complex64)
-        
-        r = np.linalg.norm([a, b])
-        c, s = a / r, -b / r if r != 0 else (1, 0)
-        return np.array([[c, -np.conj(s)], [s, np.conj(c)]], dtype=np.complex64)
-
-    H = hessenberg(H)
-    H = H.astype(complex)
-    n = H.shape[0]
-    gb.matrices = [H.copy()]
-    Q_total = np.eye(n, dtype=np.complex64)
-    p = n
-    iter_count = 0
-
-    while p > 2 and iter_count < max_iter:
-        iter_count += 1
-        q = p - 1
-
-        # Create Wilkinson shift
-        s = H[q - 1, q - 1] + H[p - 1, p - 1]
-        t = H[q - 1, q - 1] * H[p - 1, p - 1] - H[q - 1, p - 1] * H[p - 1, q - 1]
-
-        # Compute first column of M
-        x = H[0, 0] ** 2 + H[0, 1] * H[1, 0] - s * H[0, 0] + t
-        y = H[1, 0] * (H[0, 0] + H[1, 1] - s)
-        z = H[1, 0] * H[2, 1]
-
-        for k in range(p - 2):
-            r = max(1, k)
-            u = np.array([x, y, z])
-            Pk = householder_reflector(u)
-
-            # Apply from the left
-            r_end = min(k + 4, p)
-            H[k : (k + 3), (r - 1) : n] = Pk @ H[k : (k + 3), (r - 1) : n]
-
-            # Apply from the right
-            H[0 : r_end, k : (k + 3)] = H[0 : r_end, k : (k + 3)] @ Pk.T
-
-            Pk_full = np.eye(n, dtype=np.complex64)
-            Pk_full[k : (k + 3), k : (k + 3)] = Pk
-            Q_total = Q_total @ Pk_full.T
-
-            x = H[k + 1, k]
-            y = H[k + 2, k]
-            if k < p - 3:
-                z = H[k + 3, k]
-
-        x = H[p - 2, p - 3]
-        y = H[p - 1, p - 3]
-        G = givens_rotation(x, y)
-
-        # Apply from the left
-        H[(q - 1) : p, (p - 3) : n] = G @ H[(q - 1) : p, (p - 3) : n]
-
-        # Apply from the right
-        H[0 : p, (p - 2) : p] = H[0 : p, (p - 2) : p] @ G.T
-        Gfull = np.eye(n, dtype=np.complex64)
-        Gfull[(p - 2) : p, (p - 2) : p] = G
-        Q_total = Q_total @ Gfull.T
-
-        # Check for convergence
-        if abs(H[p - 1, q - 1]) < tol * (abs(H[q - 1, q - 1]) + abs(H[p - 1, p - 1])):
-            H[p - 1, q - 1] = 0
-            gb.matrices.append(H.copy())
-            p -= 1
-            q = p - 1
-
-        elif abs(H[p - 2, q - 2]) < tol * (abs(H[q - 2, q - 2]) + abs(H[q - 1, q - 1])):
-            H[p - 2, q - 2] = 0
-            gb.matrices.append(H.copy())
-            p -= 2
-            q = p - 1
-
-        else:
-            gb.matrices.append(H.copy())
-            pass  # No convergence yet
-
-    return extract_eigens_from_schur(H, Q_total, tol=tol)
\ No newline at end of file
+import functools
+import numpy as np
+import time
+import warnings
+import global_constant as gb
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from recorder import TraceRecorder
+from profiler import Profiler, PhaseProfiler
+from scipy.linalg import hessenberg, lapack, schur
+
+def givens(a: float, b: float) -> tuple[float, float]:
+    """Compute c, s such that [[c, s], [-s, c]] @ [a, b] = [r, 0]."""
+    if b == 0:
+        return 1.0, 0.0
+
+    r = np.hypot(a, b)
+    return a / r, b / r
+
+def with_stats(solver):
+    """
+    Add the keyword arguments return_stats and callback to a solver.
+
+    With either of them, a `PhaseProfiler` (calling `callback` after every
+    sweep) is installed as gb.profiler for the solve, unless a profiler is
+    installed already; with return_stats, its measurements (see
+    `PhaseProfiler.stats`) are returned as a third value.
+    """
+    @functools.wraps(solver)
+    def wrapper(*args, return_stats: bool = False, callback=None, **kwargs):
+        installed = gb.profiler
+        if (return_stats or callback is not None) and not installed.enabled:
+            gb.profiler = PhaseProfiler(callback)
+
+        try:
+            gb.profiler.reset()
+            eigenvalues, eigenvectors = solver(*args, **kwargs)
+            stats = gb.profiler.stats()
+
+        finally:
+            gb.profiler = installed
+
+        if return_stats:
+            return eigenvalues, eigenvectors, stats
+
+        return eigenvalues, eigenvectors
+
+    return wrapper
+
+def reduce_to_hessenberg(
+    A: np.ndarray,
+    compute_vectors: bool = True,
+    balance: bool = False,
+    dtype: type = np.float64
+) -> tuple[np.ndarray, np.ndarray | None, tuple[int, int, np.ndarray] | None]:
+    """
+    Reduce A to upper Hessenberg form H = Q^T B Q, in float64 (or dtype).
+
+    B is A itself or, with balance, the balanced B = D^-1 P^T A P D computed by
+    LAPACK gebal. The permutation P moves the rows and columns that isolate
+    eigenvalues to the top and bottom, so that only B[lo:hi, lo:hi] is left to
+    reduce, and the isolated eigenvalues sit on the diagonal with zero
+    subdiagonal entries (they split off at the first `find_splits`). The power
+    of 2 scaling D then makes the rows and columns of B[lo:hi, lo:hi] of
+    similar norm, which keeps the deflation tests meaningful for badly scaled
+    inputs.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray | None, tuple[int, int, np.ndarray] | None]:
+        An tuple contains H, Q (None if compute_vectors is False) and the
+        balancing (lo, hi, pivscale) to pass to `undo_balancing` (None without
+        balance).
+    """
+    A = np.asarray(A, dtype=dtype)
+    if not balance:
+        if compute_vectors:
+            H, Q_total = hessenberg(A, calc_q=True)
+            return H, Q_total, None
+
+        return hessenberg(A), None, None
+
+    gebal, = lapack.get_lapack_funcs(("gebal",), (A,))
+    H, lo, hi, pivscale, _ = gebal(A, scale=1, permute=1)
+    hi += 1
+    Q_total = np.eye(A.shape[0], dtype=dtype) if compute_vectors else None
+    if hi - lo > 2:
+        H_block, Q_block = hessenberg(H[lo:hi, lo:hi], calc_q=True)
+        H[lo:hi, lo:hi] = H_block
+        H[:lo, lo:hi] = H[:lo, lo:hi] @ Q_block
+        H[lo:hi, hi:] = Q_block.T @ H[lo:hi, hi:]
+        if compute_vectors:
+            Q_total[lo:hi, lo:hi] = Q_block
+
+    return H, Q_total, (lo, hi, pivscale)
+
+def undo_balancing(
+    eigenvectors: np.ndarray | None,
+    balancing: tuple[int, int, np.ndarray] | None
+) -> np.ndarray | None:
+    """
+    Map the eigenvectors of the balanced matrix back to eigenvectors of A
+    (v = P D w, as LAPACK gebak) and normalize them again.
+    """
+    if eigenvectors is None or balancing is None:
+        return eigenvectors
+
+    lo, hi, pivscale = balancing
+    V = eigenvectors.copy()
+    V[lo:hi] *= pivscale[lo:hi, None]
+    for i in [*range(lo - 1, -1, -1), *range(hi, V.shape[0])]:
+        k = int(pivscale[i]) - 1
+        if k != i:
+            V[[i, k]] = V[[k, i]]
+
+    return V / np.linalg.norm(V, axis=0)
+
+def hessenberg_qr_step(
+    H: np.ndarray,
+    Q_total: np.ndarray | None = None,
+    shift: float = 0.0,
+    lo: int = 0,
+    hi: int | None = None
+) -> np.ndarray:
+    """
+    Perform one QR step H <- RQ + shift I on an upper Hessenberg matrix, in place.
+
+    H - shift I = QR is computed with Givens rotations, each one touching only
+    two rows of H, and RQ is formed by applying the same rotations to the
+    columns. RQ is upper Hessenberg again, so a step costs O(n^2) instead of
+    the O(n^3) of a dense QR factorization.
+
+    Args:
+        H (np.ndarray): The upper Hessenberg matrix, overwritten with RQ + shift I.
+        Q_total (np.ndarray | None): If given, overwritten with Q_total @ Q.
+        shift (float): The shift of the step.
+        lo (int): The first row of the active block H[lo:hi, lo:hi].
+        hi (int | None): One past the last row of the active block (default n).
+            Without Q_total only the block itself is updated, which is enough
+            for the eigenvalues; with Q_total the rows above and the columns
+            to the right of the block are updated too.
+
+    Returns:
+        np.ndarray: The matrix H.
+    """
+    n = H.shape[0]
+    hi = n if hi is None else hi
+    row0, col1 = (0, n) if Q_total is not None else (lo, hi)
+    diag = np.arange(lo, hi)
+    H[diag, diag] -= shift
+    rotations = []
+    for k in range(lo, hi - 1):
+        c, s = givens(H[k, k], H[k + 1, k])
+        G = np.array([[c, s], [-s, c]])
+        rotations.append(G)
+
+        # Apply from the left: rows k and k + 1 of R
+        H[k : (k + 2), k : col1] = G @ H[k : (k + 2), k : col1]
+        H[k + 1, k] = 0.0
+
+    for k, G in zip(range(lo, hi - 1), rotations):
+        # Apply from the right: columns k and k + 1 of RQ
+        H[row0 : (k + 2), k : (k + 2)] = H[row0 : (k + 2), k : (k + 2)] @ G.T
+        if Q_total is not None:
+            Q_total[:, k : (k + 2)] = Q_total[:, k : (k + 2)] @ G.T
+
+    H[diag, diag] += shift
+    return H
+
+@with_stats
+def qr_algorithm(
+    A: np.ndarray,
+    max_iter: int = 1000,
+    tol: float = 1e-10,
+    method: str = "givens",
+    compute_vectors: bool = True,
+    balance: bool = False
+) -> tuple[np.ndarray, np.ndarray | None]:
+    """
+    Compute the eigenvalues and eigenvectors of matrix A using the QR algorithm.
+
+    Args:
+        A (np.ndarray): The real square matrix whose eigenvalues are to be found.
+        max_iter (int): The maximum number of iterations.
+        tol (float): The tolerance for convergence.
+        method (str): "givens" runs O(n^2) Hessenberg QR steps built from Givens
+            rotations (see `hessenberg_qr_step`), "dense" factorizes the whole
+            iterate with `np.linalg.qr` at O(n^3) per step.
+        compute_vectors (bool): If False, skip the accumulation of Q_total and
+            return None in place of the eigenvectors.
+        balance (bool): Balance A first (see `reduce_to_hessenberg`).
+        return_stats (bool): Also return the phase times and counters (see `with_stats`).
+        callback: If given, called as callback(H, sweeps, lo, hi) after every sweep.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray | None]: An tuple contains the eigenvalues
+        and the eigenvectors of the matrix A (and the stats with return_stats).
+    """
+    if method not in ("givens", "dense"):
+        raise ValueError(f"Invalid method: {method}. Choose from ['givens', 'dense'].")
+
+    with gb.profiler.phase("hessenberg"):
+        Ak, Q_total, balancing = reduce_to_hessenberg(A, compute_vectors, balance)
+
+    gb.recorder.reset()
+    gb.recorder.record(Ak)
+    
+    with gb.profiler.phase("sweeps"):
+        for sweeps in range(1, max_iter + 1):
+            if method == "givens":
+                Ak_next = hessenberg_qr_step(Ak.copy(), Q_total)
+
+            else:
+                Q, R = np.linalg.qr(Ak, mode='complete')
+                Ak_next = R @ Q
+                if compute_vectors:
+                    Q_total = Q_total @ Q
+
+            gb.recorder.record(Ak_next)
+            gb.profiler.count("sweeps")
+            gb.profiler.iteration(Ak_next, sweeps, 0, Ak.shape[0])
+
+            # Check for convergence
+            if np.linalg.norm(Ak - Ak_next, ord=gb.norm_ord) < tol:
+                Ak = Ak_next
+                break
+
+            Ak = Ak_next
+    
+    with gb.profiler.phase("extract"):
+        eigenvalues, eigenvectors = extract_eigens_from_schur(Ak, Q_total, tol=tol)
+        eigenvectors = undo_balancing(eigenvectors, balancing)
+
+    return eigenvalues, eigenvectors
+
+def _triangular_eigenvectors(
+    T: np.ndarray,
+    eigenvalues: np.ndarray,
+    positions: np.ndarray
+) -> np.ndarray:
+    """
+    Back-substitution for the eigenvectors of the upper triangular T (or stack of them).
+
+    Column c solves (T - eigenvalues[c] I) x = 0 with x[positions[c]] = 1 and
+    zeros below; `positions` must be sorted. Row i is computed for all the
+    columns that still need it at once, from the bottom row up. Near-zero
+    pivots are perturbed as in LAPACK's trevc, and columns that grow too large
+    are rescaled.
+    """
+    n = T.shape[-1]
+    k = len(positions)
+    X = np.zeros(T.shape[:-2] + (n, k), dtype=np.result_type(T, eigenvalues))
+    X[..., positions, np.arange(k)] = 1.0
+    smin = np.maximum(np.finfo(float).eps * np.abs(eigenvalues), np.finfo(float).tiny)
+    for i in range(positions.max() - 1, -1, -1):
+        c0 = np.searchsorted(positions, i, side='right')
+        rhs = -np.matmul(T[..., i : (i + 1), (i + 1) :], X[..., (i + 1) :, c0:])[..., 0, :]
+        pivot = T[..., i, i, None] - eigenvalues[..., c0:]
+        pivot = np.where(np.abs(pivot) < smin[..., c0:], smin[..., c0:], pivot)
+        X[..., i, c0:] = rhs / pivot
+        big = np.abs(X[..., i, c0:]) > 1e100
+        if big.any():
+            X[..., :, c0:] /= np.where(big, np.abs(X[..., i, c0:]), 1.0)[..., None, :]
+
+    return X
+
+def extract_eigens_from_schur(
+    T: np.ndarray,
+    Q_total: np.ndarray | None,
+    tol: float = 1e-8,
+    indices: np.ndarray | None = None,
+    value_range: tuple[float, float] | None = None
+) -> tuple[np.ndarray, np.ndarray | None]:
+    """
+    Extract eigenvalues and eigenvectors from the Schur form (eigenvalues only if Q_total is None).
+
+    T and Q_total may also be stacks of shape (..., n, n). A subdiagonal entry
+    larger than tol starts a 2x2 block, whose eigenvalues tr/2 +- sqrt(disc) are
+    computed in closed form for all the blocks at once.
+
+    The eigenvectors are the true right eigenvectors A v = lambda v, not the
+    Schur vectors: every 2x2 block is made triangular by a unitary rotation
+    built from its own eigenvector, the eigenvectors of the resulting
+    triangular T are found by back-substitution (see
+    `_triangular_eigenvectors`), then multiplied by Q_total in one product and
+    normalized.
+
+    Args:
+        T (np.ndarray): The quasi-triangular Schur form.
+        Q_total (np.ndarray | None): The Schur vectors, A = Q_total T Q_total^T.
+        tol (float): The threshold on the subdiagonal for 2x2 blocks.
+        indices (np.ndarray | None): Only return these eigenvalues (positions
+            along the diagonal of T) and their eigenvectors.
+        value_range (tuple[float, float] | None): Only return the eigenvalues
+            whose real part lies in [low, high] and their eigenvectors. Subsets
+            are only supported for a single matrix.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray | None]: An tuple contains the eigenvalues
+        and the eigenvectors.
+    """
+    n = T.shape[-1]
+    sub = np.abs(np.diagonal(T, -1, axis1=-2, axis2=-1)) > tol
+    # A block starts at an odd distance from the last negligible subdiagonal entry
+    pos = np.arange(n - 1)
+    last_small = np.maximum.accumulate(np.where(sub, -1, pos), axis=-1) if n > 1 else sub
+    start = sub & ((pos - last_small) % 2 == 1)
+
+    eigenvalues = np.diagonal(T, axis1=-2, axis2=-1).copy()
+    *lead, i = np.nonzero(start)
+    if len(i):
+        a = T[(*lead, i, i)]
+        b = T[(*lead, i, i + 1)]
+        c = T[(*lead, i + 1, i)]
+        d = T[(*lead, i + 1, i + 1)]
+        half_tr = (a + d) / 2
+        root = np.sqrt(((a - d) / 2) ** 2 + b * c + 0j)
+        lam = half_tr + root
+
+        eigenvalues = eigenvalues.astype(complex)
+        eigenvalues[(*lead, i)] = lam
+        eigenvalues[(*lead, i + 1)] = half_tr - root
+
+    selected = np.arange(n)
+    if indices is not None or value_range is not None:
+        if T.ndim != 2:
+            raise ValueError("Selecting a subset of the eigenvalues needs a single matrix.")
+
+        mask = np.zeros(n, dtype=bool)
+        mask[np.arange(n) if indices is None else np.asarray(indices)] = True
+        if value_range is not None:
+            mask &= (eigenvalues.real >= value_range[0]) & (eigenvalues.real <= value_range[1])
+
+        selected = np.nonzero(mask)[0]
+
+    real = not np.iscomplexobj(eigenvalues) or not eigenvalues.imag.any()
+    if real:
+        eigenvalues = eigenvalues.real
+
+    if Q_total is None or len(selected) == 0:
+        return eigenvalues[..., selected], (None if Q_total is None else Q_total[..., :, :0])
+
+    T_tri = T
+    Q_tri = Q_total
+    if len(i):
+        # (b, lam - a) and (lam - d, c) are both eigenvectors of the block; take the larger one
+        u1 = np.stack([np.broadcast_to(b, lam.shape), lam - a])
+        u2 = np.stack([lam - d, np.broadcast_to(c, lam.shape)])
+        u = np.where(np.linalg.norm(u1, axis=0) >= np.linalg.norm(u2, axis=0), u1, u2)
+        u /= np.linalg.norm(u, axis=0)
+
+        # G = [u, u_perp] is unitary and G^H B G is upper triangular for the block B
+        G = np.array([[u[0], -u[1].conj()], [u[1], u[0].conj()]])
+        T_tri = T.astype(complex)
+        Q_tri = Q_total.astype(complex)
+        for M, rows in ((T_tri, True), (Q_tri, False)):
+            columns = np.swapaxes(M, -1, -2)
+            x, y = columns[(*lead, i)].copy(), columns[(*lead, i + 1)].copy()
+            columns[(*lead, i)] = x * G[0, 0][:, None] + y * G[1, 0][:, None]
+            columns[(*lead, i + 1)] = x * G[0, 1][:, None] + y * G[1, 1][:, None]
+            if rows:
+                x, y = M[(*lead, i)].copy(), M[(*lead, i + 1)].copy()
+                M[(*lead, i)] = x * G[0, 0].conj()[:, None] + y * G[1, 0].conj()[:, None]
+                M[(*lead, i + 1)] = x * G[0, 1].conj()[:, None] + y * G[1, 1].conj()[:, None]
+
+        T_tri[(*lead, i + 1, i)] = 0.0
+
+    X = _triangular_eigenvectors(T_tri, eigenvalues[..., selected], selected)
+    eigenvectors = Q_tri @ X
+    eigenvectors /= np.linalg.norm(eigenvectors, axis=-2, keepdims=True)
+    return eigenvalues[..., selected], (eigenvectors.real if real else eigenvectors)
+
+def wilkinson_shift(H: np.ndarray) -> float:
+    """Compute the Wilkinson shift for the given matrix H (from its trailing 2x2 block)."""
+    n = H.shape[0]
+    if n < 2:
+        return H[0, 0] if n == 1 else 0
+
+    a = H[n - 2, n - 2]
+    b = H[n - 2, n - 1]
+    c = H[n - 1, n - 2]
+    d = H[n - 1, n - 1]
+
+    tr = a + d
+    det = a * d - b * c
+    discriminant = tr ** 2 - 4 * det
+    if discriminant >= 0:
+        sqrt_discriminant = np.sqrt(discriminant)
+        mu1 = (tr + sqrt_discriminant) / 2
+        mu2 = (tr - sqrt_discriminant) / 2
+        return mu1 if (abs(mu1 - d) <= abs(mu2 - d)) else mu2
+
+    else:
+        return tr / 2
+
+def find_splits(
+    H: np.ndarray,
+    lo: int,
+    hi: int,
+    tol: float,
+    dropped: np.ndarray | None = None
+) -> np.ndarray:
+    """
+    Zero the negligible subdiagonal entries of the block H[lo:hi, lo:hi].
+
+    Args:
+        dropped (np.ndarray | None): If given, |H[k, k - 1]| is added (in
+            2-norm) to dropped[k] for every zeroed entry.
+
+    Returns:
+        np.ndarray: The indices k whose H[k, k - 1] was zeroed, i.e. the rows
+        where the block splits into independent Hessenberg blocks.
+    """
+    k = np.arange(lo + 1, hi)
+    small = np.abs(H[k, k - 1]) <= tol * (np.abs(H[k - 1, k - 1]) + np.abs(H[k, k]))
+    k = k[small]
+    if dropped is not None:
+        dropped[k] = np.hypot(dropped[k], H[k, k - 1])
+
+    H[k, k - 1] = 0.0
+    return k
+
+def _solve_block(
+    H: np.ndarray,
+    step,
+    max_iter: int,
+    tol: float,
+    compute_vectors: bool,
+    step_kwargs: dict
+) -> tuple[np.ndarray, np.ndarray | None, int]:
+    """Reduce a copy of one diagonal block in a worker process (see `iterate_blocks`)."""
+    gb.recorder = TraceRecorder()       # the trace and the profile of the parent are not visible here
+    gb.profiler = Profiler()
+    Z = np.eye(H.shape[0]) if compute_vectors else None
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")     # the parent checks the whole H for convergence
+        sweeps = iterate_blocks(H, Z, step, max_iter, tol, **step_kwargs)
+
+    return H, Z, sweeps
+
+def iterate_blocks(
+    H: np.ndarray,
+    Q_total: np.ndarray | None,
+    step,
+    max_iter: int = 1000,
+    tol: float = 1e-8,
+    workers: int = 0,
+    **step_kwargs
+) -> int:
+    """
+    Run `step` on the unreduced diagonal blocks of the upper Hessenberg matrix
+    H until every block has size 1 or 2, in place.
+
+    Before each sweep the whole active block is scanned for negligible
+    subdiagonal entries (see `find_splits`), so the problem splits wherever it
+    decouples, not only at the bottom. The unreduced blocks are kept in a work
+    queue, bottom block first. With `workers` > 1, a block of at least
+    `gb.parallel_min_block` rows that is not the only work left is solved on a
+    copy in a process pool; its orthogonal factor Z is then applied to the
+    coupling parts H[lo:hi, hi:], H[:lo, lo:hi] and to Q_total[:, lo:hi] here.
+
+    Args:
+        H (np.ndarray): The upper Hessenberg matrix, overwritten with its
+            (quasi-)triangular form.
+        Q_total (np.ndarray | None): If given, overwritten with Q_total @ Q.
+        step: The sweep, called as step(H, Q_total, lo, hi, tol, **step_kwargs).
+        max_iter (int): The maximum number of sweeps over all blocks.
+        tol (float): The tolerance for deflation.
+        workers (int): The number of worker processes (0 or 1: no pool).
+
+    Returns:
+        int: The number of sweeps performed. A RuntimeWarning is issued when
+        max_iter is reached before every block is reduced.
+    """
+    deflations = deflate_blocks(H, Q_total, step, max_iter, tol, workers, **step_kwargs)
+    while True:
+        try:
+            next(deflations)
+
+        except StopIteration as stop:
+            sweeps = stop.value
+            break
+
+    # Two consecutive nonzero subdiagonal entries: a block larger than 2x2 is left
+    nonzero = np.diagonal(H, -1) != 0
+    if (nonzero[:-1] & nonzero[1:]).any():
+        warnings.warn(f"QR sweeps did not converge in max_iter = {max_iter} sweeps: blocks larger than 2x2 "
+                      f"are left, so some eigenvalues are inaccurate", RuntimeWarning)
+
+    return sweeps
+
+def deflate_blocks(
+    H: np.ndarray,
+    Q_total: np.ndarray | None,
+    step,
+    max_iter: int = 1000,
+    tol: float = 1e-8,
+    workers: int = 0,
+    deadline: float | None = None,
+    dropped: np.ndarray | None = None,
+    **step_kwargs
+):
+    """
+    Generator form of `iterate_blocks`: yield (lo, hi, sweeps) as soon as the
+    rows [lo, hi) converge to a 1x1 or 2x2 diagonal block (a whole block
+    solved by a worker is yielded at once), bottom blocks first.
+
+    The diagonal entries of a yielded block are final: later sweeps only
+    update its coupling to the other blocks. The generator returns the number
+    of sweeps performed.
+
+    Args:
+        deadline (float | None): A `time.monotonic()` value after which no
+            further sweep is started.
+        dropped (np.ndarray | None): Passed to `find_splits` and to `step`,
+            whose AED adds the spike entries it discards (the size of every
+            entry zeroed by a deflation, see `aggressive_early_deflation`).
+    """
+    if dropped is not None:
+        step_kwargs = {**step_kwargs, "dropped": dropped}
+
+    blocks = [(0, H.shape[0])]
+    pending = {}
+    sweeps = 0
+    pool = ProcessPoolExecutor(workers) if workers > 1 else None
+    try:
+        while blocks or pending:
+            if not blocks:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    lo, hi = pending.pop(future)
+                    H_block, Z, block_sweeps = future.result()
+                    H[lo:hi, lo:hi] = H_block
+                    if Q_total is not None:
+                        with gb.profiler.phase("accumulate"):
+                            H[lo:hi, hi:] = Z.T @ H[lo:hi, hi:]
+                            H[:lo, lo:hi] = H[:lo, lo:hi] @ Z
+                            Q_total[:, lo:hi] = Q_total[:, lo:hi] @ Z
+
+                    sweeps += block_sweeps
+                    gb.recorder.record(H)
+                    gb.profiler.count("sweeps", block_sweeps)
+                    gb.profiler.deflated(lo, hi, sweeps)
+                    yield lo, hi, sweeps
+
+                continue
+
+            lo, hi = blocks.pop()
+            with gb.profiler.phase("deflation_checks"):
+                splits = find_splits(H, lo, hi, tol, dropped)
+
+            if len(splits):
+                edges = [lo, *splits, hi]
+                blocks.extend(zip(edges[:-1], edges[1:]))
+                continue
+
+            if hi - lo <= 2:
+                gb.profiler.deflated(lo, hi, sweeps)
+                yield lo, hi, sweeps
+                continue
+
+            if sweeps >= max_iter or (deadline is not None and time.monotonic() >= deadline):
+                continue
+
+            if pool is not None and hi - lo >= gb.parallel_min_block and (blocks or pending):
+                future = pool.submit(
+                    _solve_block, H[lo:hi, lo:hi].copy(), step, max_iter - sweeps, tol,
+                    Q_total is not None, step_kwargs
+                )
+                pending[future] = (lo, hi)
+                continue
+
+            step(H, Q_total, lo, hi, tol, **step_kwargs)
+            sweeps += 1
+            gb.recorder.record(H)
+            gb.profiler.count("sweeps")
+            gb.profiler.iteration(H, sweeps, lo, hi)
+            blocks.append((lo, hi))
+
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+    return sweeps
+
+def aggressive_early_deflation(
+    H: np.ndarray,
+    Q_total: np.ndarray | None,
+    lo: int,
+    hi: int,
+    window: int,
+    tol: float = 1e-8,
+    dropped: np.ndarray | None = None
+) -> tuple[int, np.ndarray]:
+    """
+    Aggressive early deflation on the trailing window of the block H[lo:hi, lo:hi], in place.
+
+    The window W = H[kw:hi, kw:hi], kw = hi - window, is reduced to real Schur
+    form W = V T V^T, which turns the single entry s = H[kw, kw - 1] coupling
+    it to the rest of the block into the spike s V[0, :]. Working from the
+    bottom of T, every eigenvalue whose spike component is negligible is
+    deflated; the others are moved to the top of T with `dtrexc`. If anything
+    deflated, the window, its spike and the undeflated part (reduced back to
+    Hessenberg form) are written into H, and V is applied to the coupling parts
+    of H and to Q_total. The deflated rows then split off at the next call of
+    `find_splits`.
+
+    Args:
+        H (np.ndarray): The upper Hessenberg matrix.
+        Q_total (np.ndarray | None): If given, overwritten with Q_total @ V.
+        lo (int): The first row of the block.
+        hi (int): One past the last row of the block.
+        window (int): The size of the trailing window.
+        tol (float): The tolerance for deflation.
+        dropped (np.ndarray | None): If given, the discarded spike entries of
+            the deflated eigenvalues are added (in 2-norm) to dropped at their rows.
+
+    Returns:
+        tuple[int, np.ndarray]: An tuple contains the number of deflated
+        eigenvalues and the undeflated eigenvalues of the window, to be used
+        as shifts (the bottom ones last).
+    """
+    n = H.shape[0]
+    row0, col1 = (0, n) if Q_total is not None else (lo, hi)
+    kw = max(lo, hi - window)
+    w = hi - kw
+    spike = H[kw, kw - 1] if kw > lo else 0.0
+    T, V = schur(H[kw:hi, kw:hi], output='real')
+
+    # Deflate from the bottom; move the undeflatable eigenvalues to the top
+    ns = w
+    top = 0
+    while top < ns:
+        size = 2 if ns > 1 and T[ns - 1, ns - 2] != 0 else 1
+        scale = abs(T[ns - 1, ns - 1])
+        if size == 2:
+            scale += np.sqrt(abs(T[ns - 1, ns - 2])) * np.sqrt(abs(T[ns - 2, ns - 1]))
+
+        if np.abs(spike * V[0, (ns - size) : ns]).max() <= tol * scale:
+            ns -= size
+            continue
+
+        T, V, info = lapack.dtrexc(T, V, ns, top + 1)
+        if info != 0:
+            break
+
+        top += size
+
+    shifts, _ = extract_eigens_from_schur(T[:ns, :ns], None, tol=0.0)
+    if ns == w:
+        return 0, shifts
+
+    if dropped is not None:
+        rows = np.arange(kw + ns, hi)
+        dropped[rows] = np.hypot(dropped[rows], spike * V[0, ns:])
+
+    # Restore the Hessenberg form of the undeflated part with its spike
+    if ns > 0:
+        z = spike * V[0, :ns]
+        v = householder_vector(z)
+        P = np.eye(ns) - 2 * np.outer(v, v)
+        T[:ns, :] = P @ T[:ns, :]
+        T[:, :ns] = T[:, :ns] @ P
+        T[:ns, :ns], U = hessenberg(T[:ns, :ns], calc_q=True)
+        T[:ns, ns:] = U.T @ T[:ns, ns:]
+        V[:, :ns] = V[:, :ns] @ (P @ U)
+
+    if kw > lo:
+        H[kw:hi, kw - 1] = 0.0
+        H[kw, kw - 1] = spike * V[0, 0] if ns > 0 else 0.0
+
+    H[kw:hi, kw:hi] = np.triu(T, -1)
+    H[kw:hi, hi:col1] = V.T @ H[kw:hi, hi:col1]
+    H[row0:kw, kw:hi] = H[row0:kw, kw:hi] @ V
+    if Q_total is not None:
+        Q_total[:, kw:hi] = Q_total[:, kw:hi] @ V
+
+    return w - ns, shifts
+
+def _wilkinson_step(
+    H: np.ndarray,
+    Q_total: np.ndarray | None,
+    lo: int,
+    hi: int,
+    tol: float,
+    aed_window: int = 0,
+    dropped: np.ndarray | None = None
+) -> None:
+    """One Wilkinson-shifted QR step on the block H[lo:hi, lo:hi], after AED if enabled."""
+    if aed_window and hi - lo > aed_window:
+        with gb.profiler.phase("aed"):
+            deflated, shifts = aggressive_early_deflation(H, Q_total, lo, hi, aed_window, tol, dropped)
+
+        gb.profiler.count("aed_deflations", deflated)
+        hi -= deflated
+        if deflated > gb.aed_nibble * aed_window or hi - lo < 2:
+            return
+
+        if len(shifts):
+            # A real shift: the undeflated eigenvalue nearest to the bottom
+            hessenberg_qr_step(H, Q_total, shift=shifts[-1].real, lo=lo, hi=hi)
+            gb.profiler.count("shifts")
+            return
+
+    mu = wilkinson_shift(H[lo:hi, lo:hi])
+    hessenberg_qr_step(H, Q_total, shift=mu, lo=lo, hi=hi)
+    gb.profiler.count("shifts")
+
+@with_stats
+def qr_algorithm_wilkinson(
+    A: np.ndarray,
+    max_iter: int = 1000,
+    tol: float = 1e-8,
+    compute_vectors: bool = True,
+    workers: int = 0,
+    aed_window: int = 0,
+    value_range: tuple[float, float] | None = None,
+    balance: bool = False
+) -> tuple[np.ndarray, np.ndarray | None]:
+    """
+    Computes the eigenvalues of a real square matrix A using the QR algorithm
+    with the Wilkinson shift strategy.
+
+    Args:
+        A (np.ndarray): The real square matrix whose eigenvalues are to be found.
+        max_iter (int): The maximum number of iterations.
+        tol (float): The tolerance for convergence.
+        compute_vectors (bool): If False, skip the accumulation of Q_total and
+            return None in place of the eigenvectors.
+        workers (int): The number of worker processes for independent diagonal
+            blocks (see `iterate_blocks`).
+        aed_window (int): The size of the trailing window searched for converged
+            eigenvalues before each sweep (see `aggressive_early_deflation`);
+            0 disables it.
+        value_range (tuple[float, float] | None): Only return the eigenvalues
+            whose real part lies in [low, high], and only compute their
+            eigenvectors.
+        balance (bool): Balance A first (see `reduce_to_hessenberg`).
+        return_stats (bool): Also return the phase times and counters (see `with_stats`).
+        callback: If given, called as callback(H, sweeps, lo, hi) after every sweep.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray | None]: An tuple contains the eigenvalues
+        and the eigenvectors of the matrix A (and the stats with return_stats).
+    """
+    with gb.profiler.phase("hessenberg"):
+        H, Q_total, balancing = reduce_to_hessenberg(A, compute_vectors, balance)
+
+    gb.recorder.reset()
+    gb.recorder.record(H)
+    with gb.profiler.phase("sweeps"):
+        iterate_blocks(H, Q_total, _wilkinson_step, max_iter, tol, workers, aed_window=aed_window)
+
+    with gb.profiler.phase("extract"):
+        eigenvalues, eigenvectors = extract_eigens_from_schur(H, Q_total, tol=tol, value_range=value_range)
+        eigenvectors = undo_balancing(eigenvectors, balancing)
+
+    return eigenvalues, eigenvectors
+
+def apply_compact_wy(
+    Q_total: np.ndarray,
+    col: int,
+    reflectors: list[tuple[int, np.ndarray]]
+) -> None:
+    """
+    Overwrite Q_total with Q_total @ P_1 @ P_2 @ ... @ P_m, in place.
+
+    Each reflector (k, v) stands for P = I - 2 v v^T acting on the indices
+    k, ..., k + len(v) - 1 of the columns starting at `col`. The product is
+    accumulated in compact-WY form, P_1 @ ... @ P_m = I - V T V^T, so Q_total
+    is updated with two matrix-matrix products instead of m column updates.
+    """
+    width = max(k + len(v) for k, v in reflectors) - col
+    m = len(reflectors)
+    V = np.zeros((width, m), dtype=reflectors[0][1].dtype)
+    T = np.zeros((m, m), dtype=V.dtype)
+    for j, (k, v) in enumerate(reflectors):
+        V[(k - col) : (k - col + len(v)), j] = v
+        T[:j, j] = -2 * T[:j, :j] @ (V[:, :j].T @ V[:, j])
+        T[j, j] = 2
+
+    with gb.profiler.phase("accumulate"):
+        Q_block = Q_total[:, col : (col + width)]
+        Q_block -= ((Q_block @ V) @ T) @ V.T
+
+def householder_vector(x: np.ndarray) -> np.ndarray:
+    """Compute unit vector v such that (I - 2 v v^T) @ x = alpha * e1"""
+    norm_x = np.linalg.norm(x)
+    if norm_x == 0:
+        return np.zeros_like(x)
+
+    v = x.copy()
+    sign = x[0] / abs(x[0]) if x[0] != 0 else 1.0
+    v[0] += sign * norm_x
+    v /= np.linalg.norm(v)
+    return v
+
+def _francis_step(
+    H: np.ndarray,
+    Q_total: np.ndarray | None,
+    lo: int,
+    hi: int,
+    tol: float,
+    blocked: bool = False,
+    aed_window: int = 0,
+    dropped: np.ndarray | None = None
+) -> None:
+    """One implicit double-shift sweep on the block H[lo:hi, lo:hi] (hi - lo >= 3), after AED if enabled."""
+    shifts = []
+    if aed_window and hi - lo > aed_window:
+        with gb.profiler.phase("aed"):
+            deflated, shifts = aggressive_early_deflation(H, Q_total, lo, hi, aed_window, tol, dropped)
+
+        gb.profiler.count("aed_deflations", deflated)
+        hi -= deflated
+        if deflated > gb.aed_nibble * aed_window or hi - lo < 3:
+            return
+
+    n = H.shape[0]
+    # Without vectors only the block itself has to be updated
+    row0, col1 = (0, n) if Q_total is not None else (lo, hi)
+    p = hi
+    q = p - 1
+
+    if len(shifts) >= 2 and (shifts[-1].imag != 0 or shifts[-2].imag == 0):
+        # Two shifts left over by AED: a complex conjugate pair or two real ones
+        s = (shifts[-1] + shifts[-2]).real
+        t = (shifts[-1] * shifts[-2]).real
+
+    elif len(shifts):
+        # The bottom real shift, twice
+        s = 2 * shifts[-1].real
+        t = shifts[-1].real ** 2
+
+    else:
+        # Create Wilkinson shift
+        s = H[q - 1, q - 1] + H[p - 1, p - 1]
+        t = H[q - 1, q - 1] * H[p - 1, p - 1] - H[q - 1, p - 1] * H[p - 1, q - 1]
+
+    gb.profiler.count("shifts", 2)
+
+    # Compute first column of M
+    x = H[lo, lo] ** 2 + H[lo, lo + 1] * H[lo + 1, lo] - s * H[lo, lo] + t
+    y = H[lo + 1, lo] * (H[lo, lo] + H[lo + 1, lo + 1] - s)
+    z = H[lo + 1, lo] * H[lo + 2, lo + 1]
+
+    reflectors = []
+    for k in range(lo, p - 2):
+        r = max(lo + 1, k)
+        u = np.array([x, y, z])
+        v = householder_vector(u)
+        Pk = np.eye(3) - 2 * np.outer(v, v)
+
+        # Apply from the left
+        r_end = min(k + 4, p)
+        H[k : (k + 3), (r - 1) : col1] = Pk @ H[k : (k + 3), (r - 1) : col1]
+
+        # Apply from the right
+        H[row0 : r_end, k : (k + 3)] = H[row0 : r_end, k : (k + 3)] @ Pk.T
+
+        # Accumulate Q_total @ Pk.T, touching only columns k to k + 2
+        if Q_total is not None and blocked:
+            reflectors.append((k, v))
+            if len(reflectors) == gb.wy_block_size:
+                apply_compact_wy(Q_total, reflectors[0][0], reflectors)
+                reflectors = []
+
+        elif Q_total is not None:
+            Q_total[:, k : (k + 3)] = Q_total[:, k : (k + 3)] @ Pk.T
+
+        x = H[k + 1, k]
+        y = H[k + 2, k]
+        if k < p - 3:
+            z = H[k + 3, k]
+
+    if reflectors:
+        apply_compact_wy(Q_total, reflectors[0][0], reflectors)
+
+    x = H[p - 2, p - 3]
+    y = H[p - 1, p - 3]
+    c, s = givens(x, y)
+    G = np.array([[c, s], [-s, c]])
+
+    # Apply from the left
+    H[(q - 1) : p, (p - 3) : col1] = G @ H[(q - 1) : p, (p - 3) : col1]
+
+    # Apply from the right
+    H[row0 : p, (p - 2) : p] = H[row0 : p, (p - 2) : p] @ G.T
+    if Q_total is not None:
+        Q_total[:, (p - 2) : p] = Q_total[:, (p - 2) : p] @ G.T
+
+def _shift_pairs(shifts: np.ndarray) -> list[tuple[float, float]]:
+    """
+    Group shifts into real double shifts (s, t), s = sum and t = product of a
+    complex conjugate pair or of two real shifts (a lone real shift is used twice).
+    """
+    pairs = []
+    real = []
+    for mu in np.asarray(shifts, dtype=complex):
+        if mu.imag > 0:
+            pairs.append((2 * mu.real, abs(mu) ** 2))
+
+        elif mu.imag == 0:
+            real.append(mu.real)
+
+    for a, b in zip(real[0::2], real[1::2]):
+        pairs.append((a + b, a * b))
+
+    if len(real) % 2:
+        pairs.append((2 * real[-1], real[-1] ** 2))
+
+    return pairs
+
+def _chase_bulge_chain(
+    H: np.ndarray,
+    Q_total: np.ndarray | None,
+    lo: int,
+    hi: int,
+    pairs: list[tuple[float, float]]
+) -> None:
+    """
+    Chase one 3x3 bulge per double shift in `pairs` through H[lo:hi, lo:hi].
+
+    Bulge j is introduced at the top three steps after bulge j - 1, so the
+    bulges move down as a tightly packed chain, bulge j at row lo + tau - 3j at
+    time step tau. Within a time step the bulges touch disjoint rows and
+    columns, so their reflectors are computed and applied all at once. The
+    chain is chased `3 m` steps at a time inside a window H[w0:w1, w0:w1]; the
+    reflectors are accumulated into the orthogonal U of the window, which is
+    applied to H[w0:w1, w1:], H[:w0, w0:w1] and Q_total[:, w0:w1] with three
+    matrix-matrix products.
+    """
+    n = H.shape[0]
+    row0, col1 = (0, n) if Q_total is not None else (lo, hi)
+    m = len(pairs)
+    offset = np.arange(3)
+    gb.profiler.count("shifts", 2 * m)
+    nstep = 3 * m
+    last = (hi - 2 - lo) + 3 * (m - 1)
+    for tau0 in range(0, last + 1, nstep):
+        tau1 = min(tau0 + nstep, last + 1)
+        w0 = max(lo, lo + tau0 - 3 * (m - 1) - 1)
+        w1 = min(hi, lo + tau1 + 3)
+        U = np.eye(w1 - w0)
+
+        for tau in range(tau0, tau1):
+            k = lo + tau - 3 * np.arange(m)
+            j = np.nonzero((k >= lo) & (k <= hi - 3))[0]
+
+            if (k == hi - 2).any():
+                # The bottom bulge leaves the window with a Givens rotation
+                c, s = givens(H[hi - 2, hi - 3], H[hi - 1, hi - 3])
+                G = np.array([[c, s], [-s, c]])
+                H[(hi - 2) : hi, (hi - 3) : w1] = G @ H[(hi - 2) : hi, (hi - 3) : w1]
+                H[hi - 1, hi - 3] = 0.0
+                H[w0 : hi, (hi - 2) : hi] = H[w0 : hi, (hi - 2) : hi] @ G.T
+                U[:, (hi - 2 - w0) : (hi - w0)] = U[:, (hi - 2 - w0) : (hi - w0)] @ G.T
+
+            if len(j) == 0:
+                continue
+
+            ks = k[j]
+            rows = ks[:, None] + offset
+            X = np.empty((len(ks), 3))
+            inner = ks > lo
+            X[inner] = H[rows[inner], (ks[inner] - 1)[:, None]]
+            if not inner.all():
+                # Introduce a new bulge from the first column of its shift polynomial
+                s, t = pairs[j[-1]]
+                X[-1] = [
+                    H[lo, lo] ** 2 + H[lo, lo + 1] * H[lo + 1, lo] - s * H[lo, lo] + t,
+                    H[lo + 1, lo] * (H[lo, lo] + H[lo + 1, lo + 1] - s),
+                    H[lo + 1, lo] * H[lo + 2, lo + 1]
+                ]
+
+            # Householder reflectors of all the bulges at once
+            norm_x = np.linalg.norm(X, axis=1)
+            V = X.copy()
+            V[:, 0] += np.where(X[:, 0] < 0, -1.0, 1.0) * norm_x
+            norm_v = np.linalg.norm(V, axis=1)
+            V[norm_v > 0] /= norm_v[norm_v > 0, None]
+            P = np.eye(3) - 2 * V[:, :, None] * V[:, None, :]
+
+            # Apply from the left, then from the right, inside the window
+            c0 = max(lo, ks.min() - 1)
+            H[rows, c0:w1] = P @ H[rows, c0:w1]
+            H[ks[inner] + 1, ks[inner] - 1] = 0.0
+            H[ks[inner] + 2, ks[inner] - 1] = 0.0
+            r1 = min(hi, ks.max() + 4)
+            H[w0:r1, rows] = np.einsum('rja,jba->rjb', H[w0:r1, rows], P)
+            U[:, rows - w0] = np.einsum('rja,jba->rjb', U[:, rows - w0], P)
+
+        with gb.profiler.phase("accumulate"):
+            H[w0:w1, w1:col1] = U.T @ H[w0:w1, w1:col1]
+            H[row0:w0, w0:w1] = H[row0:w0, w0:w1] @ U
+            if Q_total is not None:
+                Q_total[:, w0:w1] = Q_total[:, w0:w1] @ U
+
+def _multishift_step(
+    H: np.ndarray,
+    Q_total: np.ndarray | None,
+    lo: int,
+    hi: int,
+    tol: float,
+    shifts: int = 4,
+    aed_window: int = 0,
+    dropped: np.ndarray | None = None
+) -> None:
+    """
+    One multishift sweep on the block H[lo:hi, lo:hi], after AED if enabled.
+
+    Up to `shifts` shifts are taken from the undeflated eigenvalues left by AED,
+    or else from the eigenvalues of the trailing `shifts` x `shifts` window, and
+    chased as a chain of small bulges (see `_chase_bulge_chain`). Blocks too
+    small for two bulges fall back to a double-shift sweep.
+    """
+    undeflated = []
+    if aed_window and hi - lo > aed_window:
+        with gb.profiler.phase("aed"):
+            deflated, undeflated = aggressive_early_deflation(H, Q_total, lo, hi, aed_window, tol, dropped)
+
+        gb.profiler.count("aed_deflations", deflated)
+        hi -= deflated
+        if deflated > gb.aed_nibble * aed_window or hi - lo < 3:
+            return
+
+    m = min(shifts // 2, (hi - lo) // 6)
+    if m < 2:
+        _francis_step(H, Q_total, lo, hi, tol)
+        return
+
+    pairs = _shift_pairs(undeflated)
+    if len(pairs) < m:
+        pairs = _shift_pairs(np.linalg.eigvals(H[(hi - 2 * m) : hi, (hi - 2 * m) : hi]))
+
+    _chase_bulge_chain(H, Q_total, lo, hi, pairs[-m:])
+
+@with_stats
+def francis_double_shift_qr(
+    H: np.ndarray,
+    max_iter: int = 1000,
+    tol: float = 1e-8,
+    blocked: bool = False,
+    compute_vectors: bool = True,
+    workers: int = 0,
+    aed_window: int = 0,
+    shifts: int = 2,
+    value_range: tuple[float, float] | None = None,
+    balance: bool = False
+) -> tuple[np.ndarray, np.ndarray | None]:
+    """
+    Computes the eigenvalues of a real square matrix A using the QR algorithm
+    with the Francis Double Shift strategy.
+
+    Args:
+        A (np.ndarray): The real square matrix whose eigenvalues are to be found.
+        max_iter (int): The maximum number of iterations.
+        tol (float): The tolerance for convergence.
+        blocked (bool): Collect the reflectors of a sweep in groups of
+            `gb.wy_block_size` and apply them to Q_total in compact-WY form
+            (see `apply_compact_wy`) instead of one reflector at a time.
+        compute_vectors (bool): If False, skip the accumulation of Q_total and
+            return None in place of the eigenvectors.
+        workers (int): The number of worker processes for independent diagonal
+            blocks (see `iterate_blocks`).
+        aed_window (int): The size of the trailing window searched for converged
+            eigenvalues before each sweep (see `aggressive_early_deflation`);
+            0 disables it.
+        shifts (int): The number of shifts per sweep. With more than 2, the
+            shifts are chased as a chain of small bulges with windowed
+            matrix-matrix updates (see `_chase_bulge_chain`) instead of one
+            bulge per sweep; `blocked` is then not used.
+        value_range (tuple[float, float] | None): Only return the eigenvalues
+            whose real part lies in [low, high], and only compute their
+            eigenvectors.
+        balance (bool): Balance A first (see `reduce_to_hessenberg`).
+        return_stats (bool): Also return the phase times and counters (see `with_stats`).
+        callback: If given, called as callback(H, sweeps, lo, hi) after every sweep.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray | None]: An tuple contains the eigenvalues
+        and the eigenvectors of the matrix A (and the stats with return_stats).
+    """
+    # Everything stays in real arithmetic: complex values only appear when
+    # extract_eigens_from_schur reads the 2x2 blocks of the real Schur form.
+    with gb.profiler.phase("hessenberg"):
+        H, Q_total, balancing = reduce_to_hessenberg(H, compute_vectors, balance)
+
+    gb.recorder.reset()
+    gb.recorder.record(H)
+    with gb.profiler.phase("sweeps"):
+        if shifts > 2:
+            iterate_blocks(H, Q_total, _multishift_step, max_iter, tol, workers, shifts=shifts,
+                           aed_window=aed_window)
+
+        else:
+            iterate_blocks(H, Q_total, _francis_step, max_iter, tol, workers, blocked=blocked,
+                           aed_window=aed_window)
+
+    with gb.profiler.phase("extract"):
+        eigenvalues, eigenvectors = extract_eigens_from_schur(H, Q_total, tol=tol, value_range=value_range)
+        eigenvectors = undo_balancing(eigenvectors, balancing)
+
+    return eigenvalues, eigenvectors
+
+def stream_eigenvalues(
+    A: np.ndarray,
+    max_iter: int = 1000,
+    tol: float = 1e-8,
+    method: str = "francis",
+    aed_window: int = 0,
+    shifts: int = 2,
+    balance: bool = False,
+    time_budget: float | None = None,
+    deadline: float | None = None
+):
+    """
+    Yield the eigenvalues of A one diagonal block at a time, as soon as they
+    converge under the Wilkinson or Francis sweeps (see `deflate_blocks`).
+
+    The caller may stop iterating at any time (e.g. after the first k
+    eigenvalues). When `max_iter` sweeps or the time budget run out, the
+    blocks that have converged by then are still yielded and the generator
+    ends, so every yielded value is reliable and the missing ones are exactly
+    those that did not converge. No eigenvectors are computed.
+
+    Args:
+        A (np.ndarray): The real square matrix whose eigenvalues are to be found.
+        max_iter (int): The maximum number of sweeps.
+        tol (float): The tolerance for deflation.
+        method (str): "wilkinson" or "francis" sweeps.
+        aed_window (int): The size of the aggressive early deflation window (0: disabled).
+        shifts (int): The number of shifts per Francis sweep (see `francis_double_shift_qr`).
+        balance (bool): Balance A first (see `reduce_to_hessenberg`).
+        time_budget (float | None): Seconds after which no further sweep is started.
+        deadline (float | None): The same as a `time.monotonic()` value.
+
+    Yields:
+        tuple[np.ndarray, int, int, float]: An tuple contains the eigenvalues
+        of the converged block (one real eigenvalue, or the two eigenvalues of
+        a 2x2 block: a complex conjugate pair or two real ones), its row in
+        the Schur form, the number of sweeps so far, and the backward error:
+        the norm of all the entries dropped so far (subdiagonal entries and
+        AED spike entries) relative to ||A||_F (of the balanced matrix with balance). The eigenvalues are
+        exact for a matrix that close to A, up to rounding.
+    """
+    if method not in ("wilkinson", "francis"):
+        raise ValueError(f"Invalid method: {method}. Choose from ['wilkinson', 'francis'].")
+
+    if time_budget is not None:
+        start_deadline = time.monotonic() + time_budget
+        deadline = start_deadline if deadline is None else min(deadline, start_deadline)
+
+    with gb.profiler.phase("hessenberg"):
+        H, _, _ = reduce_to_hessenberg(A, False, balance)
+
+    norm_H = np.linalg.norm(H)
+    dropped = np.zeros(H.shape[0])
+    if method == "wilkinson":
+        step, step_kwargs = _wilkinson_step, {"aed_window": aed_window}
+
+    elif shifts > 2:
+        step, step_kwargs = _multishift_step, {"shifts": shifts, "aed_window": aed_window}
+
+    else:
+        step, step_kwargs = _francis_step, {"aed_window": aed_window}
+
+    gb.recorder.reset()
+    gb.recorder.record(H)
+    for lo, hi, sweeps in deflate_blocks(H, None, step, max_iter, tol, deadline=deadline, dropped=dropped, **step_kwargs):
+        eigenvalues, _ = extract_eigens_from_schur(H[lo:hi, lo:hi], None, tol=0.0)
+        yield eigenvalues, int(lo), sweeps, float(np.linalg.norm(dropped) / (norm_H if norm_H > 0 else 1.0))
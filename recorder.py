@@ -0,0 +1,138 @@
+import numpy as np
+
+from collections import deque
+
+class TraceRecorder:
+    """
+    Convergence-trace recorder used by the QR solvers.
+
+    The solvers call `reset()` once before iterating and `record(H)` after every
+    iteration. This base class keeps nothing, so tracing costs one method call
+    per iteration when it is disabled. Subclasses decide what to keep and how
+    much memory it may use.
+
+    `enabled` tells callers whether building a dense iterate just to record it
+    is worth it.
+    """
+    enabled = False
+
+    def reset(self):
+        """Forget everything recorded so far."""
+        self.iteration = 0
+
+    def record(self, H: np.ndarray):
+        """Record the iterate H of the current iteration."""
+        pass
+
+    def frames(self) -> tuple[list[int], list[np.ndarray]]:
+        """Return the recorded iteration numbers and matrix snapshots."""
+        return [], []
+
+    def summaries(self) -> tuple[list[int], list[float]]:
+        """Return the recorded iteration numbers and subdiagonal norms."""
+        return [], []
+
+class CountRecorder(TraceRecorder):
+    """Count the recorded iterates without keeping them (the starting matrix counts as one)."""
+
+    def __init__(self):
+        self.reset()
+
+    def record(self, H: np.ndarray):
+        self.iteration += 1
+
+class RingRecorder(TraceRecorder):
+    """Keep a copy of the last `size` iterates."""
+    enabled = True
+
+    def __init__(self, size: int):
+        self.size = size
+        self.reset()
+
+    def reset(self):
+        self.iteration = 0
+        self._frames = deque(maxlen=self.size)
+
+    def record(self, H: np.ndarray):
+        self._frames.append((self.iteration, H.copy()))
+        self.iteration += 1
+
+    def frames(self) -> tuple[list[int], list[np.ndarray]]:
+        return [it for it, _ in self._frames], [H for _, H in self._frames]
+
+class StridedRecorder(TraceRecorder):
+    """
+    Keep at most `max_frames` evenly spaced iterates.
+
+    Every `stride`-th iterate is copied. When the buffer is full, every other
+    frame is dropped and the stride doubles, so the kept frames always span
+    the whole run.
+    """
+    enabled = True
+
+    def __init__(self, max_frames: int):
+        self.max_frames = max_frames
+        self.reset()
+
+    def reset(self):
+        self.iteration = 0
+        self.stride = 1
+        self._iterations = []
+        self._frames = []
+
+    def record(self, H: np.ndarray):
+        if self.iteration % self.stride == 0:
+            self._iterations.append(self.iteration)
+            self._frames.append(H.copy())
+            if len(self._frames) > self.max_frames:
+                self._iterations = self._iterations[::2]
+                self._frames = self._frames[::2]
+                self.stride *= 2
+
+        self.iteration += 1
+
+    def frames(self) -> tuple[list[int], list[np.ndarray]]:
+        return self._iterations, self._frames
+
+class SummaryRecorder(TraceRecorder):
+    """Keep only the norm of the subdiagonal of every iterate (O(n) per iteration)."""
+    enabled = True
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.iteration = 0
+        self._values = []
+
+    def record(self, H: np.ndarray):
+        self._values.append(float(np.linalg.norm(np.diagonal(H, -1))))
+        self.iteration += 1
+
+    def summaries(self) -> tuple[list[int], list[float]]:
+        return list(range(len(self._values))), self._values
+
+def make_recorder(kind: str | None, size: int) -> TraceRecorder:
+    """
+    Create a recorder by name.
+
+    Args:
+        kind (str | None): "ring", "strided", "summary", or None for no tracing.
+        size (int): The ring size or the maximum number of strided frames.
+
+    Returns:
+        TraceRecorder: The recorder.
+    """
+    if kind is None:
+        return TraceRecorder()
+
+    if kind == "ring":
+        return RingRecorder(size)
+
+    if kind == "strided":
+        return StridedRecorder(size)
+
+    if kind == "summary":
+        return SummaryRecorder()
+
+    raise ValueError(f"Invalid trace recorder: {kind}. Choose from ['ring', 'strided', 'summary'].")
@@ -0,0 +1,209 @@
+import asyncio
+import os
+import signal
+import time
+import global_constant as gb
+
+from concurrent.futures import ProcessPoolExecutor
+from cache import ResultCache, cache_key, matrix_digest
+from protocol import LENGTH, decode_request, encode_response, encode_error
+from qr_algorithm import qr_algorithm, qr_algorithm_wilkinson, francis_double_shift_qr
+
+SOLVERS = {
+    "qr": qr_algorithm,
+    "wilkinson": qr_algorithm_wilkinson,
+    "francis": francis_double_shift_qr
+}
+
+def _ignore_interrupt():
+    """Leave Ctrl-C to the server process, which shuts the pool down in order."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+def _solve_batch(tasks: list[tuple]) -> list[tuple]:
+    """
+    Solve the requests (method, A, max_iter, tol, compute_vectors) of a batch
+    in a worker process, one after the other.
+
+    Returns:
+        list[tuple]: ("ok", eigenvalues, eigenvectors, seconds) or
+        ("error", message) per request.
+    """
+    results = []
+    for method, A, max_iter, tol, compute_vectors in tasks:
+        try:
+            start = time.perf_counter()
+            eigenvalues, eigenvectors = SOLVERS[method](A, max_iter, tol, compute_vectors=compute_vectors)
+            results.append(("ok", eigenvalues, eigenvectors, time.perf_counter() - start))
+
+        except Exception as e:
+            results.append(("error", f"{type(e).__name__}: {e}"))
+
+    return results
+
+class SolverServer:
+    """
+    Solve the matrices sent by clients (see protocol.py) on a process pool.
+
+    Requests of a connection are answered in order, one at a time; clients
+    get concurrency from several connections. A matrix larger than
+    `small` x `small` is sent to the pool alone. Smaller ones go through a
+    queue: whenever a worker is free, everything queued (up to `batch_max`
+    requests) is sent to it as one task, so small concurrent requests share
+    the cost of the inter-process round trip instead of waiting for it one by
+    one. No request waits for a batch to fill up. Every task, a large
+    request or a batch, first takes a free worker (the `free` semaphore), so
+    the pool never holds more tasks than workers and batches queue with the
+    large requests in arrival order instead of behind the whole backlog.
+
+    With `cache_bytes`, results are kept in an in-memory `ResultCache` keyed
+    by the matrix content and the solver settings, so a repeated request is
+    answered without reaching the pool.
+
+    Args:
+        workers (int | None): The number of worker processes (None: all cores).
+        small (int): The largest size of a matrix that is batched.
+        batch_max (int): The largest number of requests in a batch.
+        cache_bytes (int): The memory budget of the result cache (0: no cache).
+    """
+    def __init__(
+        self,
+        workers: int | None = None,
+        small: int = gb.serve_small,
+        batch_max: int = gb.serve_batch_max,
+        cache_bytes: int = 0
+    ):
+        self.workers = workers or os.cpu_count()
+        self.small = small
+        self.batch_max = batch_max
+        self.cache = ResultCache(cache_bytes) if cache_bytes > 0 else None
+        self.requests = 0
+        self.batches = 0
+
+    async def _solve(self, task: tuple) -> tuple:
+        if self.cache is None:
+            return await self._dispatch(task)
+
+        method, A, max_iter, tol, compute_vectors = task
+        key = cache_key(matrix_digest(A), method, max_iter, tol, compute_vectors)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return ("ok", *cached, 0.0)
+
+        result = await self._dispatch(task)
+        if result[0] == "ok":
+            self.cache.put(key, result[1], result[2])
+
+        return result
+
+    async def _dispatch(self, task: tuple) -> tuple:
+        loop = asyncio.get_running_loop()
+        if task[1].shape[0] > self.small:
+            async with self.free:
+                results = await loop.run_in_executor(self.pool, _solve_batch, [task])
+
+            return results[0]
+
+        future = loop.create_future()
+        self.queue.put_nowait((task, future))
+        return await future
+
+    async def _batcher(self):
+        """Send the queued small requests to the pool, as many as possible per free worker."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            await self.free.acquire()
+            while len(batch) < self.batch_max and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+
+            self.batches += 1
+            future = loop.run_in_executor(self.pool, _solve_batch, [task for task, _ in batch])
+            future.add_done_callback(lambda done, batch=batch: self._deliver(done, batch))
+
+    def _deliver(self, done, batch: list):
+        self.free.release()
+        try:
+            results = done.result()
+
+        except Exception as e:
+            results = [("error", f"{type(e).__name__}: {e}")] * len(batch)
+
+        for (_, future), result in zip(batch, results):
+            if not future.cancelled():
+                future.set_result(result)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    size, = LENGTH.unpack(await reader.readexactly(LENGTH.size))
+                    frame = await reader.readexactly(size)
+
+                except asyncio.IncompleteReadError:
+                    break
+
+                self.requests += 1
+                try:
+                    result = await self._solve(decode_request(frame))
+
+                except Exception as e:
+                    result = ("error", f"{type(e).__name__}: {e}")
+
+                if result[0] == "ok":
+                    # One write per buffer: the transport sends each straight
+                    # from the array and only copies what the socket does not take
+                    for buffer in encode_response(*result[1:]):
+                        writer.write(buffer)
+
+                else:
+                    writer.write(encode_error(result[1]))
+
+                await writer.drain()
+
+        except ConnectionError:
+            pass
+
+        finally:
+            writer.close()
+
+    async def serve(self, socket_path: str | None = None, host: str = "127.0.0.1", port: int = gb.serve_port):
+        """Listen on the Unix socket `socket_path`, or on host:port over TCP, until cancelled."""
+        self.pool = ProcessPoolExecutor(self.workers, initializer=_ignore_interrupt)
+        self.queue = asyncio.Queue()
+        self.free = asyncio.Semaphore(self.workers)
+        batcher = asyncio.create_task(self._batcher())
+        try:
+            if socket_path is not None:
+                if os.path.exists(socket_path):
+                    os.unlink(socket_path)
+
+                server = await asyncio.start_unix_server(self._handle, socket_path)
+                print(f"Serving on {socket_path} with {self.workers} worker(s)")
+
+            else:
+                server = await asyncio.start_server(self._handle, host, port)
+                print(f"Serving on {host}:{port} with {self.workers} worker(s)")
+
+            async with server:
+                await server.serve_forever()
+
+        finally:
+            batcher.cancel()
+            self.pool.shutdown(cancel_futures=True)
+            print(f"Served {self.requests} request(s), {self.batches} batch(es) of small matrices")
+            if self.cache is not None:
+                print(f"Cache: {self.cache.stats()}")
+
+def serve(
+    socket_path: str | None = None,
+    host: str = "127.0.0.1",
+    port: int = gb.serve_port,
+    workers: int | None = None,
+    cache_bytes: int = 0
+):
+    """Run a `SolverServer` until interrupted (Ctrl-C)."""
+    try:
+        asyncio.run(SolverServer(workers, cache_bytes=cache_bytes).serve(socket_path, host, port))
+
+    except KeyboardInterrupt:
+        pass
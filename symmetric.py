@@ -0,0 +1,330 @@
+import math
+import warnings
+import numpy as np
+import global_constant as gb
+from scipy.linalg import hessenberg
+
+def tridiagonalize(
+    A: np.ndarray,
+    compute_vectors: bool = True
+) -> tuple[np.ndarray, np.ndarray, np.ndarray | None]:
+    """
+    Reduce a real symmetric matrix A to tridiagonal form T = Q^T A Q.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, np.ndarray | None]: The diagonal d and the
+        off-diagonal e of T, and Q (None if compute_vectors is False).
+    """
+    if compute_vectors:
+        T, Q = hessenberg(np.asarray(A, dtype=np.float64), calc_q=True)
+
+    else:
+        T, Q = hessenberg(np.asarray(A, dtype=np.float64)), None
+
+    return np.diag(T).copy(), np.diag(T, -1).copy(), Q
+
+def tridiagonal_qr(
+    d: np.ndarray,
+    e: np.ndarray,
+    Z: np.ndarray | None = None,
+    max_iter: int = 1000,
+    tol: float = 1e-8
+) -> tuple[np.ndarray, np.ndarray | None]:
+    """
+    Computes the eigenvalues of a symmetric tridiagonal matrix with implicit
+    Wilkinson-shift QR sweeps.
+
+    Only the diagonal and the off-diagonal are stored. A sweep chases the bulge
+    with Givens rotations using scalar updates, so it costs O(n) without
+    vectors, and O(n) per rotation on the rows of Z^T with vectors.
+
+    Args:
+        d (np.ndarray): The diagonal of T.
+        e (np.ndarray): The off-diagonal of T.
+        Z (np.ndarray | None): If given, the rotations are accumulated into it,
+            i.e. Z is overwritten with Z @ V where T = V diag(w) V^T.
+        max_iter (int): The maximum number of sweeps.
+        tol (float): The tolerance for deflation.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray | None]: An tuple contains the eigenvalues
+        (in no particular order) and Z. A RuntimeWarning is issued when
+        max_iter is reached before every off-diagonal entry is deflated.
+    """
+    n = len(d)
+    d = [float(x) for x in d]
+    e = [float(x) for x in e] + [0.0]
+    Zt = None if Z is None else Z.T.copy()       # rotations touch contiguous rows of Z^T
+    iterations = 0
+    hi = n
+
+    while hi > 1 and iterations < max_iter:
+        # Find the unreduced block [lo, hi), deflating negligible off-diagonal entries
+        lo = hi - 1
+        while lo > 0:
+            if abs(e[lo - 1]) <= tol * (abs(d[lo - 1]) + abs(d[lo])):
+                e[lo - 1] = 0.0
+                break
+
+            lo -= 1
+
+        if lo == hi - 1:
+            hi -= 1
+            continue
+
+        # Wilkinson shift from the trailing 2x2 block
+        delta = (d[hi - 2] - d[hi - 1]) / 2
+        sign = 1.0 if delta >= 0 else -1.0
+        mu = d[hi - 1] - e[hi - 2] ** 2 / (delta + sign * math.hypot(delta, e[hi - 2]))
+
+        x = d[lo] - mu
+        z = e[lo]
+        for k in range(lo, hi - 1):
+            if z == 0.0:
+                c, s = 1.0, 0.0
+                r = x
+
+            else:
+                r = math.hypot(x, z)
+                c, s = x / r, z / r
+
+            if k > lo:
+                e[k - 1] = r
+
+            a, b, f = d[k], d[k + 1], e[k]
+            d[k] = c * c * a + 2 * c * s * f + s * s * b
+            d[k + 1] = s * s * a - 2 * c * s * f + c * c * b
+            e[k] = c * s * (b - a) + (c * c - s * s) * f
+            if k < hi - 2:
+                z = s * e[k + 1]
+                e[k + 1] = c * e[k + 1]
+                x = e[k]
+
+            if Zt is not None:
+                row_k = Zt[k].copy()
+                Zt[k] = c * row_k + s * Zt[k + 1]
+                Zt[k + 1] = c * Zt[k + 1] - s * row_k
+
+        iterations += 1
+        if gb.recorder.enabled:
+            gb.recorder.record(np.diag(d) + np.diag(e[:-1], -1) + np.diag(e[:-1], 1))
+
+    if hi > 1:
+        warnings.warn(f"Tridiagonal QR sweeps did not converge in max_iter = {max_iter} sweeps: the leading "
+                      f"{hi} x {hi} block is not deflated, so some eigenvalues are inaccurate", RuntimeWarning)
+
+    if Z is not None:
+        Z[...] = Zt.T
+
+    return np.array(d), Z
+
+def _secular_solve(
+    D: np.ndarray,
+    z: np.ndarray,
+    rho: float
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Eigen-decomposition of D + rho z z^T for sorted, distinct D, nonzero z
+    and rho > 0.
+
+    The roots of the secular equation 1 + rho sum(z^2 / (D - lambda)) = 0 are
+    found by bisection, all at once, each one stored as an offset from its
+    nearest pole so that D - lambda is computed without cancellation. The
+    eigenvectors use z recomputed from the roots (Gu and Eisenstat), which
+    keeps them orthogonal.
+    """
+    m = len(D)
+    right = np.append(D[1:], D[-1] + rho * (z @ z))
+    gap = right - D
+    idx = np.arange(m)
+
+    def secular(origin, tau):
+        # f at D[origin] + tau, for several roots at once
+        delta = (D[None, :] - D[origin][:, None]) - tau[:, None]
+        return 1 + rho * np.sum(z[None, :] ** 2 / delta, axis=1)
+
+    # Pick the pole each root is closest to as its origin
+    left_half = secular(idx, gap / 2) > 0
+    origin = np.where(left_half | (idx == m - 1), idx, idx + 1)
+    lo = np.where(origin == idx, 0.0, -gap / 2)
+    hi = np.where(origin == idx, gap / 2, 0.0)
+    hi = np.where(idx == m - 1, gap, hi)
+    # Bisect until every offset is known to full relative precision
+    active = idx
+    for _ in range(200):
+        tau = (lo[active] + hi[active]) / 2
+        positive = secular(origin[active], tau) > 0
+        hi[active] = np.where(positive, tau, hi[active])
+        lo[active] = np.where(positive, lo[active], tau)
+        width = hi[active] - lo[active]
+        scale = np.maximum(np.abs(lo[active]), np.abs(hi[active]))
+        active = active[width > 2 * np.finfo(float).eps * scale]
+        if len(active) == 0:
+            break
+
+    tau = (lo + hi) / 2
+    eigenvalues = D[origin] + tau
+
+    # lambda_j - D_i, for all i (rows) and j (columns)
+    diff = (D[origin][None, :] - D[:, None]) + tau[None, :]
+    pole = D[None, :] - D[:, None]
+    ratio = np.ones((m, m))
+    lower = idx[None, :] < idx[:, None]
+    ratio[lower] = diff[lower] / pole[lower]
+    upper = (idx[None, :] >= idx[:, None]) & (idx[None, :] < m - 1)
+    shifted = np.zeros((m, m))
+    shifted[:, :-1] = pole[:, 1:]
+    ratio[upper] = diff[upper] / shifted[upper]
+    ratio[:, -1] = diff[:, -1] / rho
+    z_hat = np.copysign(np.sqrt(np.abs(np.prod(ratio, axis=1))), z)
+
+    U = z_hat[:, None] / -diff
+    U /= np.linalg.norm(U, axis=0)
+    return eigenvalues, U
+
+def _rank_one_update(
+    D: np.ndarray,
+    z: np.ndarray,
+    rho: float
+) -> tuple[np.ndarray, np.ndarray]:
+    """Eigen-decomposition D + rho z z^T = U diag(w) U^T, with deflation."""
+    m = len(D)
+    if rho < 0:
+        w, U = _rank_one_update(-D, z, -rho)
+        return -w, U
+
+    order = np.argsort(D)
+    D, z = D[order], z[order].copy()
+    U = np.eye(m)[:, order]
+
+    norm_z = np.linalg.norm(z)
+    tol = 8 * np.finfo(float).eps * max(np.abs(D).max(), rho * norm_z ** 2)
+
+    # Deflate tiny components of z and nearly equal poles
+    deflated = np.abs(rho * z * norm_z) <= tol
+    last = None
+    for i in range(m):
+        if deflated[i]:
+            continue
+
+        if last is not None and D[i] - D[last] <= tol:
+            r = np.hypot(z[last], z[i])
+            c, s = z[i] / r, z[last] / r
+            col_last = U[:, last].copy()
+            U[:, last] = c * col_last - s * U[:, i]
+            U[:, i] = s * col_last + c * U[:, i]
+            z[i], z[last] = r, 0.0
+            deflated[last] = True
+
+        last = i
+
+    w = D.copy()
+    keep = np.nonzero(~deflated)[0]
+    if len(keep):
+        w[keep], U_keep = _secular_solve(D[keep], z[keep], rho)
+        U[:, keep] = U[:, keep] @ U_keep
+
+    return w, U
+
+def tridiagonal_divide_conquer(
+    d: np.ndarray,
+    e: np.ndarray,
+    max_iter: int = 1000,
+    tol: float = 1e-8,
+    leaf_size: int = 32
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Computes the eigenvalues and eigenvectors of a symmetric tridiagonal matrix
+    with Cuppen's divide-and-conquer method.
+
+    T is torn at the middle into two tridiagonal halves plus a rank-one
+    correction, the halves are solved recursively (with `tridiagonal_qr` below
+    `leaf_size`), and the pieces are glued by solving the secular equation of
+    the rank-one update. The gluing is one matrix-matrix product per level.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: An tuple contains the eigenvalues and the
+        eigenvectors V of T = V diag(w) V^T.
+    """
+    n = len(d)
+    if n <= leaf_size:
+        V = np.eye(n)
+        w, V = tridiagonal_qr(d, e, V, max_iter=max_iter, tol=tol)
+        return w, V
+
+    k = n // 2
+    beta = e[k - 1]
+    d1 = np.array(d[:k], dtype=np.float64)
+    d2 = np.array(d[k:], dtype=np.float64)
+    d1[-1] -= beta
+    d2[0] -= beta
+
+    w1, V1 = tridiagonal_divide_conquer(d1, e[:(k - 1)], max_iter, tol, leaf_size)
+    w2, V2 = tridiagonal_divide_conquer(d2, e[k:], max_iter, tol, leaf_size)
+
+    D = np.concatenate([w1, w2])
+    z = np.concatenate([V1[-1, :], V2[0, :]])
+    w, U = _rank_one_update(D, z, beta)
+
+    V = np.empty((n, n))
+    V[:k] = V1 @ U[:k]
+    V[k:] = V2 @ U[k:]
+    return w, V
+
+def symmetric_qr(
+    A: np.ndarray,
+    max_iter: int = 1000,
+    tol: float = 1e-8,
+    compute_vectors: bool = True,
+    method: str = "qr"
+) -> tuple[np.ndarray, np.ndarray | None]:
+    """
+    Computes the eigenvalues of a real symmetric matrix A by reducing it to
+    tridiagonal form and working on its diagonal and off-diagonal only.
+
+    Args:
+        A (np.ndarray): The real symmetric matrix whose eigenvalues are to be found.
+        max_iter (int): The maximum number of iterations.
+        tol (float): The tolerance for convergence.
+        compute_vectors (bool): If False, skip the accumulation of the
+            eigenvectors and return None in their place.
+        method (str): "qr" for implicit Wilkinson-shift QR sweeps, "dc" for
+            divide-and-conquer (only used when compute_vectors is True).
+
+    Returns:
+        tuple[np.ndarray, np.ndarray | None]: An tuple contains the eigenvalues
+        (in ascending order) and the eigenvectors of the matrix A.
+    """
+    if method not in ("qr", "dc"):
+        raise ValueError(f"Invalid method: {method}. Choose from ['qr', 'dc'].")
+
+    if A.ndim != 2 or A.shape[0] != A.shape[1]:
+        raise ValueError(f"Invalid shape: {A.shape}. Expected a square matrix.")
+
+    # Symmetric up to rounding (e.g. a matrix written as text), relative to the largest entry
+    if not np.allclose(A, A.T, atol=1e-8 * np.abs(A).max()):
+        raise ValueError(f"Invalid matrix: max |A - A.T| = {np.abs(A - A.T).max():.3e}. Expected a symmetric matrix.")
+
+    n = A.shape[0]
+    if n == 1:
+        return np.array([float(A[0, 0])]), (np.ones((1, 1)) if compute_vectors else None)
+
+    gb.recorder.reset()
+    d, e, Q = tridiagonalize(A, compute_vectors)
+    if not compute_vectors:
+        eigenvalues, _ = tridiagonal_qr(d, e, None, max_iter, tol)
+        return np.sort(eigenvalues), None
+
+    if method == "dc":
+        eigenvalues, V = tridiagonal_divide_conquer(d, e, max_iter, tol)
+        eigenvectors = Q @ V
+
+    else:
+        eigenvalues, eigenvectors = tridiagonal_qr(d, e, Q, max_iter, tol)
+
+    order = np.argsort(eigenvalues)
+    return eigenvalues[order], eigenvectors[:, order]
+
+def is_symmetric(A: np.ndarray) -> bool:
+    """Check whether A is a square, exactly symmetric matrix (for --run auto; `symmetric_qr` accepts rounding errors)."""
+    return A.ndim == 2 and A.shape[0] == A.shape[1] and np.array_equal(A, A.T)
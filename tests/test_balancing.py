@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from qr_algorithm import reduce_to_hessenberg, undo_balancing, qr_algorithm_wilkinson, francis_double_shift_qr
+from verify import match_spectrum, residual_norms
+
+def badly_scaled(n: int = 20, seed: int = 0) -> np.ndarray:
+    """D A D^-1 with D spanning 12 orders of magnitude: same eigenvalues as A, rows and columns of very different norms."""
+    rng = np.random.default_rng(seed)
+    D = np.logspace(-6, 6, n)
+    return (D[:, None] * rng.standard_normal((n, n))) / D[None, :]
+
+def test_balancing_shrinks_the_norm():
+    A = badly_scaled()
+    H, Q, balancing = reduce_to_hessenberg(A, True, balance=True)
+    assert np.linalg.norm(H) < 1e-3 * np.linalg.norm(A)
+    lo, hi, pivscale = balancing
+    assert 0 <= lo < hi <= A.shape[0] and len(pivscale) == A.shape[0]
+
+def test_isolated_eigenvalues_are_permuted_out():
+    A = np.triu(np.random.default_rng(1).standard_normal((6, 6)))
+    _, _, (lo, hi, _) = reduce_to_hessenberg(A, True, balance=True)
+    assert hi - lo <= 1
+
+@pytest.mark.parametrize("solver", [qr_algorithm_wilkinson, francis_double_shift_qr])
+def test_balanced_solve_matches_eig(solver):
+    # Real eigenvalues 1, ..., 20, scaled by D = diag(10^-6, ..., 10^6)
+    rng = np.random.default_rng(2)
+    S = rng.standard_normal((20, 20)) + 20 * np.eye(20)
+    D = np.logspace(-6, 6, 20)
+    A = (D[:, None] * (S @ np.diag(np.arange(1.0, 21)) @ np.linalg.inv(S))) / D[None, :]
+    eigenvalues, eigenvectors = solver(A, 1000, 1e-12, balance=True)
+    reference = np.linalg.eigvals(A)
+    assert (match_spectrum(eigenvalues, reference)[1] / np.abs(reference).max()).max() < 1e-8
+    assert residual_norms(A, eigenvalues, eigenvectors).max() < 1e-10
+
+def test_undo_balancing_without_balancing_is_identity():
+    V = np.random.default_rng(3).standard_normal((4, 4))
+    assert undo_balancing(V, None) is V
@@ -0,0 +1,48 @@
+import io
+import json
+import numpy as np
+
+from batch_runner import find_inputs, run_batch, run_task
+from utils import save_matrix
+
+def test_find_inputs(tmp_path):
+    for name in ("a.txt", "b.npy", "c.bin", "notes.md"):
+        (tmp_path / name).write_bytes(b"")
+
+    files = find_inputs([str(tmp_path), str(tmp_path / "*.txt")])
+    assert [f.rsplit("/", 1)[-1] for f in files] == ["a.txt", "b.npy", "c.bin"]
+
+def test_run_task_checks_against_eig(tmp_path):
+    filename = str(tmp_path / "a.npy")
+    save_matrix(filename, np.random.default_rng(0).standard_normal((10, 10)))
+    record = run_task(filename, "francis", 1000, 1e-12, 1e-8, 1e-8)
+    assert record["status"] == "ok" and record["shape"] == [10, 10]
+    assert record["residual"] < 1e-8 and record["value_error"] < 1e-8
+    assert run_task(filename, "batched", 1000, 1e-12, 1e-8, 1e-8)["status"] == "skipped"
+
+def test_run_batch_report(tmp_path):
+    rng = np.random.default_rng(1)
+    save_matrix(str(tmp_path / "single.txt"), rng.standard_normal((8, 8)))
+    save_matrix(str(tmp_path / "stack.bin"), rng.standard_normal((3, 6, 6)))
+    (tmp_path / "broken.txt").write_text("1 2\n3")
+    report = io.StringIO()
+    files = find_inputs([str(tmp_path)])
+    counts = run_batch(files, ["francis", "batched"], report, workers=2, tol=1e-12)
+
+    records = [json.loads(line) for line in report.getvalue().splitlines()]
+    assert len(records) == 6
+    status = {(r["file"].rsplit("/", 1)[-1], r["method"]): r["status"] for r in records}
+    assert status == {
+        ("single.txt", "francis"): "ok", ("single.txt", "batched"): "skipped",
+        ("stack.bin", "francis"): "skipped", ("stack.bin", "batched"): "ok",
+        ("broken.txt", "francis"): "error", ("broken.txt", "batched"): "error"
+    }
+    assert counts == {"ok": 2, "skipped": 2, "error": 2}
+
+def test_timeout_kills_the_task(tmp_path):
+    filename = str(tmp_path / "slow.npy")
+    save_matrix(filename, np.random.default_rng(2).standard_normal((200, 200)))
+    report = io.StringIO()
+    counts = run_batch([filename], ["qr"], report, workers=1, timeout=0.5, max_iter=10 ** 6, tol=0.0)
+    assert counts == {"timeout": 1}
+    assert json.loads(report.getvalue())["status"] == "timeout"
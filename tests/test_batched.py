@@ -0,0 +1,24 @@
+import numpy as np
+import pytest
+
+from batched import qr_algorithm_batched
+from verify import match_spectrum
+
+def test_matches_eig():
+    A = np.random.default_rng(0).standard_normal((50, 8, 8))
+    eigenvalues, eigenvectors = qr_algorithm_batched(A, 1000, 1e-12)
+    reference = np.linalg.eigvals(A)
+    for index in range(len(A)):
+        assert match_spectrum(eigenvalues[index], reference[index])[1].max() < 1e-8
+
+    residual = A @ eigenvectors - eigenvectors * eigenvalues[:, None, :]
+    assert np.abs(residual).max() < 1e-8
+
+def test_warns_with_the_unconverged_indices():
+    # A cyclic permutation stalls the Francis shifts (all its eigenvalues have modulus 1)
+    rng = np.random.default_rng(0)
+    A = np.stack([np.triu(rng.standard_normal((8, 8))), np.roll(np.eye(8), 1, axis=0)])
+    with pytest.warns(RuntimeWarning, match=r"matrices \[1\]"):
+        eigenvalues, _ = qr_algorithm_batched(A, 10, 1e-12, compute_vectors=False)
+
+    assert np.allclose(np.sort(eigenvalues[0].real), np.sort(np.diag(A[0])))
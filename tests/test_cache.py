@@ -0,0 +1,40 @@
+import numpy as np
+
+from cache import ResultCache, cache_key, file_digest, matrix_digest
+
+def result(n: int, seed: int = 0) -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    return rng.standard_normal(n) + 1j * rng.standard_normal(n), rng.standard_normal((n, n))
+
+def test_memory_round_trip_and_lru_eviction():
+    first, second, third = result(8, 0), result(8, 1), result(8, 2)
+    size = sum(x.nbytes for x in first)
+    cache = ResultCache(max_bytes=2 * size)
+    cache.put("a", *first)
+    cache.put("b", *second)
+    assert cache.get("a") is not None          # "a" is now the most recently used
+    cache.put("c", *third)
+    assert cache.get("b") is None
+    eigenvalues, eigenvectors = cache.get("a")
+    assert np.array_equal(eigenvalues, first[0]) and np.array_equal(eigenvectors, first[1])
+    assert cache.stats()["evictions"] == 1
+    assert cache.nbytes <= cache.max_bytes
+
+def test_disk_spill_survives_a_new_cache(tmp_path):
+    eigenvalues, _ = result(5)
+    ResultCache(max_bytes=1 << 20, directory=str(tmp_path)).put("key", eigenvalues, None)
+    cache = ResultCache(max_bytes=1 << 20, directory=str(tmp_path))
+    cached_values, cached_vectors = cache.get("key")
+    assert np.array_equal(cached_values, eigenvalues) and cached_vectors is None
+    assert cache.stats()["disk_hits"] == 1
+
+def test_keys_follow_content_and_settings(tmp_path):
+    A = np.arange(9.0).reshape(3, 3)
+    assert matrix_digest(A) == matrix_digest(A.copy())
+    assert matrix_digest(A) != matrix_digest(A.T)
+    path = tmp_path / "a.txt"
+    path.write_text("1 2\n3 4")
+    digest = file_digest(str(path))
+    assert cache_key(digest, "francis", 1000, 1e-8, True) == cache_key(digest, "francis", 1000, 1e-8, True)
+    assert cache_key(digest, "francis", 1000, 1e-8, True) != cache_key(digest, "francis", 1000, 1e-8, False)
+    assert cache_key(digest, "francis", 1000, 1e-8, True, shifts=2) != cache_key(digest, "francis", 1000, 1e-8, True, shifts=4)
@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+from scipy.linalg import schur
+from qr_algorithm import extract_eigens_from_schur, qr_algorithm, qr_algorithm_wilkinson, francis_double_shift_qr
+from verify import match_spectrum, residual_norms
+
+def real_spectrum(n: int, seed: int = 0) -> np.ndarray:
+    """A non-normal matrix with the real eigenvalues 1, ..., n."""
+    rng = np.random.default_rng(seed)
+    S = rng.standard_normal((n, n)) + n * np.eye(n)
+    return S @ np.diag(np.arange(1.0, n + 1)) @ np.linalg.inv(S)
+
+def test_schur_form_eigenpairs():
+    A = np.random.default_rng(0).standard_normal((30, 30))
+    T, Q = schur(A, output='real')
+    eigenvalues, eigenvectors = extract_eigens_from_schur(T, Q, tol=1e-12)
+    assert match_spectrum(eigenvalues, np.linalg.eigvals(A))[1].max() < 1e-10
+    assert residual_norms(A, eigenvalues, eigenvectors).max() < 1e-12
+    assert np.allclose(np.linalg.norm(eigenvectors, axis=0), 1.0)
+
+@pytest.mark.parametrize("solver", [qr_algorithm, qr_algorithm_wilkinson, francis_double_shift_qr])
+def test_solvers_return_right_eigenvectors(solver):
+    A = real_spectrum(12)
+    eigenvalues, eigenvectors = solver(A, 2000, 1e-12)
+    assert match_spectrum(eigenvalues, np.linalg.eigvals(A))[1].max() < 1e-6
+    assert residual_norms(A, eigenvalues, eigenvectors).max() < 1e-8
+
+def test_complex_pairs():
+    A = np.random.default_rng(1).standard_normal((25, 25))
+    eigenvalues, eigenvectors = francis_double_shift_qr(A, tol=1e-12)
+    assert np.iscomplexobj(eigenvalues)
+    assert residual_norms(A, eigenvalues, eigenvectors).max() < 1e-10
+
+def test_value_range_subset():
+    A = real_spectrum(12)
+    eigenvalues, eigenvectors = francis_double_shift_qr(A, tol=1e-12, value_range=(3.5, 7.5))
+    assert np.allclose(np.sort(eigenvalues.real), [4, 5, 6, 7])
+    assert eigenvectors.shape == (12, 4)
+    assert residual_norms(A, eigenvalues, eigenvectors).max() < 1e-8
@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+from utils import load_matrix, save_matrix, write_matrix
+
+@pytest.mark.parametrize("suffix", [".txt", ".npy", ".bin"])
+@pytest.mark.parametrize("shape", [(5, 5), (3, 4, 4)])
+def test_round_trip(tmp_path, suffix, shape):
+    A = np.random.default_rng(0).standard_normal(shape)
+    filename = str(tmp_path / f"matrix{suffix}")
+    save_matrix(filename, A)
+    B = load_matrix(filename)
+    assert B.shape == A.shape
+    assert np.array_equal(np.asarray(B), A)            # %.17g text is exact too
+
+@pytest.mark.parametrize("suffix", [".txt", ".npy", ".bin"])
+def test_write_from_row_blocks(tmp_path, suffix):
+    A = np.arange(42.0).reshape(6, 7)
+    filename = str(tmp_path / f"matrix{suffix}")
+    write_matrix(filename, A.shape, (A[start : (start + 4)] for start in range(0, 6, 4)))
+    assert np.array_equal(np.asarray(load_matrix(filename)), A)
+
+def test_text_has_no_trailing_newline(tmp_path):
+    filename = tmp_path / "matrix.txt"
+    save_matrix(str(filename), np.eye(3))
+    assert not filename.read_bytes().endswith(b"\n")
+
+def test_invalid_files_raise(tmp_path):
+    ragged = tmp_path / "ragged.txt"
+    ragged.write_text("1 2 3\n4 5")
+    with pytest.raises(ValueError):
+        load_matrix(str(ragged))
+
+    bad = tmp_path / "bad.bin"
+    bad.write_bytes(b"not a matrix file")
+    with pytest.raises(ValueError):
+        load_matrix(str(bad))
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from scipy.sparse.linalg import aslinearoperator
+from krylov import arnoldi, subspace_iteration
+
+def pair_on_boundary(n: int = 50, seed: int = 0) -> np.ndarray:
+    """A matrix whose 6th and 7th eigenvalues by real part are the pair 5 +- 2i."""
+    rng = np.random.default_rng(seed)
+    D = np.diag(np.concatenate([[10.0, 9.0, 8.0, 7.0, 6.0, 5.0, 5.0], rng.uniform(-10.0, 0.0, n - 7)]))
+    D[5, 6], D[6, 5] = 2.0, -2.0
+    Q, _ = np.linalg.qr(rng.standard_normal((n, n)))
+    return Q @ D @ Q.T
+
+def test_conjugate_pair_on_boundary_is_kept_whole():
+    A = pair_on_boundary()
+    eigenvalues, eigenvectors = arnoldi(A, k=6, which="LR")
+    assert len(eigenvalues) == 7
+    expected = np.array([10, 9, 8, 7, 6, 5 + 2j, 5 - 2j])
+    assert np.allclose(np.sort_complex(eigenvalues), np.sort_complex(expected))
+    assert np.allclose(A @ eigenvectors, eigenvectors * eigenvalues, atol=1e-6)
+
+def test_linear_operator_input():
+    A = pair_on_boundary()
+    eigenvalues, _ = arnoldi(aslinearoperator(A), k=3, which="LR", compute_vectors=False)
+    assert np.allclose(np.sort(eigenvalues.real), [8, 9, 10])
+
+def test_rejects_k_not_below_n():
+    with pytest.raises(ValueError):
+        arnoldi(np.ones((1, 1)), k=1)
+
+    with pytest.raises(ValueError):
+        arnoldi(np.eye(4), k=4)
+
+def test_warns_when_not_converged():
+    A = np.random.default_rng(0).standard_normal((300, 300))
+    with pytest.warns(RuntimeWarning, match="did not converge"):
+        arnoldi(A, max_iter=3, k=6, which="SM")
+
+    with pytest.warns(RuntimeWarning, match="did not converge"):
+        subspace_iteration(A, max_iter=3, k=6)
+
+def test_subspace_iteration_keeps_conjugate_pair_on_boundary():
+    # Magnitudes 10, 9, 8, 7, 6, then the pair 5 +- 2i (|.| = 5.39) as 6th and 7th
+    rng = np.random.default_rng(0)
+    n = 40
+    D = np.diag(np.concatenate([[10.0, 9.0, 8.0, 7.0, 6.0, 5.0, 5.0], rng.uniform(-3.0, 3.0, n - 7)]))
+    D[5, 6], D[6, 5] = 2.0, -2.0
+    Q, _ = np.linalg.qr(rng.standard_normal((n, n)))
+    A = Q @ D @ Q.T
+    eigenvalues, eigenvectors = subspace_iteration(A, k=6)
+    assert len(eigenvalues) == 7
+    assert np.allclose(np.sort_complex(eigenvalues), np.sort_complex([10, 9, 8, 7, 6, 5 + 2j, 5 - 2j]))
+    assert np.allclose(A @ eigenvectors, eigenvectors * eigenvalues, atol=1e-6)
+
+def test_subspace_iteration_rejects_invalid_k():
+    for k in (0, 4, 5):
+        with pytest.raises(ValueError):
+            subspace_iteration(np.eye(4), k=k)
@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from scipy.linalg import schur
+from mixed_precision import mixed_precision_qr
+from warm_start import complex_schur_eigens
+from verify import match_spectrum
+
+def close_pair(n: int = 30, seed: int = 0) -> np.ndarray:
+    """A matrix with the eigenvalues 5 +- 1e-6i, and a norm large enough that tol ||T|| exceeds 1e-6."""
+    rng = np.random.default_rng(seed)
+    D = np.diag(np.concatenate([[5.0, 5.0], rng.uniform(-1000.0, -1.0, n - 2)]))
+    D[0, 1], D[1, 0] = 1e-6, -1e-6
+    Q, _ = np.linalg.qr(rng.standard_normal((n, n)))
+    return Q @ D @ Q.T
+
+@pytest.mark.parametrize("method", ["wilkinson", "francis"])
+def test_matches_eig(method):
+    A = np.random.default_rng(0).standard_normal((40, 40))
+    eigenvalues, eigenvectors = mixed_precision_qr(A, 1000, 1e-10, method=method)
+    assert match_spectrum(eigenvalues, np.linalg.eigvals(A))[1].max() < 1e-8
+    assert np.allclose(A @ eigenvectors, eigenvectors * eigenvalues, atol=1e-8)
+
+def test_real_spectrum_is_returned_real():
+    B = np.random.default_rng(1).standard_normal((40, 40))
+    A = B + B.T
+    eigenvalues, eigenvectors = mixed_precision_qr(A, 1000, 1e-10)
+    assert eigenvalues.dtype == np.float64 and eigenvectors.dtype == np.float64
+    assert np.allclose(np.sort(eigenvalues), np.linalg.eigvalsh(A))
+
+def test_close_conjugate_pair_is_kept():
+    A = close_pair()
+    T, U = schur(A.astype(complex), output='complex')
+    eigenvalues, _ = complex_schur_eigens(T, U, tol=1e-8)
+    assert np.iscomplexobj(eigenvalues)
+    pair = eigenvalues[np.abs(eigenvalues - 5) < 1e-3]
+    assert np.allclose(np.sort(pair.imag), [-1e-6, 1e-6], rtol=1e-3)
+    eigenvalues, _ = mixed_precision_qr(A, 1000, 1e-8)
+    assert match_spectrum(eigenvalues, np.linalg.eigvals(A))[1].max() < 1e-9
@@ -0,0 +1,20 @@
+import numpy as np
+import pytest
+
+from qr_algorithm import francis_double_shift_qr
+from verify import match_spectrum
+
+@pytest.mark.parametrize("shifts, aed_window", [(2, 0), (4, 0), (8, 0), (8, 24)])
+def test_multishift_matches_eig(shifts, aed_window):
+    A = np.random.default_rng(0).standard_normal((120, 120))
+    eigenvalues, eigenvectors, stats = francis_double_shift_qr(A, tol=1e-12, shifts=shifts, aed_window=aed_window,
+                                                               return_stats=True)
+    assert match_spectrum(eigenvalues, np.linalg.eigvals(A))[1].max() < 1e-8
+    assert np.allclose(A @ eigenvectors, eigenvectors * eigenvalues, atol=1e-8)
+    assert stats["counters"]["sweeps"] > 0
+
+def test_more_shifts_need_fewer_sweeps():
+    A = np.random.default_rng(1).standard_normal((120, 120))
+    sweeps = [francis_double_shift_qr(A, tol=1e-12, shifts=shifts, compute_vectors=False,
+                                      return_stats=True)[2]["counters"]["sweeps"] for shifts in (2, 8)]
+    assert sweeps[1] < sweeps[0]
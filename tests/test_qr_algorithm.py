@@ -0,0 +1,18 @@
+import warnings
+import numpy as np
+import pytest
+
+from qr_algorithm import qr_algorithm_wilkinson, francis_double_shift_qr
+
+def test_warns_when_max_iter_is_exhausted():
+    A = np.random.default_rng(0).standard_normal((60, 60))
+    with pytest.warns(RuntimeWarning, match="did not converge"):
+        qr_algorithm_wilkinson(A, 5, 1e-8, compute_vectors=False, aed_window=10)
+
+def test_no_warning_when_converged():
+    A = np.random.default_rng(0).standard_normal((30, 30))
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        eigenvalues, _ = francis_double_shift_qr(A, 1000, 1e-10, compute_vectors=False)
+
+    assert np.allclose(np.sort_complex(eigenvalues), np.sort_complex(np.linalg.eigvals(A)))
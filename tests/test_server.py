@@ -0,0 +1,116 @@
+import asyncio
+import os
+import threading
+import time
+import numpy as np
+import pytest
+
+from client import SolverClient
+from protocol import LENGTH, decode_request, decode_response, encode_error, encode_request, encode_response
+from server import SolverServer
+from verify import match_spectrum
+
+def frame(buffers) -> bytes:
+    """A message without its length prefix."""
+    data = b"".join(bytes(buffer) for buffer in buffers)
+    assert LENGTH.unpack_from(data)[0] == len(data) - LENGTH.size
+    return data[LENGTH.size:]
+
+def test_protocol_round_trip():
+    A = np.random.default_rng(0).standard_normal((5, 5))
+    method, B, max_iter, tol, compute_vectors = decode_request(frame(encode_request(A, "wilkinson", 300, 1e-9, True)))
+    assert (method, max_iter, tol, compute_vectors) == ("wilkinson", 300, 1e-9, True)
+    assert np.array_equal(A, B)
+
+    eigenvalues, eigenvectors = np.linalg.eig(A)
+    values, vectors, seconds = decode_response(frame(encode_response(eigenvalues, eigenvectors, 0.25)))
+    assert np.array_equal(values, eigenvalues) and np.array_equal(vectors, eigenvectors) and seconds == 0.25
+    values, vectors, _ = decode_response(frame(encode_response(np.arange(3.0), None, 0.0)))
+    assert values.dtype == np.float64 and np.array_equal(values, np.arange(3.0)) and vectors is None
+    with pytest.raises(RuntimeError, match="boom"):
+        decode_response(frame([encode_error("boom")]))
+
+@pytest.fixture
+def server(tmp_path):
+    socket_path = str(tmp_path / "solver.sock")
+    solver_server = SolverServer(workers=2, small=16, cache_bytes=1 << 20)
+    running = {}
+
+    async def serve():
+        running["loop"], running["task"] = asyncio.get_running_loop(), asyncio.current_task()
+        await solver_server.serve(socket_path)
+
+    def run():
+        try:
+            asyncio.run(serve())        # cancels the connection handlers left when the server stops
+
+        except asyncio.CancelledError:
+            pass
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 10
+    while not os.path.exists(socket_path) and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    yield solver_server, socket_path
+    running["loop"].call_soon_threadsafe(running["task"].cancel)
+    thread.join(10)
+
+def count_in_flight(pool) -> dict:
+    """Wrap pool.submit to record the largest number of tasks in the pool at once."""
+    submit = pool.submit
+    lock = threading.Lock()
+    state = {"now": 0, "max": 0}
+
+    def done(_):
+        with lock:
+            state["now"] -= 1
+
+    def counted_submit(*args, **kwargs):
+        with lock:
+            state["now"] += 1
+            state["max"] = max(state["max"], state["now"])
+
+        future = submit(*args, **kwargs)
+        future.add_done_callback(done)
+        return future
+
+    pool.submit = counted_submit
+    return state
+
+def test_mixed_load_matches_eig(server):
+    solver_server, socket_path = server
+    in_flight = count_in_flight(solver_server.pool)
+    rng = np.random.default_rng(0)
+    matrices = [rng.standard_normal((n, n)) for n in (4, 40, 8, 30, 6, 12)]
+    errors = []
+
+    def run(A):
+        try:
+            with SolverClient(socket_path=socket_path) as client:
+                for _ in range(2):
+                    eigenvalues, eigenvectors = client.solve(A, "francis")
+                    assert match_spectrum(eigenvalues, np.linalg.eigvals(A))[1].max() < 1e-6
+                    assert np.allclose(A @ eigenvectors, eigenvectors * eigenvalues, atol=1e-6)
+
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=run, args=(A,)) for A in matrices]
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    assert solver_server.requests == 12
+    assert solver_server.cache.stats()["hits"] == 6
+    assert 0 < in_flight["max"] <= solver_server.workers            # large requests wait for a free worker too
+
+def test_error_is_reported(server):
+    _, socket_path = server
+    with SolverClient(socket_path=socket_path) as client:
+        with pytest.raises(RuntimeError, match="Server error"):
+            client.solve(np.full((3, 3), np.nan), "francis")
@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from qr_algorithm import find_splits, francis_double_shift_qr, qr_algorithm_wilkinson
+from verify import match_spectrum
+
+def decoupled(sizes: tuple[int, ...], seed: int = 0) -> np.ndarray:
+    """A block upper triangular matrix: its Hessenberg form splits exactly between the blocks."""
+    rng = np.random.default_rng(seed)
+    A = np.triu(rng.standard_normal((sum(sizes), sum(sizes))))
+    start = 0
+    for size in sizes:
+        A[start : (start + size), start : (start + size)] = rng.standard_normal((size, size))
+        start += size
+
+    return A
+
+def test_find_splits_zeroes_interior_entries():
+    H = np.triu(np.random.default_rng(0).standard_normal((8, 8)), -1)
+    H[3, 2] = 1e-14
+    H[6, 5] = 1e-14
+    dropped = np.zeros(8)
+    splits = find_splits(H, 0, 8, 1e-10, dropped)
+    assert splits.tolist() == [3, 6]
+    assert H[3, 2] == 0.0 and H[6, 5] == 0.0
+    assert np.allclose(dropped[[3, 6]], 1e-14)
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_blocks_solved_in_a_pool_match_eig(workers):
+    A = decoupled((70, 70))
+    eigenvalues, eigenvectors = francis_double_shift_qr(A, tol=1e-12, workers=workers)
+    assert match_spectrum(eigenvalues, np.linalg.eigvals(A))[1].max() < 1e-8
+    assert np.allclose(A @ eigenvectors, eigenvectors * eigenvalues, atol=1e-8)
+
+def test_wilkinson_blocks_in_a_pool_match_eig():
+    rng = np.random.default_rng(1)
+    blocks = [rng.standard_normal((70, 70)) for _ in range(2)]
+    A = decoupled((70, 70), seed=1)
+    A[:70, :70] = blocks[0] + blocks[0].T
+    A[70:, 70:] = blocks[1] + blocks[1].T
+    eigenvalues, _ = qr_algorithm_wilkinson(A, 1000, 1e-12, compute_vectors=False, workers=2)
+    assert match_spectrum(eigenvalues, np.linalg.eigvals(A))[1].max() < 1e-8
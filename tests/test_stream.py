@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+
+from qr_algorithm import stream_eigenvalues
+
+def random_symmetric(n: int, seed: int = 0) -> np.ndarray:
+    B = np.random.default_rng(seed).standard_normal((n, n))
+    return B + B.T
+
+@pytest.mark.parametrize("method, A", [
+    ("wilkinson", random_symmetric(40)),       # real shifts: real eigenvalues
+    ("francis", np.random.default_rng(1).standard_normal((40, 40)))
+])
+def test_stream_matches_eig(method, A):
+    eigenvalues = np.concatenate([values for values, *_ in stream_eigenvalues(A, 1000, 1e-12, method)])
+    assert len(eigenvalues) == 40
+    assert np.allclose(np.sort_complex(eigenvalues), np.sort_complex(np.linalg.eigvals(A)), atol=1e-8)
+
+@pytest.mark.parametrize("method", ["wilkinson", "francis"])
+def test_backward_error_bounds_the_aed_deflations(method):
+    # For a symmetric A, every eigenvalue of A + E is within ||E||_2 <= ||E||_F of one of A
+    A = random_symmetric(120)
+    reference = np.linalg.eigvalsh(A)
+    norm_A = np.linalg.norm(A)
+    found = 0
+    for eigenvalues, _, _, error in stream_eigenvalues(A, 1000, 1e-4, method, aed_window=24):
+        distance = np.abs(eigenvalues.real[:, None] - reference[None, :]).min(axis=1)
+        assert np.all(distance <= error * norm_A + 1e-10 * norm_A)
+        found += len(eigenvalues)
+
+    assert found == 120
+    assert error > 0
@@ -0,0 +1,23 @@
+import numpy as np
+import pytest
+
+from symmetric import symmetric_qr
+
+def random_symmetric(n: int, seed: int = 0) -> np.ndarray:
+    B = np.random.default_rng(seed).standard_normal((n, n))
+    return B + B.T
+
+@pytest.mark.parametrize("method", ["qr", "dc"])
+def test_matches_eigh(method):
+    S = random_symmetric(40)
+    eigenvalues, eigenvectors = symmetric_qr(S, 1000, 1e-12, method=method)
+    assert np.allclose(eigenvalues, np.linalg.eigh(S)[0])
+    assert np.allclose(S @ eigenvectors, eigenvectors * eigenvalues, atol=1e-8)
+
+def test_rejects_non_symmetric():
+    with pytest.raises(ValueError):
+        symmetric_qr(np.random.default_rng(0).standard_normal((5, 5)))
+
+def test_warns_when_max_iter_is_exhausted():
+    with pytest.warns(RuntimeWarning, match="did not converge"):
+        symmetric_qr(random_symmetric(60), 10, 1e-8, compute_vectors=False)
@@ -0,0 +1,38 @@
+import numpy as np
+
+from verify import match_spectrum, residual_norms, verify
+
+def test_residuals_of_exact_eigenpairs_are_small():
+    A = np.random.default_rng(0).standard_normal((3, 10, 10))
+    eigenvalues, eigenvectors = np.linalg.eig(A)
+    residuals = residual_norms(A, eigenvalues, eigenvectors)
+    assert residuals.shape == (3, 10) and residuals.max() < 1e-14
+
+def test_match_spectrum_pairs_conjugates_and_multiples():
+    reference = np.array([1 + 2j, 1 - 2j, 3.0, 3.0, -4.0])
+    computed = np.array([3.0, 1 - 2j, -4.0, 3.0 + 1e-9, 1 + 2j])
+    matched, distances = match_spectrum(computed, reference)
+    assert sorted(matched.tolist()) == [0, 1, 2, 3, 4]
+    assert np.allclose(reference[matched], computed, atol=1e-8) and distances.max() < 1e-8
+
+def test_verify_flags_wrong_values_and_vectors():
+    A = np.random.default_rng(1).standard_normal((8, 8))
+    eigenvalues, eigenvectors = np.linalg.eig(A)
+    assert verify(A, eigenvalues, eigenvectors)["passed"]
+
+    wrong_values = eigenvalues.copy()
+    wrong_values[2] += 0.1
+    result = verify(A, wrong_values, None)
+    assert not result["passed"] and result["failed_values"] == [2]
+
+    wrong_vectors = eigenvectors.copy()
+    wrong_vectors[:, 5] = wrong_vectors[:, 4]
+    result = verify(A, eigenvalues, wrong_vectors)
+    assert not result["passed"] and 5 in result["failed_residuals"]
+
+def test_verify_stack():
+    A = np.random.default_rng(2).standard_normal((4, 6, 6))
+    eigenvalues, eigenvectors = np.linalg.eig(A)
+    eigenvalues[3, 0] += 1.0
+    results = verify(A, eigenvalues, eigenvectors)
+    assert [result["passed"] for result in results] == [True, True, True, False]
@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from warm_start import WarmStartSolver, solve_sequence
+from verify import match_spectrum, residual_norms
+
+def drifting(steps: int = 6, n: int = 20, step: float = 1e-4, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    A = rng.standard_normal((n, n))
+    E = rng.standard_normal((n, n))
+    return np.stack([A + t * step * E for t in range(steps)])
+
+def test_refines_after_the_first_matrix():
+    solver = WarmStartSolver(tol=1e-12)
+    paths = []
+    for A in drifting():
+        eigenvalues, eigenvectors = solver.solve(A)
+        paths.append(solver.path)
+        assert match_spectrum(eigenvalues, np.linalg.eigvals(A))[1].max() < 1e-9
+        assert residual_norms(A, eigenvalues, eigenvectors).max() < 1e-10
+
+    assert paths[0] == "cold" and set(paths[1:]) == {"refine"}
+
+def test_large_jump_falls_back_to_a_cold_solve():
+    solver = WarmStartSolver(tol=1e-12)
+    rng = np.random.default_rng(1)
+    solver.solve(rng.standard_normal((15, 15)))
+    A = rng.standard_normal((15, 15))
+    eigenvalues, _ = solver.solve(A)
+    assert solver.path == "cold"
+    assert match_spectrum(eigenvalues, np.linalg.eigvals(A))[1].max() < 1e-9
+
+def test_solve_sequence_matches_eig():
+    A = drifting(steps=4)
+    eigenvalues, eigenvectors = solve_sequence(A, tol=1e-12)
+    assert eigenvalues.shape == (4, 20) and eigenvectors.shape == (4, 20, 20)
+    for index in range(4):
+        assert match_spectrum(eigenvalues[index], np.linalg.eigvals(A[index]))[1].max() < 1e-9
+
+    with pytest.raises(ValueError):
+        solve_sequence(A[0])
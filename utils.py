@@ -1,111 +1,283 @@
-import matplotlib.pyplot as plt
-import numpy as np
-import global_constant as gb
-
-from matplotlib.animation import FuncAnimation
-
-def plot_power_method_convergence(
-    vectors,
-    eigenvalues
-):
-    # 2D Plot: Convergence of differences
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
-
-    ax1.plot(eigenvalues, marker='o', linestyle='-', color='blue', label='Difference')
-    ax1.set_xlabel('Iteration')
-    ax1.set_ylabel('Dominant Eigenvalue')
-    ax1.set_yscale('log')
-    ax1.set_title(f'Convergence of Dominant Eigenvalue using Power Method')
-    ax1.grid(True, which='both', linestyle='--', linewidth=0.5)
-    ax1.legend()
-
-    # 3D Plot: Evolution of orthogonal vectors
-    ax2 = fig.add_subplot(122, projection='3d')
-    ax2.plot(vectors[:, 0], vectors[:, 1], vectors[:, 2], marker='o', color='blue', label='Eigenvector Path', linestyle='-', linewidth=2)
-    ax2.scatter(vectors[0, 0], vectors[0, 1], vectors[0, 2], color='red', s=100, label='Start')
-    ax2.scatter(vectors[-1, 0], vectors[-1, 1], vectors[-1, 2], color='green', s=100, label='Converged')
-    ax2.set_title(f"Convergence of Dominant Eigenvector using Power Method")
-    ax2.set_xlabel("X")
-    ax2.set_ylabel("Y")
-    ax2.set_zlabel("Z")
-    ax2.legend()
-
-    plt.tight_layout()
-    plt.show()
-
-def plot_QR_algorithm_convergence(
-    matrices
-):
-    fig, ax1 = plt.subplots(figsize=(6, 6))
-    cax = ax1.matshow(matrices[0], cmap='viridis', vmin=0)
-    fig.colorbar(cax, ax=ax1)
-
-    # Function to update the plot
-    def update(iteration):
-        ax1.clear()
-        cax = ax1.matshow(matrices[iteration], cmap='viridis', vmin=0)
-        ax1.set_title(f'QR Iteration {iteration}')
-        return [cax]
-
-    # Animation
-    ani = FuncAnimation(fig, update, frames=min(len(matrices), gb.max_frame), interval=50, blit=False, repeat=False)
-    plt.show()
-
-def load_matrix(filename: str) -> np.ndarray:
-    """
-        The input file contains n lines of floating-point numbers
-        At each line, the numbers are separated by space
-        No newline exists at the end of the last line
-    """
-    with open(file=filename) as f:
-        lines = f.readlines()
-        lines = [line if line[-1] != '\n' else line[:-1] for line in lines]
-        matrix = []
-        for line in lines:
-            matrix.append([float(item) for item in line.split(' ')])
-        
-        return np.array(matrix)
-
-def gen_matrix(filename: str, low: int, high: int, maxsize: int = 5):
-    if low >= high:
-        raise ValueError("`low` must smaller than `high`")
-    
-    with open(file=filename, mode='+w') as f:
-        A = np.random.uniform(low, high, size=(maxsize, maxsize)).tolist()
-        lines = [" ".join([str(x) for x in item]) for item in A]
-        for index in range(len(lines) - 1):
-            lines[index] += '\n'
-        
-        f.writelines(lines)
-
-def gen_sym_matrix(filename: str, low: int, high: int, maxsize: int = 5):
-    if low >= high:
-        raise ValueError("`low` must smaller than `high`")
-    
-    with open(file=filename, mode='+w') as f:
-        A = np.random.uniform(low, high, size=(maxsize, maxsize))
-        A = (A + A.T) / 2
-        A = A.tolist()
-        lines = [" ".join([str(x) for x in item]) for item in A]
-        for index in range(len(lines) - 1):
-            lines[index] += '\n'
-        
-        f.writelines(lines)
-
-def print_matrix(matrix: np.ndarray):
-    print("\n".join([" ".join([f"{item:.6f}" for item in sublist]) for sublist in matrix]))
-
-def print_eigens(eigenvalues, eigenvectors):
-    print(f'{"Eigenvalue":<30} {"Eigenvector":<30}')
-    for val, vec in zip(eigenvalues, eigenvectors.T):
-        # Format complex eigenvalue
-        val = complex(val)
-        val_str = f'{val.real:.6f} + {val.imag:.6f}j' if val.imag else f'{val.real:.6f}'
-
-        # Format each component of the eigenvector
-        vec_str = ', '.join(
-            f'{x.real:.6f} + {x.imag:.6f}j' if x.imag else f'{x.real:.6f}'
-            for x in vec
-        )
-
-        print(f'{val_str:<30} {vec_str:<30}')
\ No newline at end of file
+import numpy as np
+import os
+import warnings
+import global_constant as gb
+
+# matplotlib is imported by the plotting functions only: it takes longer to
+# import than a small solve, and only --visualize needs it.
+
+def plot_power_method_convergence(
+    vectors,
+    eigenvalues
+):
+    import matplotlib.pyplot as plt
+
+    # 2D Plot: Convergence of differences
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
+
+    ax1.plot(eigenvalues, marker='o', linestyle='-', color='blue', label='Difference')
+    ax1.set_xlabel('Iteration')
+    ax1.set_ylabel('Dominant Eigenvalue')
+    ax1.set_yscale('log')
+    ax1.set_title(f'Convergence of Dominant Eigenvalue using Power Method')
+    ax1.grid(True, which='both', linestyle='--', linewidth=0.5)
+    ax1.legend()
+
+    # 3D Plot: Evolution of orthogonal vectors
+    ax2 = fig.add_subplot(122, projection='3d')
+    ax2.plot(vectors[:, 0], vectors[:, 1], vectors[:, 2], marker='o', color='blue', label='Eigenvector Path', linestyle='-', linewidth=2)
+    ax2.scatter(vectors[0, 0], vectors[0, 1], vectors[0, 2], color='red', s=100, label='Start')
+    ax2.scatter(vectors[-1, 0], vectors[-1, 1], vectors[-1, 2], color='green', s=100, label='Converged')
+    ax2.set_title(f"Convergence of Dominant Eigenvector using Power Method")
+    ax2.set_xlabel("X")
+    ax2.set_ylabel("Y")
+    ax2.set_zlabel("Z")
+    ax2.legend()
+
+    plt.tight_layout()
+    plt.show()
+
+def plot_QR_algorithm_convergence(
+    recorder
+):
+    import matplotlib.pyplot as plt
+    from matplotlib.animation import FuncAnimation
+
+    iterations, values = recorder.summaries()
+    if values:
+        # Summary trace: norm of the subdiagonal per iteration
+        fig, ax1 = plt.subplots(figsize=(8, 6))
+        ax1.plot(iterations, values, linestyle='-', color='blue', label='Subdiagonal norm')
+        ax1.set_xlabel('Iteration')
+        ax1.set_ylabel('Norm of the subdiagonal')
+        ax1.set_yscale('log')
+        ax1.set_title('Convergence of the QR Algorithm')
+        ax1.grid(True, which='both', linestyle='--', linewidth=0.5)
+        ax1.legend()
+        plt.show()
+        return
+
+    iterations, matrices = recorder.frames()
+    if not matrices:
+        return
+
+    fig, ax1 = plt.subplots(figsize=(6, 6))
+    cax = ax1.matshow(matrices[0], cmap='viridis', vmin=0)
+    fig.colorbar(cax, ax=ax1)
+
+    # Function to update the plot
+    def update(frame):
+        ax1.clear()
+        cax = ax1.matshow(matrices[frame], cmap='viridis', vmin=0)
+        ax1.set_title(f'QR Iteration {iterations[frame]}')
+        return [cax]
+
+    # Animation
+    ani = FuncAnimation(fig, update, frames=min(len(matrices), gb.max_frame), interval=50, blit=False, repeat=False)
+    plt.show()
+
+BIN_MAGIC = b"QRMAT\x00\x00\x01"
+
+def matrix_format(filename: str) -> str:
+    """Return the matrix file format chosen by the extension: "npy", "bin" or "text"."""
+    ext = os.path.splitext(filename)[1].lower()
+    if ext == ".npy":
+        return "npy"
+
+    if ext == ".bin":
+        return "bin"
+
+    return "text"
+
+def load_matrix(filename: str) -> np.ndarray:
+    """
+        The format is chosen by the extension (see `matrix_format`):
+        .npy: a NumPy array file, memory-mapped read-only
+        .bin: the 8-byte magic BIN_MAGIC, the int64 number of dimensions, the
+            int64 dimensions, then the float64 entries in C order (little
+            endian), memory-mapped read-only
+        Any other extension is the text format:
+        The input file contains n lines of floating-point numbers
+        At each line, the numbers are separated by space
+        No newline exists at the end of the last line
+        A stack of matrices of the same size is separated by empty lines,
+        and is returned as an array of shape (batch, n, n)
+    """
+    fmt = matrix_format(filename)
+    if fmt == "npy":
+        return np.load(filename, mmap_mode='r')
+
+    if fmt == "bin":
+        with open(filename, mode='rb') as f:
+            if f.read(len(BIN_MAGIC)) != BIN_MAGIC:
+                raise ValueError(f"Invalid binary matrix file: {filename}")
+
+            ndim = int(np.fromfile(f, dtype='<i8', count=1)[0])
+            shape = tuple(int(x) for x in np.fromfile(f, dtype='<i8', count=ndim))
+
+        return np.memmap(filename, dtype='<f8', mode='r', offset=len(BIN_MAGIC) + 8 * (ndim + 1), shape=shape)
+
+    with open(file=filename) as f:
+        text = f.read()
+
+    # Parse all the numbers at once in C, then recover the shape from the lines
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("error", DeprecationWarning)
+            values = np.fromstring(text, dtype=np.float64, sep=' ')
+
+    except (ValueError, DeprecationWarning):
+        raise ValueError(f"Invalid matrix file: {filename}")
+
+    rows = 0
+    matrices = 0
+    previous_empty = True
+    for line in text.splitlines():
+        empty = not line.strip()
+        if not empty:
+            rows += 1
+            matrices += previous_empty
+
+        previous_empty = empty
+
+    if rows == 0 or values.size % rows or rows % matrices:
+        raise ValueError(f"Invalid matrix file: {filename}")
+
+    shape = (matrices, rows // matrices, values.size // rows) if matrices > 1 else (rows, values.size // rows)
+    return values.reshape(shape)
+
+def _chunk_rows(n: int) -> int:
+    """Number of rows of length n written at once (about `gb.io_chunk_bytes` of float64)."""
+    return max(1, gb.io_chunk_bytes // (8 * n))
+
+def write_matrix(filename: str, shape: tuple[int, ...], rows) -> None:
+    """
+    Write a matrix of the given shape, in the format chosen by the extension,
+    from an iterable of row blocks (2D arrays whose rows follow each other),
+    so that the matrix never has to be in memory as a whole. The text format
+    only holds a single matrix.
+    """
+    fmt = matrix_format(filename)
+    if fmt == "npy":
+        out = np.lib.format.open_memmap(filename, mode='w+', dtype=np.float64, shape=shape)
+        flat = out.reshape(-1, shape[-1])
+        start = 0
+        for block in rows:
+            flat[start : (start + len(block))] = block
+            start += len(block)
+
+        out.flush()
+        return
+
+    with open(file=filename, mode='wb') as f:
+        if fmt == "bin":
+            f.write(BIN_MAGIC)
+            np.array([len(shape), *shape], dtype='<i8').tofile(f)
+            for block in rows:
+                np.ascontiguousarray(block, dtype='<f8').tofile(f)
+
+            return
+
+        for block in rows:
+            np.savetxt(f, block, fmt='%.17g', delimiter=' ')
+
+        # No newline at the end of the last line
+        if f.tell():
+            f.seek(-1, os.SEEK_END)
+            f.truncate()
+
+def save_matrix(filename: str, A: np.ndarray) -> None:
+    """Write the matrix (or stack of matrices) A in the format chosen by the extension."""
+    A = np.asarray(A, dtype=np.float64)
+    if A.ndim == 3 and matrix_format(filename) == "text":
+        with open(file=filename, mode='wb') as f:
+            for index, matrix in enumerate(A):
+                if index:
+                    f.write(b'\n')
+
+                np.savetxt(f, matrix, fmt='%.17g', delimiter=' ')
+
+            f.seek(-1, os.SEEK_END)
+            f.truncate()
+
+        return
+
+    flat = A.reshape(-1, A.shape[-1])
+    step = _chunk_rows(A.shape[-1])
+    write_matrix(filename, A.shape, (flat[start : (start + step)] for start in range(0, len(flat), step)))
+
+def gen_matrix(filename: str, low: int, high: int, maxsize: int = 5):
+    if low >= high:
+        raise ValueError("`low` must smaller than `high`")
+
+    def rows():
+        step = _chunk_rows(maxsize)
+        for start in range(0, maxsize, step):
+            yield np.random.uniform(low, high, size=(min(step, maxsize - start), maxsize))
+
+    write_matrix(filename, (maxsize, maxsize), rows())
+
+def gen_sym_matrix(filename: str, low: int, high: int, maxsize: int = 5):
+    if low >= high:
+        raise ValueError("`low` must smaller than `high`")
+
+    # A = (R + R^T) / 2 is built from square tiles of R; tile (i, j) and tile
+    # (j, i) share one seeded stream, so each block of rows of A can be made
+    # on its own.
+    seed = np.random.randint(2 ** 31)
+    step = min(maxsize, _chunk_rows(maxsize))
+    edges = list(range(0, maxsize, step)) + [maxsize]
+
+    def tile(i, j):
+        # Tile (i, j) of A
+        a, b = sorted((i, j))
+        rng = np.random.default_rng([seed, a, b])
+        upper = rng.uniform(low, high, size=(edges[a + 1] - edges[a], edges[b + 1] - edges[b]))
+        lower = rng.uniform(low, high, size=(edges[b + 1] - edges[b], edges[a + 1] - edges[a])) if a != b else upper
+        block = (upper + lower.T) / 2
+        return block if i <= j else block.T
+
+    def rows():
+        for i in range(len(edges) - 1):
+            yield np.hstack([tile(i, j) for j in range(len(edges) - 1)])
+
+    write_matrix(filename, (maxsize, maxsize), rows())
+
+def print_matrix(matrix: np.ndarray):
+    print("\n".join([" ".join([f"{item:.6f}" for item in sublist]) for sublist in matrix]))
+
+def print_eigens(eigenvalues, eigenvectors):
+    if eigenvectors is None:
+        print(f'{"Eigenvalue":<30}')
+        for val in eigenvalues:
+            val = complex(val)
+            print(f'{val.real:.6f} + {val.imag:.6f}j' if val.imag else f'{val.real:.6f}')
+
+        return
+
+    print(f'{"Eigenvalue":<30} {"Eigenvector":<30}')
+    for val, vec in zip(eigenvalues, eigenvectors.T):
+        # Format complex eigenvalue
+        val = complex(val)
+        val_str = f'{val.real:.6f} + {val.imag:.6f}j' if val.imag else f'{val.real:.6f}'
+
+        # Format each component of the eigenvector
+        vec_str = ', '.join(
+            f'{x.real:.6f} + {x.imag:.6f}j' if x.imag else f'{x.real:.6f}'
+            for x in vec
+        )
+
+        print(f'{val_str:<30} {vec_str:<30}')
+
+def print_profile(stats):
+    print(f'{"Phase":<20} {"Time (s)":>12} {"Calls":>10}')
+    for name, seconds in stats["times"].items():
+        print(f'{name:<20} {seconds:>12.4f} {stats["calls"][name]:>10}')
+
+    print(f'{"Counter":<20} {"Value":>12}')
+    for name, value in stats["counters"].items():
+        print(f'{name:<20} {value:>12}')
+
+    sweeps = stats["sweeps_per_eigenvalue"]
+    if sweeps:
+        print(f'Sweeps until deflation per eigenvalue: min {min(sweeps)}, median {int(np.median(sweeps))}, max {max(sweeps)}')
\ No newline at end of file
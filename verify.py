@@ -0,0 +1,133 @@
+import numpy as np
+
+from scipy.optimize import linear_sum_assignment
+
+def residual_norms(
+    A: np.ndarray,
+    eigenvalues: np.ndarray,
+    eigenvectors: np.ndarray
+) -> np.ndarray:
+    """
+    ||A v - lambda v|| / (||A||_F ||v||) of every eigenpair, for a matrix (n, n)
+    or a stack (batch, n, n), with one batched matrix product.
+
+    Returns:
+        np.ndarray: The residuals, of the shape of the eigenvalues.
+    """
+    R = A @ eigenvectors - eigenvectors * eigenvalues[..., None, :]
+    norm_A = np.linalg.norm(A, axis=(-2, -1))[..., None]
+    norm_V = np.linalg.norm(eigenvectors, axis=-2)
+    return np.linalg.norm(R, axis=-2) / np.maximum(norm_A * norm_V, np.finfo(float).tiny)
+
+def match_spectrum(
+    computed: np.ndarray,
+    reference: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Pair every computed eigenvalue with a distinct reference eigenvalue so
+    that the sum of the distances |computed - reference| is smallest.
+
+    The pairing is an optimal assignment (`linear_sum_assignment`), so a
+    complex conjugate pair or a multiple eigenvalue is matched with as many
+    reference values as it has, and a subset of the spectrum (e.g. from
+    `value_range`) is matched with its nearest part of the reference.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: An tuple contains, for each computed
+        eigenvalue in order, the index of its reference eigenvalue and the
+        distance between them.
+    """
+    cost = np.abs(computed[:, None] - reference[None, :])
+    rows, columns = linear_sum_assignment(cost)
+    matched = np.full(len(computed), -1)
+    matched[rows] = columns
+    distances = np.full(len(computed), np.inf)
+    distances[rows] = cost[rows, columns]
+    return matched, distances
+
+def verify_batch(
+    A: np.ndarray,
+    eigenvalues: np.ndarray,
+    eigenvectors: np.ndarray | None,
+    residual_tol: float = 1e-8,
+    value_tol: float = 1e-6,
+    reference: np.ndarray | None = None
+) -> list[dict]:
+    """
+    Check the eigenpairs of a stack of matrices (batch, n, n).
+
+    The residuals of all the matrices come from one batched product (see
+    `residual_norms`) and the reference eigenvalues from one batched
+    `np.linalg.eigvals` call, unless given; only the matching (see
+    `match_spectrum`) runs per matrix.
+
+    Args:
+        A (np.ndarray): The matrices (batch, n, n).
+        eigenvalues (np.ndarray): The computed eigenvalues (batch, m).
+        eigenvectors (np.ndarray | None): The computed eigenvectors
+            (batch, n, m), or None to only check the eigenvalues.
+        residual_tol (float): The largest residual of a passing eigenpair.
+        value_tol (float): The largest distance of a passing eigenvalue to its
+            reference, relative to ||A||_F.
+        reference (np.ndarray | None): The reference eigenvalues (batch, n).
+
+    Returns:
+        list[dict]: Per matrix, whether it passed, the largest residual and
+        eigenvalue error, and the indices of the eigenvalues that failed.
+    """
+    A = np.asarray(A, dtype=np.float64)
+    eigenvalues = np.asarray(eigenvalues)
+    if reference is None:
+        reference = np.linalg.eigvals(A)
+
+    residuals = None
+    if eigenvectors is not None:
+        residuals = residual_norms(A, eigenvalues, np.asarray(eigenvectors))
+
+    norm_A = np.maximum(np.linalg.norm(A, axis=(-2, -1)), np.finfo(float).tiny)
+    results = []
+    for index in range(A.shape[0]):
+        _, distances = match_spectrum(eigenvalues[index], reference[index])
+        errors = distances / norm_A[index]
+        failed_values = np.nonzero(~(errors <= value_tol))[0]
+        result = {
+            "passed": len(failed_values) == 0,
+            "n": A.shape[-1],
+            "count": eigenvalues.shape[-1],
+            "max_value_error": float(errors.max()) if len(errors) else 0.0,
+            "failed_values": failed_values.tolist(),
+            "value_tol": value_tol
+        }
+        if residuals is not None:
+            failed_residuals = np.nonzero(~(residuals[index] <= residual_tol))[0]
+            result["passed"] = result["passed"] and len(failed_residuals) == 0
+            result["max_residual"] = float(residuals[index].max()) if residuals.shape[-1] else 0.0
+            result["failed_residuals"] = failed_residuals.tolist()
+            result["residual_tol"] = residual_tol
+
+        results.append(result)
+
+    return results
+
+def verify(
+    A: np.ndarray,
+    eigenvalues: np.ndarray,
+    eigenvectors: np.ndarray | None,
+    residual_tol: float = 1e-8,
+    value_tol: float = 1e-6,
+    reference: np.ndarray | None = None
+) -> dict | list[dict]:
+    """
+    Check the eigenpairs of a matrix (n, n), or of a stack (batch, n, n) (see `verify_batch`).
+
+    Returns:
+        dict | list[dict]: The result of the matrix, or the list of results of the stack.
+    """
+    if np.ndim(A) == 3:
+        return verify_batch(A, eigenvalues, eigenvectors, residual_tol, value_tol, reference)
+
+    return verify_batch(
+        np.asarray(A)[None], np.asarray(eigenvalues)[None],
+        None if eigenvectors is None else np.asarray(eigenvectors)[None],
+        residual_tol, value_tol, None if reference is None else np.asarray(reference)[None]
+    )[0]
@@ -0,0 +1,224 @@
+import numpy as np
+import global_constant as gb
+
+from scipy.linalg import lapack, rsf2csf
+from qr_algorithm import (
+    reduce_to_hessenberg, iterate_blocks, extract_eigens_from_schur,
+    _francis_step, _multishift_step
+)
+
+def _lower_sylvester(T: np.ndarray, L: np.ndarray) -> np.ndarray:
+    """
+    Strictly lower triangular X with tril(T X - X T, -1) = -L for the upper
+    triangular T.
+
+    With T and X split in halves, the (2, 1) block is a full triangular
+    Sylvester equation T22 X21 - X21 T11 = -L21 (LAPACK trsyl); the diagonal
+    blocks are the same problem again, with the coupling terms of X21 moved
+    to their right-hand sides.
+    """
+    n = T.shape[0]
+    X = np.zeros_like(T)
+    if n < 2:
+        return X
+
+    k = n // 2
+    X21, scale, _ = lapack.ztrsyl(T[k:, k:], T[:k, :k], -L[k:, :k], isgn=-1)
+    X[k:, :k] = X21 / scale
+    X[:k, :k] = _lower_sylvester(T[:k, :k], L[:k, :k] + np.tril(T[:k, k:] @ X[k:, :k], -1))
+    X[k:, k:] = _lower_sylvester(T[k:, k:], L[k:, k:] - np.tril(X[k:, :k] @ T[:k, k:], -1))
+    return X
+
+def refine_schur(
+    A: np.ndarray,
+    U: np.ndarray,
+    tol: float = 1e-8,
+    max_refine: int = 5
+) -> tuple[np.ndarray, np.ndarray, int] | None:
+    """
+    Newton steps on the complex Schur form of A from the approximate unitary
+    Schur vectors U (see `WarmStartSolver`).
+
+    Stops once the part of B = U^H A U below the diagonal is at most tol
+    relative to B, i.e. the residual ||A U - U T|| <= tol ||A||.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, int] | None: An tuple contains the
+        refined U, the upper triangular T and the number of Newton steps, or
+        None if the lower part stops decreasing or `max_refine` steps are not
+        enough.
+    """
+    n = A.shape[0]
+    previous = np.inf
+    for step in range(max_refine + 1):
+        B = U.conj().T @ A @ U
+        L = np.tril(B, -1)
+        lower = np.linalg.norm(L)
+        if lower <= tol * np.linalg.norm(B):
+            return U, np.triu(B), step
+
+        if lower >= previous or step == max_refine:
+            return None
+
+        previous = lower
+        X = _lower_sylvester(np.triu(B), L)
+        Z, R = np.linalg.qr(np.eye(n) + X - X.conj().T)
+        U = U @ (Z * np.sign(np.diagonal(R).real))
+
+    return None
+
+def complex_schur_eigens(
+    T: np.ndarray,
+    U: np.ndarray | None,
+    tol: float = 1e-8
+) -> tuple[np.ndarray, np.ndarray | None]:
+    """
+    Eigenpairs of the complex Schur form A = U T U^H of a real A (eigenvalues
+    only if U is None), made real when they all are.
+
+    An eigenvalue counts as real when its imaginary part is at rounding level
+    (n eps ||T||), or when no other eigenvalue is closer to its conjugate than
+    it is itself: the nonreal eigenvalues of a real A come in conjugate
+    pairs, however close to the real axis. The tolerance of the solve plays
+    no part, so a pair such as 5 +- 1e-6i survives any tol.
+    """
+    eigenvalues, eigenvectors = extract_eigens_from_schur(T, U, tol=tol)
+
+    n = len(eigenvalues)
+    partner = np.abs(eigenvalues[None, :] - eigenvalues.conj()[:, None])
+    np.fill_diagonal(partner, np.inf)
+    real = (np.abs(eigenvalues.imag) <= n * np.finfo(float).eps * np.linalg.norm(T)) | \
+           (partner.min(axis=1) > np.abs(eigenvalues.imag))
+
+    eigenvalues = np.where(real, eigenvalues.real, eigenvalues)
+    if eigenvectors is not None:
+        pivot = eigenvectors[np.argmax(np.abs(eigenvectors), axis=0), np.arange(len(eigenvalues))]
+        eigenvectors = np.where(real, eigenvectors * (np.abs(pivot) / pivot), eigenvectors)
+        eigenvectors = np.where(real, eigenvectors.real, eigenvectors)
+        eigenvectors /= np.linalg.norm(eigenvectors, axis=0)
+
+    if real.all():
+        return eigenvalues.real, (None if eigenvectors is None else eigenvectors.real)
+
+    return eigenvalues, eigenvectors
+
+class WarmStartSolver:
+    """
+    Eigensolver for a sequence of slowly varying matrices.
+
+    The complex Schur form A = U T U^H of the previous matrix is kept. For the
+    next matrix A', B = U^H A' U is then nearly upper triangular: its diagonal
+    holds the Rayleigh quotients of the previous Schur vectors, i.e. the
+    previous eigenvalues moved by the perturbation. The part of B below the
+    diagonal is removed by Newton steps on the Schur form: a strictly lower X
+    with tril(T X - X T) = -tril(B) (T the upper part of B, see
+    `_lower_sylvester`) gives the correction U <- U qr(I + X - X^H), and each
+    step squares the size of the lower part. No Hessenberg reduction or QR
+    sweep is needed while the perturbation is small.
+
+    The first matrix, one of a different size, or one for which the Newton
+    steps do not converge within `max_refine` steps is solved cold with
+    Francis sweeps.
+
+    Args:
+        max_iter (int): The maximum number of sweeps of a cold solve.
+        tol (float): The tolerance for deflation, and for the lower part of B
+            relative to B.
+        shifts (int): The number of shifts per sweep of a cold solve (see
+            `francis_double_shift_qr`).
+        max_refine (int): The maximum number of Newton steps.
+        compute_vectors (bool): If False, return None in place of the eigenvectors
+            (the Schur vectors are still kept for the next call).
+    """
+    def __init__(
+        self,
+        max_iter: int = 1000,
+        tol: float = 1e-8,
+        shifts: int = 2,
+        max_refine: int = 5,
+        compute_vectors: bool = True
+    ):
+        self.max_iter = max_iter
+        self.tol = tol
+        self.shifts = shifts
+        self.max_refine = max_refine
+        self.compute_vectors = compute_vectors
+        self.reset()
+
+    def reset(self):
+        """Forget the previous Schur form, so the next matrix is solved cold."""
+        self.U = None
+        self.T = None
+        self.path = None
+        self.iterations = 0
+
+    def solve(self, A: np.ndarray) -> tuple[np.ndarray, np.ndarray | None]:
+        """
+        Computes the eigenvalues of the next matrix of the sequence.
+
+        `path` is then "refine" or "cold", and `iterations` the number of
+        Newton steps or of sweeps.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray | None]: An tuple contains the
+            eigenvalues and the eigenvectors of the matrix A.
+        """
+        A = np.asarray(A, dtype=np.float64)
+        if self.U is not None and self.U.shape == A.shape and self._refine(A):
+            self.path = "refine"
+            return self._extract()
+
+        self.path = "cold"
+        H, Q, _ = reduce_to_hessenberg(A)
+        gb.recorder.reset()
+        gb.recorder.record(H)
+        if self.shifts > 2:
+            self.iterations = iterate_blocks(H, Q, _multishift_step, self.max_iter, self.tol,
+                                             shifts=self.shifts)
+
+        else:
+            self.iterations = iterate_blocks(H, Q, _francis_step, self.max_iter, self.tol)
+
+        self.T, self.U = rsf2csf(H, Q)
+        self.T = np.triu(self.T)
+        return extract_eigens_from_schur(H, Q if self.compute_vectors else None, tol=self.tol)
+
+    def _refine(self, A: np.ndarray) -> bool:
+        """Newton steps from the previous Schur vectors; False if they do not converge."""
+        refined = refine_schur(A, self.U, self.tol, self.max_refine)
+        if refined is None:
+            return False
+
+        self.U, self.T, self.iterations = refined
+        return True
+
+    def _extract(self) -> tuple[np.ndarray, np.ndarray | None]:
+        """Eigenpairs of the complex Schur form, made real when they all are."""
+        return complex_schur_eigens(self.T, self.U if self.compute_vectors else None, self.tol)
+
+def solve_sequence(
+    A: np.ndarray,
+    max_iter: int = 1000,
+    tol: float = 1e-8,
+    compute_vectors: bool = True,
+    shifts: int = 2
+) -> tuple[np.ndarray, np.ndarray | None]:
+    """
+    Computes the eigenvalues of a stack of slowly varying matrices (batch, n, n)
+    in order, each one warm-started from the previous one (see `WarmStartSolver`).
+
+    Returns:
+        tuple[np.ndarray, np.ndarray | None]: An tuple contains the eigenvalues
+        (batch, n) and the eigenvectors (batch, n, n) of the matrices.
+    """
+    A = np.asarray(A, dtype=np.float64)
+    if A.ndim != 3 or A.shape[1] != A.shape[2]:
+        raise ValueError(f"Invalid shape: {A.shape}. Expected (batch, n, n).")
+
+    solver = WarmStartSolver(max_iter, tol, shifts, compute_vectors=compute_vectors)
+    results = [solver.solve(M) for M in A]
+    eigenvalues = np.array([w for w, _ in results])
+    if not compute_vectors:
+        return eigenvalues, None
+
+    return eigenvalues, np.array([V for _, V in results])